@@ -0,0 +1,37 @@
+"""Micro benchmarks for helium-python.
+
+The benchmarks run offline against synthetic data. Run one with, for
+example::
+
+    $ python -m benchmarks.serialize
+
+"""
+
+from __future__ import print_function, unicode_literals
+
+import timeit
+
+
+def report(name, func, number, items=1):
+    """Time ``func`` and print its throughput.
+
+    Args:
+
+        name(string): The name of the benchmark
+
+        func(callable): The function to time
+
+        number(int): How often to call the function
+
+    Keyword Args:
+
+        items(int): The number of items processed by a single call
+
+    Returns:
+
+        The number of items processed per second
+    """
+    elapsed = min(timeit.repeat(func, number=number, repeat=3))
+    rate = number * items / elapsed
+    print('{:<40} {:>14,.0f} items/s'.format(name, rate))
+    return rate
@@ -0,0 +1,85 @@
+"""Measure the throughput of live stream processing."""
+
+from __future__ import print_function, unicode_literals
+
+import json
+import os
+import tempfile
+
+from helium import Client, Sensor, Timeseries
+from helium.adapter.replay import Adapter as ReplayAdapter
+from helium.live import EventParser, Recorder
+
+from . import report
+
+
+def _stream(count):
+    lines = []
+    for n in range(count):
+        point = {
+            'data': {
+                'id': '{:08x}-6458-4267-90ce-849e78fb38c9'.format(n),
+                'type': 'data-point',
+                'attributes': {
+                    'port': 't',
+                    'value': 20.0 + n % 10,
+                    'timestamp': '2016-09-18T23:57:49.477274Z',
+                },
+                'relationships': {
+                    'sensor': {'data': {
+                        'id': 'c48179b1-487c-49e6-928e-241e3fd15b41',
+                        'type': 'sensor',
+                    }},
+                },
+            },
+        }
+        if n % 100 == 0:
+            lines.append(':')
+        lines.append('id: {}'.format(n))
+        lines.append('event: sensor')
+        lines.append('data: ' + json.dumps(point))
+        lines.append('')
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def _parse(chunks):
+    parser = EventParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+
+
+def _replay(path):
+    client = Client(adapter=ReplayAdapter(path, speed=None))
+    timeseries = Timeseries(client, Sensor,
+                            'c48179b1-487c-49e6-928e-241e3fd15b41')
+    with timeseries.live() as live:
+        for point in live:
+            pass
+
+
+def main(count=10000):
+    """Benchmark parsing and replaying a live stream of ``count`` events."""
+    stream = _stream(count)
+    print('Parsing {} events ({:,} bytes)'.format(count, len(stream)))
+    for size in (64, 1024, 16384, len(stream)):
+        chunks = [stream[pos:pos + size]
+                  for pos in range(0, len(stream), size)]
+        report('EventParser {} byte chunks'.format(size),
+               lambda: _parse(chunks), 5, count)
+
+    # Replay a recording in network sized chunks through the full
+    # live pipeline, including resource construction
+    handle, path = tempfile.mkstemp(suffix='.sse')
+    os.close(handle)
+    try:
+        recorder = Recorder(path)
+        for pos in range(0, len(stream), 16384):
+            recorder.write(stream[pos:pos + 16384])
+        recorder.close()
+        report('Replayed live stream', lambda: _replay(path), 5, count)
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Measure the cost of turning responses into resources."""
+
+from __future__ import print_function, unicode_literals
+
+import json
+
+from helium import Client, Element, Sensor
+from helium.adapter.requests import Adapter
+from helium.session import Response
+
+from . import report
+
+
+class CannedAdapter(Adapter):
+    """Answer GET requests with canned bodies instead of the network."""
+
+    def __init__(self, bodies):
+        """Construct a canned adapter.
+
+        Args:
+
+            bodies(dict): ``(path, include)`` pairs to response bodies
+        """
+        super(CannedAdapter, self).__init__()
+        self.bodies = bodies
+
+    def get(self, url, callback, params=None, json=None, headers=None):
+        """Answer with the canned body for the url and include."""
+        include = (params or {}).get('include')
+        body = self.bodies[(url.rsplit('/v1/', 1)[-1], include)]
+        return callback(Response(200, {}, body, 'GET', url))
+
+
+def _sensor(n, element=None):
+    return {
+        'id': '{:08x}-228d-4530-8eaf-74d43c17baa8'.format(n),
+        'type': 'sensor',
+        'attributes': {'name': 'sensor-{}'.format(n)},
+        'relationships': {
+            'label': {'data': []},
+            'element': {'data': None if element is None else {
+                'id': element, 'type': 'element'}},
+        },
+        'meta': {'created': '2016-03-29T23:41:29.994176Z'},
+    }
+
+
+def _element(n, sensor_ids):
+    return {
+        'id': '{:08x}-0f81-4a3b-8aea-78e4e60a7ec6'.format(n),
+        'type': 'element',
+        'attributes': {'name': 'element-{}'.format(n)},
+        'relationships': {
+            'sensor': {'data': [{'id': id, 'type': 'sensor'}
+                                for id in sensor_ids]},
+        },
+        'meta': {'created': '2016-03-29T23:41:29.994176Z'},
+    }
+
+
+def _client(count, per_element):
+    sensors = [_sensor(n) for n in range(count)]
+    elements = [_element(n, [s['id'] for s in
+                             sensors[n * per_element:(n + 1) * per_element]])
+                for n in range(count // per_element)]
+    element = elements[0]
+    bodies = {
+        ('sensor/' + sensors[0]['id'], None):
+            json.dumps({'data': sensors[0]}),
+        ('sensor', None): json.dumps({'data': sensors}),
+        ('element', 'sensor'):
+            json.dumps({'data': elements, 'included': sensors}),
+        ('element/' + element['id'], 'sensor'):
+            json.dumps({'data': element,
+                        'included': sensors[:per_element]}),
+    }
+    return Client(adapter=CannedAdapter(bodies)), sensors, element
+
+
+def main(count=2000, per_element=20):
+    """Benchmark decoding ``count`` sensors, ``per_element`` per element."""
+    client, sensors, element = _client(count, per_element)
+    sensor_id = sensors[0]['id']
+    element = Element.find(client, element['id'], include=[Sensor])
+    elements = count // per_element
+
+    print('Decoding ({} sensors, {} per element)'.format(count, per_element))
+    report('Sensor.find', lambda: Sensor.find(client, sensor_id), 2000)
+    report('Sensor.where', lambda: Sensor.where(client), 10, count)
+    report('Element.all include sensors',
+           lambda: Element.all(client, include=[Sensor]), 10, count)
+    report('element.sensors() include',
+           lambda: element.sensors(), 200, per_element)
+    report('element.sensors(use_included=True)',
+           lambda: element.sensors(use_included=True), 2000, per_element)
+    report('Sensor._mk_many on parsed json',
+           lambda: Sensor._mk_many(client)({'data': sensors}), 10, count)
+    print('({} elements per include request)'.format(elements))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Compare resource serialization against pickle and JSON."""
+
+from __future__ import print_function, unicode_literals
+
+import json
+import pickle
+
+from helium import Client, DataPoint, Sensor
+from helium.serialize import (
+    dumps, loads, dumps_many, loads_many,
+    dumps_datapoints, loads_datapoints,
+)
+
+from . import report
+
+
+def _sensor(n):
+    return {
+        'id': '{:08x}-228d-4530-8eaf-74d43c17baa8'.format(n),
+        'type': 'sensor',
+        'attributes': {'name': 'sensor-{}'.format(n)},
+        'relationships': {
+            'label': {'data': [{'id': '968cc881-737e-4bff-bdd6-2af45992fe86',
+                                'type': 'label'}]},
+            'element': {'data': None},
+        },
+        'meta': {
+            'created': '2016-03-29T23:41:29.994176Z',
+            'updated': '2016-11-04T17:27:44.688492Z',
+            'ports': ['b', 'm', 'd', 't'],
+        },
+    }
+
+
+def _datapoint(n):
+    return {
+        'id': '{:08x}-6458-4267-90ce-849e78fb38c9'.format(n),
+        'type': 'data-point',
+        'attributes': {
+            'port': 't',
+            'value': 20.0 + n % 10,
+            'timestamp': '2016-09-18T23:57:49.477274Z',
+        },
+        'relationships': {
+            'sensor': {'data': {'id': 'c48179b1-487c-49e6-928e-241e3fd15b41',
+                                'type': 'sensor'}},
+        },
+        'meta': {'created': '2016-09-18T23:57:49.577274Z'},
+    }
+
+
+def main(count=1000):
+    """Benchmark serializing ``count`` sensors and datapoints."""
+    client = Client()
+    sensors = [Sensor(_sensor(n), client) for n in range(count)]
+    points = [DataPoint(_datapoint(n), client) for n in range(count)]
+    # Promote attributes like regular use would
+    for sensor in sensors:
+        sensor.meta
+
+    print('Single resources ({} sensors)'.format(count))
+    report('pickle dumps+loads',
+           lambda: [pickle.loads(pickle.dumps(s, 2)) for s in sensors],
+           10, count)
+    report('json dumps+loads',
+           lambda: [Sensor(json.loads(json.dumps(s._json_data)), client)
+                    for s in sensors],
+           10, count)
+    report('to_bytes+from_bytes',
+           lambda: [loads(dumps(s), client) for s in sensors],
+           10, count)
+
+    print('Batches ({} datapoints)'.format(count))
+    report('pickle list',
+           lambda: pickle.loads(pickle.dumps(points, 2)), 10, count)
+    report('json list',
+           lambda: [DataPoint(d, client) for d in json.loads(
+               json.dumps([p._json_data for p in points]))], 10, count)
+    report('dumps_many+loads_many',
+           lambda: loads_many(dumps_many(points), client), 10, count)
+    report('dumps_datapoints+loads_datapoints',
+           lambda: loads_datapoints(dumps_datapoints(points), client),
+           10, count)
+
+    print('Encoded sizes ({} datapoints)'.format(count))
+    print('{:<40} {:>14,} bytes'.format(
+        'pickle', len(pickle.dumps(points, 2))))
+    print('{:<40} {:>14,} bytes'.format(
+        'json', len(json.dumps([p._json_data for p in points]))))
+    print('{:<40} {:>14,} bytes'.format(
+        'dumps_many', len(dumps_many(points))))
+    print('{:<40} {:>14,} bytes'.format(
+        'dumps_datapoints', len(dumps_datapoints(points))))
+
+
+if __name__ == '__main__':
+    main()
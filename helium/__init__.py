@@ -2,26 +2,37 @@
 
 from __future__ import unicode_literals
 from .exceptions import (
-    Error, ClientError, ServerError, NotFoundError,
+    Error, ClientError, ServerError, NotFoundError, LiveTimeoutError,
 )
 from .util import (
     from_iso_date, to_iso_date,
     build_request_body, build_request_relationship,
-    build_request_include,
+    build_request_include, build_request_fields,
 )
 from .session import Session, CB
-from .resource import Base, Resource, ResourceMeta
-from .relations import RelationType, to_many, to_one
-from .metadata import Metadata, metadata
+from .cache import RelationshipCache
+from .resource import (
+    Base, Resource, ResourceMeta, ResourceIterable, BulkResult,
+)
+from .relations import (
+    RelationType, Relation, SyncResult, to_many, to_one, prefetch_related,
+)
+from .query import Query
+from .live import Resume, LiveStats
+from .metadata import Metadata, MetadataIndex, MetadataWriter, metadata
 from .user import User
 from .timeseries import Timeseries, DataPoint, AggregateValue, timeseries
 from .device import Device
 from .sensor import Sensor
 from .element import Element
-from .configuration import Configuration
+from .configuration import (
+    Configuration, ConfigurationIndex, configuration_hash,
+)
 from .device_configuration import DeviceConfiguration
+from .rollout import Rollout, RolloutResult
 from .label import Label
 from .organization import Organization
+from .snapshot import Snapshot, SnapshotChanges
 from .client import Client
 from .__about__ import (
     __package_name__, __title__, __author__, __author_email__,
@@ -32,22 +43,30 @@ from .__about__ import (
 __all__ = (
     'from_iso_date', 'to_iso_date',
     'build_request_body', 'build_request_relationship',
-    'build_request_include',
+    'build_request_include', 'build_request_fields',
     'Error',
     'ServerError',
     'ClientError',
     'NotFoundError',
-    'Base', 'Resource', 'ResourceMeta',
-    'RelationType', 'to_one', 'to_many',
+    'LiveTimeoutError',
+    'Base', 'Resource', 'ResourceMeta', 'ResourceIterable', 'BulkResult',
+    'RelationType', 'Relation', 'SyncResult', 'to_one', 'to_many',
+    'prefetch_related',
+    'Query',
+    'Resume', 'LiveStats',
     'Session', 'CB',
+    'RelationshipCache',
     'Organization',
     'User',
     'Timeseries', 'DataPoint', 'timeseries', 'AggregateValue',
     'DeviceConfiguration', 'Configuration', 'Device',
+    'ConfigurationIndex', 'configuration_hash',
+    'Rollout', 'RolloutResult',
     'Sensor',
-    'Metadata', 'metadata',
+    'Metadata', 'MetadataIndex', 'MetadataWriter', 'metadata',
     'Element',
     'Label',
+    'Snapshot', 'SnapshotChanges',
     'Client',
     # Metadata attributes
     '__package_name__',
@@ -3,19 +3,26 @@
 from __future__ import unicode_literals, absolute_import
 
 import aiohttp
+import asyncio
+import time
 
 from collections import AsyncIterable, deque
 from json import loads as load_json, dumps as dump_json
 from helium.__about__ import __version__
 from helium.session import Response, CB
+from helium.exceptions import Error, LiveTimeoutError
+from helium.live import (
+    EventParser, LiveBuffer, Recorder, Reorderer, make_batch,
+)
 
 
 class LiveIterator(AsyncIterable):
     """Iterable over a live endpoint."""
 
-    _FIELD_SEPARATOR = ':'
+    _CHUNK_SIZE = 65536
 
-    def __init__(self, response, session, resource_class, resource_args):
+    def __init__(self, response, session, resource_class, resource_args,
+                 connect=None, resume=None, idle_timeout=None):
         """Construct a live endpoint async iterator.
 
         Keyword Args:
@@ -25,33 +32,134 @@ class LiveIterator(AsyncIterable):
             session(Session): The session with Helium
 
             resource_class(Resource): The class of resource to construct
+
+            connect(func): A coroutine function that, given additional
+                headers, requests the live endpoint again
+
+            resume(Resume): The reconnect policy for the live endpoint
+
+            idle_timeout(float): The number of seconds to wait for data
         """
         self._response = response
         self._session = session
         self._resource_class = resource_class
         self._resource_args = resource_args
+        self._connect = connect
+        self._resume = resume
+        self._content = None
+        self._parser = EventParser()
+        self._parsed = deque()
+        self._pending = deque()
+        self._closed = False
+        self._batches = None
+        self._buffered = None
+        self._reordered = None
+        self._idle_timeout = idle_timeout
+        self._last_event = time.time()
+        self._recorder = None
+
+    @property
+    def stats(self):
+        """The :class:`LiveStats` of a resumed live endpoint."""
+        return self._resume.stats if self._resume is not None else None
+
+    @property
+    def last_event_age(self):
+        """The number of seconds since data was last received."""
+        return time.time() - self._last_event
 
     def __aiter__(self):
         """Create an async iterator."""
         return self
 
     async def __anext__(self):
-        """Iterate over lines looking for resources."""
+        """Iterate over resources, reconnecting if resumable."""
+        resume = self._resume
+        while True:
+            if self._pending:
+                return self._pending.popleft()
+            try:
+                resource = await self._next_resource()
+            except (aiohttp.ClientError, LiveTimeoutError):
+                if resume is None or self._closed:
+                    raise
+                resource = None
+            if resource is not None:
+                if resume is None or resume.accept(resource):
+                    return resource
+                continue
+            if resume is None or self._closed:
+                raise StopAsyncIteration
+            missed = await self._reconnect()
+            if missed is None:
+                raise StopAsyncIteration
+            self._pending.extend(missed)
+
+    async def _next_resource(self):
         resource_class = self._resource_class
         resource_args = self._resource_args
         session = self._session
-        response = self._response
+        resume = self._resume
+        parser = self._parser
+        parsed = self._parsed
 
-        async for line in response.content:
-            line = line.decode('utf-8')
-            if len(line) == 0 and response.at_eof:
-                raise StopAsyncIteration
+        while not parsed:
+            chunk = await self._read()
+            if not chunk:
+                return None
+            # Heartbeat comments show the stream is alive as well
+            self._last_event = time.time()
+            for event in parser.feed(chunk):
+                if resume is not None:
+                    resume.event(event.id)
+                    if parser.retry is not None:
+                        resume.retry(parser.retry)
+                json = load_json(event.data).get('data')
+                parsed.append(resource_class(json, session,
+                                             **resource_args))
+        return parsed.popleft()
+
+    async def _read(self):
+        read = self._content.read(self._CHUNK_SIZE)
+        if self._idle_timeout is None:
+            chunk = await read
+        else:
+            try:
+                chunk = await asyncio.wait_for(read, self._idle_timeout)
+            except asyncio.TimeoutError:
+                raise LiveTimeoutError(
+                    "No data received for {} seconds".format(
+                        self._idle_timeout))
+        if chunk and self._recorder is not None:
+            self._recorder.write(chunk)
+        return chunk
 
-            if len(line.strip()) > 0:
-                field, data = line.split(self._FIELD_SEPARATOR, 1)
-                if field.strip() == 'data':
-                    json = load_json(data).get('data')
-                    return resource_class(json, session, **resource_args)
+    async def _reconnect(self):
+        resume = self._resume
+        while True:
+            delay = resume.next_delay()
+            if delay is None:
+                return None
+            await asyncio.sleep(delay)
+            try:
+                response = await self._connect(resume.headers())
+            except (aiohttp.ClientError, asyncio.TimeoutError, Error):
+                continue
+            self._response.close()
+            self._response = response
+            self._content = response.content
+            self._parser = EventParser()
+            resume.reconnected()
+            timeseries = resume.backfill()
+            if timeseries is None:
+                return []
+            backfill = []
+            try:
+                async for resource in timeseries:
+                    backfill.append(resource)
+            except (aiohttp.ClientError, Error):
+                return []
+            return resume.backfilled(backfill)
 
     def take(self, n):
         """Return the next n datapoints.
@@ -65,17 +173,140 @@ class LiveIterator(AsyncIterable):
         """
         return self._session.adapter.take(self, n)
 
+    def record(self, path):
+        """Record the raw bytes of this live endpoint.
+
+        The recording can be replayed with the replay adapter in
+        :mod:`helium.adapter.replay`. The recording is finished when
+        the live endpoint is closed.
+
+        Args:
+
+            path(string): The file to write the recording to
+
+        Returns:
+
+            This live endpoint
+        """
+        self._recorder = Recorder(path)
+        return self
+
+    def reorder(self, delay=1.0, seen_size=10000, on_late=None):
+        """Deliver readings in timestamp order without duplicates.
+
+        Readings are held for up to ``delay`` seconds and released in
+        timestamp order. Readings whose id was recently delivered are
+        dropped. Readings that arrive too late to be delivered in order
+        are passed to ``on_late`` instead, or kept in the ``late``
+        queue of the :class:`helium.live.Reorderer`.
+
+        .. code-block:: python
+
+            with sensor.timeseries().live() as live:
+                for point in live.reorder(delay=5):
+                    update_window(point)
+
+        Keyword Args:
+
+            delay(float): The number of seconds to hold readings
+
+            seen_size(int): The number of reading ids to remember for
+                duplicate detection
+
+            on_late(func): A function called with every late reading
+
+        Returns:
+
+            A :class:`ReorderIterator` over the ordered readings
+        """
+        reorderer = Reorderer(delay=delay, seen_size=seen_size,
+                              on_late=on_late)
+        self._reordered = ReorderIterator(self, reorderer)
+        return self._reordered
+
+    def batches(self, max_size=100, max_latency=1.0, columnar=False):
+        """Iterate over batches of resources.
+
+        A batch is returned once it holds ``max_size`` resources, or
+        once ``max_latency`` seconds have passed since its first
+        resource was received, even if no further resources arrive.
+
+        .. code-block:: python
+
+            async with sensor.timeseries().live() as live:
+                async for batch in live.batches(max_size=500,
+                                                max_latency=2):
+                    await store(batch)
+
+        Keyword Args:
+
+            max_size(int): The maximum number of resources in a batch
+
+            max_latency(float): The maximum age in seconds of the first
+                resource in a batch
+
+            columnar(bool): Whether to return a dictionary of columns,
+                as returned by :func:`helium.live.datapoint_columns`,
+                instead of lists
+
+        Returns:
+
+            An async iterator over batches
+        """
+        self._batches = BatchIterator(self, max_size, max_latency, columnar)
+        return self._batches
+
+    def buffered(self, maxsize=1000, overflow='block'):
+        """Read the live endpoint ahead of the consumer.
+
+        A reader task reads the endpoint into a bounded
+        :class:`helium.live.LiveBuffer` so that the connection keeps
+        being drained while the consumer is busy. The ``overflow``
+        policy determines what happens when the consumer falls behind
+        and the buffer fills up: ``block`` stops reading,
+        ``drop-oldest`` and ``drop-newest`` drop resources, and
+        ``coalesce`` keeps only the latest reading per sensor and port.
+
+        .. code-block:: python
+
+            async with sensor.timeseries().live() as live:
+                buffered = live.buffered(maxsize=100,
+                                         overflow='drop-oldest')
+                async for point in buffered:
+                    await slow_operation(point)
+                    print(buffered.stats)
+
+        Keyword Args:
+
+            maxsize(int): The maximum number of buffered resources
+
+            overflow(string): The overflow policy
+
+        Returns:
+
+            A :class:`BufferedIterator` over the live endpoint
+        """
+        self._buffered = BufferedIterator(self, LiveBuffer(maxsize, overflow))
+        return self._buffered
+
     def close(self):
         """Close the live iterator."""
+        self._closed = True
+        if self._batches is not None:
+            self._batches.close()
+        if self._buffered is not None:
+            self._buffered.close()
+        if self._reordered is not None:
+            self._reordered.close()
+        if self._recorder is not None:
+            self._recorder.close()
         self._response.close()
 
     async def __aenter__(self):
         """Enter context."""
         # Get the actual response
-        response = await self._response
-        CB.boolean(200)(Response(response.status, response.headers,
-                                 response.content, 'GET', response.url))
-        self._response = response
+        self._response = await self._response
+        self._content = self._response.content
         # and enter its' context
         await self._response.__aenter__()
         return self
@@ -86,6 +317,205 @@ class LiveIterator(AsyncIterable):
         await self._response.__aexit__(*args)
 
 
+class BatchIterator(AsyncIterable):
+    """Async iterator over batches of a live endpoint."""
+
+    def __init__(self, live, max_size, max_latency, columnar=False):
+        """Construct a batch iterator.
+
+        You normally don't construct this directly but call
+        :meth:`LiveIterator.batches`.
+        """
+        self._live = live
+        self._max_size = max_size
+        self._max_latency = max_latency
+        self._columnar = columnar
+        self._next = None
+        self._done = False
+
+    def __aiter__(self):
+        """Create an async iterator."""
+        return self
+
+    async def __anext__(self):
+        """Return the next batch."""
+        loop = asyncio.get_event_loop()
+        batch = []
+        deadline = None
+        while not self._done and len(batch) < self._max_size:
+            # The read is kept pending across batches rather than
+            # cancelled when the latency bound is reached
+            if self._next is None:
+                self._next = asyncio.ensure_future(self._live.__anext__())
+            timeout = None
+            if deadline is not None:
+                timeout = max(0, deadline - loop.time())
+            done, _ = await asyncio.wait([self._next], timeout=timeout)
+            if not done:
+                break
+            task = self._next
+            self._next = None
+            try:
+                resource = task.result()
+            except StopAsyncIteration:
+                self._done = True
+                break
+            except Exception:
+                if not batch:
+                    raise
+                # Deliver what we have, and the error with the next batch
+                self._next = task
+                break
+            if deadline is None:
+                deadline = loop.time() + self._max_latency
+            batch.append(resource)
+        if not batch:
+            raise StopAsyncIteration
+        return make_batch(batch, self._columnar)
+
+    def close(self):
+        """Stop reading for the next batch."""
+        self._done = True
+        if self._next is not None:
+            self._next.cancel()
+            self._next = None
+
+
+class ReorderIterator(AsyncIterable):
+    """Async iterator over the ordered readings of a live endpoint."""
+
+    def __init__(self, live, reorderer):
+        """Construct a reorder iterator.
+
+        You normally don't construct this directly but call
+        :meth:`LiveIterator.reorder`.
+        """
+        self._live = live
+        self.reorderer = reorderer
+        self._ready = deque()
+        self._next = None
+        self._done = False
+
+    @property
+    def stats(self):
+        """The :class:`helium.live.ReorderStats` of the reorder stage."""
+        return self.reorderer.stats
+
+    def __aiter__(self):
+        """Create an async iterator."""
+        return self
+
+    async def __anext__(self):
+        """Return the next reading in timestamp order."""
+        reorderer = self.reorderer
+        ready = self._ready
+        while not ready:
+            if self._done:
+                ready.extend(reorderer.flush())
+                if not ready:
+                    raise StopAsyncIteration
+                break
+            if self._next is None:
+                self._next = asyncio.ensure_future(self._live.__anext__())
+            # Wake up when a held reading is due even if the stream is
+            # quiet
+            done, _ = await asyncio.wait([self._next],
+                                         timeout=reorderer.next_due())
+            if not done:
+                ready.extend(reorderer.poll())
+                continue
+            task = self._next
+            self._next = None
+            try:
+                point = task.result()
+            except StopAsyncIteration:
+                self._done = True
+                continue
+            ready.extend(reorderer.push(point))
+        return ready.popleft()
+
+    def close(self):
+        """Stop reading the live endpoint."""
+        self._done = True
+        if self._next is not None:
+            self._next.cancel()
+            self._next = None
+
+
+class BufferedIterator(AsyncIterable):
+    """Async iterator over a live endpoint read by a background task."""
+
+    def __init__(self, live, buffer):
+        """Construct a buffered iterator.
+
+        You normally don't construct this directly but call
+        :meth:`LiveIterator.buffered`.
+        """
+        self._live = live
+        self._buffer = buffer
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._error = None
+        self._done = False
+        self._task = None
+
+    @property
+    def stats(self):
+        """The :class:`helium.live.BufferStats` of the buffer."""
+        return self._buffer.stats
+
+    @property
+    def lag(self):
+        """The age in seconds of the oldest buffered resource."""
+        return self._buffer.lag
+
+    def __len__(self):
+        """Return the number of buffered resources."""
+        return len(self._buffer)
+
+    async def _read(self):
+        buffer = self._buffer
+        try:
+            async for resource in self._live:
+                while not buffer.put(resource):
+                    self._space.clear()
+                    await self._space.wait()
+                self._ready.set()
+        except asyncio.CancelledError:
+            pass
+        except Exception as error:
+            self._error = error
+        finally:
+            self._done = True
+            self._ready.set()
+
+    def __aiter__(self):
+        """Create an async iterator."""
+        return self
+
+    async def __anext__(self):
+        """Return the next buffered resource."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._read())
+        buffer = self._buffer
+        while True:
+            if len(buffer) > 0:
+                resource = buffer.get()
+                self._space.set()
+                return resource
+            if self._done:
+                if self._error is not None:
+                    raise self._error
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+
+    def close(self):
+        """Stop the reader task."""
+        if self._task is not None:
+            self._task.cancel()
+
+
 class DatapointIterator(AsyncIterable):
     """Iterator over a timeseries endpoint."""
 
@@ -131,11 +561,397 @@ class DatapointIterator(AsyncIterable):
                                            is_aggregate=is_aggregate)
 
 
+class ResourceIterator(AsyncIterable):
+    """Iterator over a paged resource collection."""
+
+    def __init__(self, collection):
+        """Construct an iterator.
+
+        Args:
+            collection: the resource collection to iterate over
+
+        """
+        self.collection = collection
+        self.queue = deque()
+        self.continuation_url = collection._base_url
+        self.params = collection._params
+
+    def __aiter__(self):
+        """Async iterator over resources in a collection."""
+        return self
+
+    async def __anext__(self):
+        """Return the next resource."""
+        collection = self.collection
+        session = collection._session
+
+        while len(self.queue) == 0:
+            if self.continuation_url is None:
+                raise StopAsyncIteration
+
+            def _process(json):
+                links = json.get('links') or {}
+                self.continuation_url = links.get('next', None)
+                self.queue.extend(collection._process(json))
+            # The continuation link already carries the query
+            # parameters of the original request
+            params, self.params = self.params, None
+            await session.get(self.continuation_url, CB.json(200, _process),
+                              params=params)
+
+        return self.queue.popleft()
+
+
+class Subscription(AsyncIterable):
+    """A subscriber to a stream owned by a :class:`LiveManager`.
+
+    A subscription either delivers datapoints to a callback, or
+    buffers them in a bounded queue to be consumed by iterating over
+    the subscription. When the queue is full the oldest datapoint is
+    dropped and counted in ``dropped``.
+
+    """
+
+    _DONE = object()
+
+    def __init__(self, manager, stream, sensor_id=None, port=None,
+                 callback=None, maxsize=100):
+        """Construct a subscription.
+
+        You normally don't construct this directly but call
+        :meth:`LiveManager.subscribe`.
+        """
+        self._manager = manager
+        self._stream = stream
+        self.sensor_id = sensor_id
+        self.port = port
+        self._callback = callback
+        self._queue = None if callback else asyncio.Queue(maxsize=maxsize)
+        self._error = None
+        self.dropped = 0
+        self.closed = False
+
+    def _deliver(self, point):
+        if self.port is not None and point.port != self.port:
+            return
+        callback = self._callback
+        if callback is not None:
+            try:
+                result = callback(point)
+                if asyncio.iscoroutine(result):
+                    asyncio.ensure_future(result)
+            except Exception as error:
+                self._error = error
+                self.close()
+            return
+        self._put(point)
+
+    def _put(self, item):
+        queue = self._queue
+        if queue.full():
+            queue.get_nowait()
+            self.dropped += 1
+        queue.put_nowait(item)
+
+    def _finish(self, error=None):
+        if self.closed:
+            return
+        self.closed = True
+        self._error = self._error or error
+        if self._queue is not None:
+            self._put(self._DONE)
+
+    @property
+    def error(self):
+        """The error that ended this subscription, if any."""
+        return self._error
+
+    def __aiter__(self):
+        """Create an async iterator."""
+        return self
+
+    async def __anext__(self):
+        """Return the next datapoint for this subscriber."""
+        item = await self._queue.get()
+        if item is self._DONE:
+            # Keep the subscription exhausted for later iterations
+            self._queue.put_nowait(item)
+            if self._error is not None:
+                raise self._error
+            raise StopAsyncIteration
+        return item
+
+    def close(self):
+        """Stop receiving datapoints."""
+        self._manager._unsubscribe(self)
+        self._finish()
+
+
+class _Stream(object):
+    """A single live connection shared by subscriptions."""
+
+    def __init__(self, key, timeseries, live_args):
+        self.key = key
+        self.timeseries = timeseries
+        self.live_args = live_args
+        self.subscribers = ()
+        self.routes = {}
+        self.task = None
+        self.live = None
+
+    def add(self, subscription, routed):
+        if routed:
+            sensor_id = subscription.sensor_id
+            self.routes[sensor_id] = self.routes.get(sensor_id, ()) + \
+                (subscription,)
+        else:
+            self.subscribers += (subscription,)
+        if self.task is None or self.task.done():
+            self.task = asyncio.ensure_future(self.run())
+
+    def remove(self, subscription):
+        self.subscribers = tuple(sub for sub in self.subscribers
+                                 if sub is not subscription)
+        sensor_id = subscription.sensor_id
+        routed = tuple(sub for sub in self.routes.get(sensor_id, ())
+                       if sub is not subscription)
+        if routed:
+            self.routes[sensor_id] = routed
+        else:
+            self.routes.pop(sensor_id, None)
+        return len(self.subscribers) == 0 and len(self.routes) == 0
+
+    def all(self):
+        result = list(self.subscribers)
+        for routed in self.routes.values():
+            result.extend(routed)
+        return result
+
+    def dispatch(self, point):
+        for subscription in self.subscribers:
+            subscription._deliver(point)
+        routes = self.routes
+        if routes:
+            try:
+                sensor_id = point.sensor_id
+            except AttributeError:
+                return
+            for subscription in routes.get(sensor_id, ()):
+                subscription._deliver(point)
+
+    async def run(self):
+        error = None
+        try:
+            async with self.timeseries.live(**self.live_args) as live:
+                self.live = live
+                async for point in live:
+                    self.dispatch(point)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            error = e
+        finally:
+            subscriptions = self.all()
+            self.subscribers, self.routes = (), {}
+            for subscription in subscriptions:
+                subscription._finish(error)
+
+
+class LiveManager(object):
+    """Multiplex live streams for many subscribers.
+
+    Every live stream holds an open HTTP connection and needs a
+    consumer of its own. A live manager owns the live streams instead
+    and fans out the received datapoints to subscribers. Subscribers
+    to the same timeseries share a single stream:
+
+    .. code-block:: python
+
+        async with LiveManager(client) as manager:
+            subscription = manager.subscribe(sensor.timeseries())
+            async for point in subscription:
+                print(point.value)
+
+    When a large number of sensors is watched it is more efficient to
+    route them through an organization or label level stream, which
+    delivers the readings of all its sensors over one connection. The
+    manager routes the datapoints to subscribers by their
+    :attr:`DataPoint.sensor_id`:
+
+    .. code-block:: python
+
+        org = await Organization.singleton(client)
+        manager.route(org.timeseries())
+
+        # These share the organization stream
+        for sensor in sensors:
+            manager.subscribe(sensor.timeseries(), callback=handle)
+
+    Label streams only carry the readings of the sensors in the label,
+    so the ids of those sensors are given when routing a label:
+
+    .. code-block:: python
+
+        manager.route(label.timeseries(), sensors=label_sensors)
+
+    Streams are opened when their first subscriber subscribes, and
+    closed when their last subscriber closes its subscription.
+
+    """
+
+    def __init__(self, session, maxsize=100, resume=True, **kwargs):
+        """Construct a live manager.
+
+        Args:
+
+            session(Session): The session to open live streams with
+
+        Keyword Args:
+
+            maxsize(int): The default queue size for subscriptions
+
+            resume(bool): Whether streams reconnect and backfill when
+                their connection drops
+
+            **kwargs: Further arguments for :meth:`Timeseries.live`
+        """
+        self._session = session
+        self._maxsize = maxsize
+        self._live_args = dict(kwargs, resume=resume)
+        self._streams = {}
+        self._routes = []
+
+    @staticmethod
+    def _port(timeseries):
+        return timeseries._params.get('filter[port]')
+
+    def _key(self, timeseries):
+        return (timeseries._base_url, self._port(timeseries))
+
+    def route(self, timeseries, sensors=None):
+        """Route sensor subscriptions through a shared stream.
+
+        Args:
+
+            timeseries(Timeseries): An organization or label timeseries
+
+        Keyword Args:
+
+            sensors(list): The sensors, or sensor ids, that the
+                timeseries carries readings for. ``None`` means all
+                sensors, as for an organization timeseries.
+
+        """
+        if sensors is not None:
+            sensors = frozenset(getattr(sensor, 'id', sensor)
+                                for sensor in sensors)
+        self._routes.append((timeseries, sensors))
+
+    def _find_route(self, sensor_id, port):
+        for timeseries, sensors in self._routes:
+            route_port = self._port(timeseries)
+            if route_port is not None and route_port != port:
+                continue
+            if sensors is None or sensor_id in sensors:
+                return timeseries
+        return None
+
+    def subscribe(self, timeseries, callback=None, maxsize=None):
+        """Subscribe to the live readings of a timeseries.
+
+        Args:
+
+            timeseries(Timeseries): The timeseries to subscribe to
+
+        Keyword Args:
+
+            callback(func): A function, or coroutine function, called
+                with every received datapoint. When not given the
+                datapoints are queued on the returned subscription.
+
+            maxsize(int): The queue size of the subscription
+
+        Returns:
+
+            Subscription: The subscription to the timeseries
+        """
+        port = self._port(timeseries)
+        sensor_id = None
+        route = None
+        if timeseries._resource_class._resource_type() == 'sensor':
+            sensor_id = timeseries._resource_id
+            route = self._find_route(sensor_id, port)
+        source = route or timeseries
+        key = self._key(source)
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = _Stream(key, source, self._live_args)
+            self._streams[key] = stream
+        subscription = Subscription(self, stream,
+                                    sensor_id=sensor_id,
+                                    port=port if route else None,
+                                    callback=callback,
+                                    maxsize=maxsize or self._maxsize)
+        stream.add(subscription, route is not None)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        stream = subscription._stream
+        if stream.remove(subscription) and \
+                self._streams.get(stream.key) is stream:
+            del self._streams[stream.key]
+            if stream.task is not None:
+                stream.task.cancel()
+
+    @property
+    def streams(self):
+        """The number of open streams."""
+        return len(self._streams)
+
+    def last_event_ages(self):
+        """Return the time since the last event of every open stream.
+
+        Returns:
+
+            A dictionary of the timeseries url of every connected
+            stream to the number of seconds since it received an event
+        """
+        return {stream.timeseries._base_url: stream.live.last_event_age
+                for stream in self._streams.values()
+                if stream.live is not None}
+
+    async def close(self):
+        """Close all streams and subscriptions."""
+        streams, self._streams = list(self._streams.values()), {}
+        tasks = [stream.task for stream in streams if stream.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aenter__(self):
+        """Enter context."""
+        return self
+
+    async def __aexit__(self, *args):
+        """Exit context and close all streams."""
+        await self.close()
+
+
 class Adapter(aiohttp.client.ClientSession):
     """A asynchronous adapter based on the `aiohttp` library."""
 
-    def __init__(self, loop=None):
-        """Construct a basic requests session with the Helium API."""
+    def __init__(self, loop=None, concurrency=10):
+        """Construct a basic requests session with the Helium API.
+
+        Keyword Args:
+
+            loop: The asyncio loop to use
+
+            concurrency(int): The default number of requests that are
+                executed concurrently by ``gather``
+
+        """
+        self.concurrency = concurrency
         super(Adapter, self).__init__(headers={
             'Accept': 'application/json',
             'Accept-Charset': 'utf-8',
@@ -168,8 +984,12 @@ class Adapter(aiohttp.client.ClientSession):
                                 headers=headers,
                                 data=data) as response:
             body = await response.text(encoding='utf-8')
-            return callback(Response(response.status, response.headers, body,
-                                     method, url))
+            result = callback(Response(response.status, response.headers,
+                                       body, method, url))
+        # Callbacks can continue with further requests
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
 
     def get(self, url, callback,
             params=None, json=None, headers=None):  # noqa: D102
@@ -201,19 +1021,72 @@ class Adapter(aiohttp.client.ClientSession):
 
     def live(self, session, url,
              resource_class, resource_args,
-             params=None):  # noqa: D102
-        headers = {
-            'Accept': 'text/event-stream',
-        }
-        response = super(Adapter, self).get(url,
-                                            read_until_eof=False,
-                                            params=params,
-                                            headers=headers)
-        return LiveIterator(response, session, resource_class, resource_args)
+             params=None, resume=None, idle_timeout=None):  # noqa: D102
+        async def connect(resume_headers=None):
+            headers = {
+                'Accept': 'text/event-stream',
+            }
+            headers.update(resume_headers or {})
+            request = super(Adapter, self).get(url,
+                                               read_until_eof=False,
+                                               params=params,
+                                               headers=headers)
+            if idle_timeout is None:
+                response = await request
+            else:
+                response = await asyncio.wait_for(request, idle_timeout)
+            CB.boolean(200)(Response(response.status, response.headers,
+                                     response.content, 'GET', response.url))
+            return response
+
+        return LiveIterator(connect(), session, resource_class, resource_args,
+                            connect=connect, resume=resume,
+                            idle_timeout=idle_timeout)
+
+    async def gather(self, calls, callback,
+                     concurrency=None):  # noqa: D102
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def _call(call):
+            async with semaphore:
+                return await call()
+
+        results = await asyncio.gather(*[_call(call) for call in calls],
+                                       return_exceptions=True)
+        # A cancelled call is not a per-call failure, so propagate it
+        for result in results:
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+        result = callback(results)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    def schedule(self, delay, call):  # noqa: D102
+        def _call():
+            asyncio.ensure_future(call(), loop=self._loop)
+        return self._loop.call_later(delay, _call)
+
+    async def rollout(self, rollout):  # noqa: D102
+        results = await self.gather(rollout.create_calls(),
+                                    lambda results: results,
+                                    concurrency=rollout.concurrency)
+        rollout.created(results)
+        while not rollout.done:
+            await asyncio.sleep(rollout.next_delay())
+            try:
+                result = await rollout.poll()
+            except Exception as error:
+                result = error
+            rollout.polled(result)
+        return rollout.result()
 
     def datapoints(self, timeseries):  # noqa: D102
         return DatapointIterator(timeseries)
 
+    def resources(self, collection):  # noqa: D102
+        return ResourceIterator(collection)
+
     async def take(self, aiter, n):  # noqa: D102
         result = []
         if n == 0:
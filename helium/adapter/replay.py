@@ -0,0 +1,87 @@
+"""An adapter that replays recorded live streams.
+
+Live streams recorded with ``record`` can be served again by this
+adapter, which makes it possible to test and benchmark live stream
+consumers deterministically without the Helium API:
+
+.. code-block:: python
+
+    with sensor.timeseries().live().record('sensor.sse') as live:
+        live.take(1000)
+
+    # later, offline, at ten times the recorded speed
+    client = Client(adapter=Adapter('sensor.sse', speed=10))
+    timeseries = Timeseries(client, Sensor, sensor_id)
+    with timeseries.live() as live:
+        for point in live:
+            consume(point)
+
+All other requests are made against the Helium API as usual.
+
+"""
+
+from __future__ import unicode_literals, absolute_import
+
+from helium.adapter import requests
+from helium.live import replay_recording
+
+
+class ReplayResponse(object):
+    """A streaming response that replays a recording."""
+
+    def __init__(self, path, speed=1.0):
+        """Construct a replayed response.
+
+        Args:
+
+            path(string): The recording to replay
+
+        Keyword Args:
+
+            speed(float): The replay speed relative to the recording,
+                or ``None`` to replay as fast as possible
+        """
+        self._chunks = replay_recording(path, speed=speed)
+
+    def iter_content(self, chunk_size=None):
+        """Iterate over the recorded chunks."""
+        return self._chunks
+
+    def close(self):
+        """Stop replaying."""
+        self._chunks.close()
+
+
+class Adapter(requests.Adapter):
+    """A synchronous adapter that serves live endpoints from recordings."""
+
+    def __init__(self, recordings, speed=1.0, **kwargs):
+        """Construct a replay adapter.
+
+        Args:
+
+            recordings: The recording to replay for every live endpoint,
+                or a dictionary of live endpoint urls to recordings
+
+        Keyword Args:
+
+            speed(float): The replay speed relative to the recordings, or
+                ``None`` to replay as fast as possible
+
+            **kwargs: Further arguments for the requests adapter
+        """
+        super(Adapter, self).__init__(**kwargs)
+        self.recordings = recordings
+        self.speed = speed
+
+    def _recording(self, url):
+        if isinstance(self.recordings, dict):
+            return self.recordings[url]
+        return self.recordings
+
+    def live(self, session, url, resource_class, resource_args,
+             params=None, resume=None, idle_timeout=None):  # noqa: D102
+        response = ReplayResponse(self._recording(url), speed=self.speed)
+        # A recording ends for good, so replayed streams don't resume
+        return requests.LiveIterator(response, session,
+                                     resource_class, resource_args)
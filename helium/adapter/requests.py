@@ -3,19 +3,41 @@
 from __future__ import unicode_literals, absolute_import
 
 import requests
+import socket
+import threading
+import time
 from collections import Iterable, Iterator, deque
+from concurrent.futures import ThreadPoolExecutor
 from json import loads as load_json
 from helium.__about__ import __version__
 from helium.session import Response, CB
+from helium.exceptions import Error, LiveTimeoutError
+from helium.live import (
+    EventParser, LiveBuffer, Recorder, Reorderer, batches,
+)
 from itertools import islice
+from requests.packages.urllib3.exceptions import ReadTimeoutError
+
+
+def _shutdown(response):
+    # Closing a response does not wake up a thread blocked reading it,
+    # shutting down its socket does
+    fp = getattr(getattr(getattr(response, 'raw', None), '_fp', None),
+                 'fp', None)
+    sock = getattr(getattr(fp, 'raw', fp), '_sock', None)
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except (OSError, socket.error):
+        pass
 
 
 class LiveIterator(Iterable):
     """Iterable over a live endpoint."""
 
-    _FIELD_SEPARATOR = ':'
-
-    def __init__(self, response, session, resource_class, resource_args):
+    def __init__(self, response, session, resource_class, resource_args,
+                 connect=None, resume=None, idle_timeout=None):
         """Construct a live endpoint represented as an Iterable.
 
         Keyword Args:
@@ -25,43 +47,94 @@ class LiveIterator(Iterable):
             session(Session): The session with Helium
 
             resource_class(Resource): The class of resource to construct
+
+            connect(func): A function that, given additional headers,
+                requests the live endpoint again
+
+            resume(Resume): The reconnect policy for the live endpoint
+
+            idle_timeout(float): The read timeout of the connection
         """
         self._response = response
         self._session = session
         self._resource_class = resource_class
         self._resource_args = resource_args
+        self._connect = connect
+        self._resume = resume
+        self._closed = False
+        self._threaded = None
+        self._idle_timeout = idle_timeout
+        self._last_event = time.time()
+        self._recorder = None
 
-    def _read(self, response):
-        for line in response.iter_lines(decode_unicode=True):
-            yield line
+    @property
+    def stats(self):
+        """The :class:`LiveStats` of a resumed live endpoint."""
+        return self._resume.stats if self._resume is not None else None
+
+    @property
+    def last_event_age(self):
+        """The number of seconds since data was last received."""
+        return time.time() - self._last_event
 
     def __iter__(self):
-        """Iterate over lines looking for resources."""
+        """Iterate over resources, reconnecting if resumable."""
+        resume = self._resume
+        while True:
+            try:
+                for resource in self._resources(self._response):
+                    if resume is None or resume.accept(resource):
+                        yield resource
+            except (requests.exceptions.RequestException, LiveTimeoutError):
+                if resume is None or self._closed:
+                    raise
+            if resume is None or self._closed:
+                return
+            missed = self._reconnect()
+            if missed is None:
+                return
+            for resource in missed:
+                yield resource
+
+    def _reconnect(self):
+        resume = self._resume
+        while True:
+            delay = resume.next_delay()
+            if delay is None:
+                return None
+            time.sleep(delay)
+            try:
+                response = self._connect(resume.headers())
+            except (requests.exceptions.RequestException, Error):
+                continue
+            self._response.close()
+            self._response = response
+            resume.reconnected()
+            timeseries = resume.backfill()
+            if timeseries is None:
+                return []
+            try:
+                return resume.backfilled(list(timeseries))
+            except (requests.exceptions.RequestException, Error):
+                return []
+
+    def _resources(self, response):
         resource_class = self._resource_class
         resource_args = self._resource_args
         session = self._session
-        response = self._response
+        resume = self._resume
 
+        parser = EventParser()
         for chunk in self._read(response):
-            event_data = ""
-            for line in chunk.splitlines():
-                # Ignore empty lines
-                if not line.strip():
-                    continue
-
-                data = line.split(self._FIELD_SEPARATOR, 1)
-                field = data[0]
-                data = data[1]
-
-                if field == 'data':
-                    event_data += data
-
-            if not event_data:
-                # Don't report on events with no data
-                continue
-
-            event_data = load_json(event_data).get('data')
-            yield resource_class(event_data, session, **resource_args)
+            # Heartbeat comments show the stream is alive as well
+            self._last_event = time.time()
+            for event in parser.feed(chunk):
+                if resume is not None:
+                    resume.event(event.id)
+                    if parser.retry is not None:
+                        resume.retry(parser.retry)
+                json = load_json(event.data).get('data')
+                yield resource_class(json, session, **resource_args)
 
     def take(self, n):
         """Return the next n datapoints.
@@ -75,9 +148,305 @@ class LiveIterator(Iterable):
         """
         return self._session.adapter.take(self, n)
 
+    def _read(self, response):
+        chunks = response.iter_content(chunk_size=None)
+        while True:
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            except requests.exceptions.ConnectionError as error:
+                # The read timeout surfaces as a connection error
+                if error.args and isinstance(error.args[0], ReadTimeoutError):
+                    raise LiveTimeoutError(
+                        "No data received for {} seconds".format(
+                            self._idle_timeout))
+                raise
+            if self._recorder is not None:
+                self._recorder.write(chunk)
+            yield chunk
+
+    def record(self, path):
+        """Record the raw bytes of this live endpoint.
+
+        The recording can be replayed with the replay adapter in
+        :mod:`helium.adapter.replay`. The recording is finished when
+        the live endpoint is closed.
+
+        Args:
+
+            path(string): The file to write the recording to
+
+        Returns:
+
+            This live endpoint
+        """
+        self._recorder = Recorder(path)
+        return self
+
+    def reorder(self, delay=1.0, seen_size=10000, on_late=None):
+        """Deliver readings in timestamp order without duplicates.
+
+        Readings are held for up to ``delay`` seconds and released in
+        timestamp order, also when no further readings arrive, since
+        the live endpoint is read by a background thread, see
+        :meth:`threaded`. Readings whose id was recently delivered are
+        dropped. Readings that arrive too late to be delivered in order
+        are passed to ``on_late`` instead, or kept in the ``late``
+        queue of the :class:`helium.live.Reorderer`.
+
+        .. code-block:: python
+
+            with sensor.timeseries().live() as live:
+                for point in live.reorder(delay=5):
+                    update_window(point)
+
+        Keyword Args:
+
+            delay(float): The number of seconds to hold readings
+
+            seen_size(int): The number of reading ids to remember for
+                duplicate detection
+
+            on_late(func): A function called with every late reading
+
+        Returns:
+
+            A :class:`ReorderIterator` over the ordered readings
+        """
+        reorderer = Reorderer(delay=delay, seen_size=seen_size,
+                              on_late=on_late)
+        return ReorderIterator(self, reorderer)
+
+    def batches(self, max_size=100, max_latency=1.0, columnar=False):
+        """Iterate over batches of resources.
+
+        A batch is yielded once it holds ``max_size`` resources, or
+        once ``max_latency`` seconds have passed since its first
+        resource was received, even if no further resources arrive.
+        The live endpoint is read by a background thread, see
+        :meth:`threaded`, so that the latency bound can be kept while
+        the stream is quiet.
+
+        .. code-block:: python
+
+            with sensor.timeseries().live() as live:
+                for batch in live.batches(max_size=500, max_latency=2):
+                    store(batch)
+
+        Keyword Args:
+
+            max_size(int): The maximum number of resources in a batch
+
+            max_latency(float): The maximum age in seconds of the first
+                resource in a batch
+
+            columnar(bool): Whether to yield a dictionary of columns, as
+                returned by :func:`helium.live.datapoint_columns`,
+                instead of lists
+
+        Returns:
+
+            An iterator over batches
+        """
+        return batches(self._stream(), max_size=max_size,
+                       max_latency=max_latency, columnar=columnar)
+
+    def threaded(self, maxsize=1000, overflow='block'):
+        """Read the live endpoint in a background thread.
+
+        A reader thread parses the live endpoint into a bounded
+        :class:`helium.live.LiveBuffer`, which the calling thread
+        consumes without blocking on the connection. This allows a
+        single thread to watch several live endpoints:
+
+        .. code-block:: python
+
+            streams = [sensor.timeseries().live().threaded()
+                       for sensor in sensors]
+            while True:
+                for stream in streams:
+                    for point in stream.drain():
+                        print(point.value)
+                time.sleep(1)
+
+        The ``overflow`` policy determines what happens when the
+        buffer fills up: ``block`` stops reading, ``drop-oldest`` and
+        ``drop-newest`` drop readings, and ``coalesce`` keeps only the
+        latest reading per sensor and port.
+
+        Keyword Args:
+
+            maxsize(int): The maximum number of buffered resources
+
+            overflow(string): The overflow policy
+
+        Returns:
+
+            A started :class:`ThreadedLiveIterator`
+        """
+        self._threaded = ThreadedLiveIterator(self,
+                                              LiveBuffer(maxsize, overflow))
+        self._threaded.start()
+        return self._threaded
+
+    def _stream(self):
+        if self._threaded is None:
+            self.threaded()
+        return self._threaded
+
     def close(self):
         """Close the live session."""
+        self._closed = True
+        _shutdown(self._response)
         self._response.close()
+        if self._recorder is not None:
+            self._recorder.close()
+        if self._threaded is not None:
+            self._threaded._wake()
+
+    def __enter__(self):
+        """Enter context."""
+        return self
+
+    def __exit__(self, *args):
+        """Exit context."""
+        self.close()
+        return False
+
+
+class ThreadedLiveIterator(Iterable):
+    """A live endpoint read by a background thread."""
+
+    def __init__(self, live, buffer):
+        """Construct a threaded live iterator.
+
+        You normally don't construct this directly but call
+        :meth:`LiveIterator.threaded`.
+        """
+        self._live = live
+        self._buffer = buffer
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._read)
+        self._thread.daemon = True
+        self._error = None
+        self._done = False
+
+    @property
+    def stats(self):
+        """The :class:`helium.live.BufferStats` of the buffer."""
+        return self._buffer.stats
+
+    @property
+    def lag(self):
+        """The age in seconds of the oldest buffered resource."""
+        with self._condition:
+            return self._buffer.lag
+
+    @property
+    def done(self):
+        """Whether the stream ended and all resources were consumed."""
+        with self._condition:
+            return self._done and len(self._buffer) == 0
+
+    def start(self):
+        """Start the reader thread."""
+        self._thread.start()
+
+    def _read(self):
+        buffer = self._buffer
+        condition = self._condition
+        try:
+            for resource in self._live:
+                with condition:
+                    while not buffer.put(resource):
+                        if self._live._closed:
+                            return
+                        condition.wait()
+                    condition.notify_all()
+        except Exception as error:
+            if not self._live._closed:
+                self._error = error
+        finally:
+            with condition:
+                self._done = True
+                condition.notify_all()
+
+    def _check_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def poll(self, timeout=None):
+        """Return the next resource.
+
+        Keyword Args:
+
+            timeout(float): The number of seconds to wait for a
+                resource, or ``None`` to wait until one arrives
+
+        Returns:
+
+            The next resource, or ``None`` if no resource arrived
+            within the timeout or the stream has ended.
+        """
+        condition = self._condition
+        deadline = None if timeout is None else time.time() + timeout
+        with condition:
+            buffer = self._buffer
+            while len(buffer) == 0:
+                if self._done:
+                    self._check_error()
+                    return None
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return None
+                condition.wait(remaining)
+            resource = buffer.get()
+            condition.notify_all()
+            return resource
+
+    def drain(self):
+        """Return all buffered resources without waiting.
+
+        Returns:
+
+            A list of the buffered resources, which is empty if none
+            have arrived since the last call.
+        """
+        with self._condition:
+            buffer = self._buffer
+            result = [buffer.get() for _ in range(len(buffer))]
+            self._condition.notify_all()
+            if not result and self._done:
+                self._check_error()
+            return result
+
+    def __iter__(self):
+        """Iterate over resources until the stream ends."""
+        while True:
+            resource = self.poll()
+            if resource is None:
+                return
+            yield resource
+
+    def close(self, timeout=1.0):
+        """Close the stream and stop the reader thread.
+
+        Keyword Args:
+
+            timeout(float): The number of seconds to wait for the
+                reader thread to finish, or ``None`` to wait until it
+                does
+        """
+        self._live.close()
+        self._thread.join(timeout)
+
+    def _wake(self):
+        with self._condition:
+            self._condition.notify_all()
 
     def __enter__(self):
         """Enter context."""
@@ -89,6 +458,47 @@ class LiveIterator(Iterable):
         return False
 
 
+class ReorderIterator(Iterable):
+    """Iterator over the ordered readings of a live endpoint."""
+
+    def __init__(self, live, reorderer):
+        """Construct a reorder iterator.
+
+        You normally don't construct this directly but call
+        :meth:`LiveIterator.reorder`.
+        """
+        self._live = live
+        self.reorderer = reorderer
+
+    @property
+    def stats(self):
+        """The :class:`helium.live.ReorderStats` of the reorder stage."""
+        return self.reorderer.stats
+
+    def __iter__(self):
+        """Iterate over the readings in timestamp order."""
+        reorderer = self.reorderer
+        stream = self._live._stream()
+        while True:
+            # Wake up when a held reading is due even if the stream is
+            # quiet
+            point = stream.poll(timeout=reorderer.next_due())
+            if point is not None:
+                released = reorderer.push(point)
+            elif stream.done:
+                break
+            else:
+                released = reorderer.poll()
+            for point in released:
+                yield point
+        for point in reorderer.flush():
+            yield point
+
+    def close(self):
+        """Stop reading the live endpoint."""
+        self._live.close()
+
+
 class DatapointIterator(Iterator):
     """Iterator over a timeseries endpoint."""
 
@@ -141,12 +551,70 @@ class DatapointIterator(Iterator):
         return self.__next__()  # pragma: no cover
 
 
+class ResourceIterator(Iterator):
+    """Iterator over a paged resource collection."""
+
+    def __init__(self, collection):
+        """Construct an iterator.
+
+        Args:
+            collection: the resource collection to iterate over
+
+        """
+        self.collection = collection
+        self.queue = deque()
+        self.continuation_url = collection._base_url
+        self.params = collection._params
+
+    def __iter__(self):
+        """Iterator for resources in a collection."""
+        return self  # pragma: no cover
+
+    def __next__(self):
+        """Return the next resource."""
+        collection = self.collection
+        session = collection._session
+
+        while len(self.queue) == 0:
+            if self.continuation_url is None:
+                raise StopIteration
+
+            def _process(json):
+                links = json.get('links') or {}
+                self.continuation_url = links.get('next', None)
+                self.queue.extend(collection._process(json))
+            # The continuation link already carries the query
+            # parameters of the original request
+            params, self.params = self.params, None
+            session.get(self.continuation_url, CB.json(200, _process),
+                        params=params)
+
+        return self.queue.popleft()
+
+    def next(self):
+        """Python 2 iterator compatibility."""
+        return self.__next__()  # pragma: no cover
+
+
 class Adapter(requests.Session):
     """A synchronous adapter based on the `requests` library."""
 
-    def __init__(self):
-        """Construct a basic requests session with the Helium API."""
+    def __init__(self, pool_size=10):
+        """Construct a basic requests session with the Helium API.
+
+        Keyword Args:
+
+            pool_size(int): The number of pooled connections to keep
+                per host. This also is the default number of requests
+                that are executed concurrently by ``gather``.
+
+        """
         super(Adapter, self).__init__()
+        self.pool_size = pool_size
+        pooled = requests.adapters.HTTPAdapter(pool_connections=pool_size,
+                                               pool_maxsize=pool_size)
+        self.mount('https://', pooled)
+        self.mount('http://', pooled)
         self.headers.update({
             'Accept': 'application/json',
             'Accept-Charset': 'utf-8',
@@ -205,21 +673,63 @@ class Adapter(requests.Session):
     def delete(self, url, callback, json=None):  # noqa: D102
         return self._http(callback, 'DELETE', url, json=json)
 
+    def gather(self, calls, callback, concurrency=None):  # noqa: D102
+        def _call(call):
+            try:
+                return call()
+            except Exception as error:
+                return error
+
+        workers = concurrency or self.pool_size
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_call, calls))
+        return callback(results)
+
+    def schedule(self, delay, call):  # noqa: D102
+        timer = threading.Timer(delay, call)
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def rollout(self, rollout):  # noqa: D102
+        rollout.created(self.gather(rollout.create_calls(),
+                                    lambda results: results,
+                                    concurrency=rollout.concurrency))
+        while not rollout.done:
+            time.sleep(rollout.next_delay())
+            try:
+                result = rollout.poll()
+            except Exception as error:
+                result = error
+            rollout.polled(result)
+        return rollout.result()
+
     def datapoints(self, timeseries):   # noqa: D102
         return DatapointIterator(timeseries)
 
+    def resources(self, collection):  # noqa: D102
+        return ResourceIterator(collection)
+
     def take(self, iter, n):   # noqa: D102
         return list(islice(iter, n))
 
-    def live(self, session, url, resource_class, resource_args, params=None):  # noqa: D102
-        headers = {
-            'Accept': 'text/event-stream',
-        }
-        response = super(Adapter, self).get(url,
-                                            stream=True,
-                                            headers=headers,
-                                            params=params)
-        # Validate the response code
-        CB.boolean(200)(Response(response.status_code, response.headers, None,
-                                 response.request.method, url))
-        return LiveIterator(response, session, resource_class, resource_args)
+    def live(self, session, url, resource_class, resource_args,
+             params=None, resume=None, idle_timeout=None):  # noqa: D102
+        def connect(resume_headers=None):
+            headers = {
+                'Accept': 'text/event-stream',
+            }
+            headers.update(resume_headers or {})
+            response = super(Adapter, self).get(url,
+                                                stream=True,
+                                                headers=headers,
+                                                params=params,
+                                                timeout=idle_timeout)
+            # Validate the response code
+            CB.boolean(200)(Response(response.status_code, response.headers,
+                                     None, response.request.method, url))
+            return response
+
+        return LiveIterator(connect(), session, resource_class, resource_args,
+                            connect=connect, resume=resume,
+                            idle_timeout=idle_timeout)
@@ -0,0 +1,146 @@
+"""Cache relationship fetches.
+
+Relationship fetches like ``label.sensors()`` make a request every time
+they are called. A session can be given a
+:class:`RelationshipCache` to keep the responses of these fetches for
+a while:
+
+.. code-block:: python
+
+    client = Client(relationship_cache=RelationshipCache(ttl=60))
+    label.sensors()  # makes a request
+    label.sensors()  # served from the cache
+
+Entries are keyed by the source resource type, the source resource id
+and the name of the relationship. The relationship mutation methods,
+like ``add_sensors``, invalidate the entries they affect in both
+directions of the relationship, so ``sensor.labels()`` is fetched again
+after ``label.add_sensors([sensor])``.
+
+Fetches that ask for sparse fieldsets, queries or lazy iteration are
+not cached.
+
+"""
+
+from __future__ import unicode_literals
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class RelationshipCache(object):
+    """A bounded cache of relationship responses.
+
+    The cache holds at most ``maxsize`` entries, evicting the least
+    recently used entry when full. Entries older than ``ttl`` seconds
+    are not returned. The cache is safe to share between threads.
+
+    Attributes:
+
+        hits(int): The number of lookups served from the cache
+
+        misses(int): The number of lookups not found in the cache
+
+    """
+
+    def __init__(self, maxsize=1024, ttl=60.0, clock=time.time):
+        """Construct a relationship cache.
+
+        Keyword Args:
+
+            maxsize(int): The maximum number of entries
+
+            ttl(float): The number of seconds an entry is valid for, or
+                ``None`` to keep entries until they are evicted or
+                invalidated
+
+            clock(func): The function returning the current time
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Look up an entry.
+
+        Args:
+
+            key(tuple): The ``(source type, source id, relationship)``
+                key of the entry
+
+        Returns:
+
+            The cached value, or ``None`` if there is no valid entry
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > self._clock():
+                    # Reinsert to mark the entry as most recently used
+                    self._entries[key] = entry
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Store an entry.
+
+        Args:
+
+            key(tuple): The ``(source type, source id, relationship)``
+                key of the entry
+
+            value: The value to store
+        """
+        expires = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (expires, value)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, source_type, source_id=None, relationship=None):
+        """Remove entries.
+
+        Entries are matched on the given parts of their key, leaving
+        out ``source_id`` or ``relationship`` matches any value.
+
+        Args:
+
+            source_type(string): The resource type of the source
+
+        Keyword Args:
+
+            source_id: The id of the source resource
+
+            relationship(string): The name of the relationship
+        """
+        with self._lock:
+            if source_id is not None and relationship is not None:
+                self._entries.pop((source_type, source_id, relationship),
+                                  None)
+                return
+            for key in list(self._entries):
+                if key[0] != source_type:
+                    continue
+                if source_id is not None and key[1] != source_id:
+                    continue
+                if relationship is not None and key[2] != relationship:
+                    continue
+                del self._entries[key]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        """The number of entries, including expired ones."""
+        return len(self._entries)
@@ -3,7 +3,7 @@
 
 from __future__ import unicode_literals
 from . import Session, Sensor, Label
-from . import Organization, User
+from . import Organization, User, Snapshot
 
 
 class Client(Session):
@@ -75,3 +75,21 @@ class Client(Session):
           User: The user for the authorized API key
         """
         return User.singleton(self)
+
+    def snapshot(self, concurrency=None):
+        """Load a snapshot of the authorized organization.
+
+        The snapshot holds all sensors, elements, labels, users,
+        device configurations and configurations of the organization
+        with their relationships indexed for lookups without further
+        requests.
+
+        Keyword Args:
+
+          concurrency(int): The maximum number of concurrent requests
+
+        Returns:
+
+          Snapshot: The snapshot of the organization
+        """
+        return Snapshot.load(self, concurrency=concurrency)
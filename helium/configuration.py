@@ -1,7 +1,18 @@
 """A configuration resource."""
 
 from __future__ import unicode_literals
-from . import Resource
+
+import hashlib
+import io
+import json
+import os
+import threading
+from builtins import str as text_type
+from collections import OrderedDict
+from functools import partial
+from . import CB, Resource
+
+_replace = getattr(os, 'replace', os.rename)
 
 
 class Configuration(Resource):
@@ -40,3 +51,200 @@ class Configuration(Resource):
     """
 
     pass
+
+
+def configuration_hash(attributes):
+    """Compute the content hash of configuration attributes.
+
+    The attributes are canonicalized, with sorted keys and without
+    insignificant whitespace, so equal attributes always have the same
+    hash.
+
+    Args:
+
+        attributes(dict): The attributes of a configuration
+
+    Returns:
+
+        string: The hex encoded SHA-256 hash of the attributes
+    """
+    canonical = json.dumps(attributes, sort_keys=True,
+                           separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ConfigurationIndex(object):
+    """An index of configurations by their attributes.
+
+    Since configurations are immutable, a configuration with the same
+    attributes can be shared by any number of devices. The index finds
+    existing configurations by the hash of their attributes so they
+    can be reused instead of creating duplicates:
+
+    .. code-block:: python
+
+        index = ConfigurationIndex('configurations.json')
+        index.load(client)
+        config = index.get_or_create(client, {'interval': 60})
+
+    When given a path, the index is stored in that file whenever it
+    changes and read back when constructed, so later runs don't need
+    to load it again. Call :meth:`load` to pick up configurations that
+    were created or deleted elsewhere.
+
+    """
+
+    _VERSION = 1
+
+    def __init__(self, path=None):
+        """Construct a configuration index.
+
+        Keyword Args:
+
+            path(string): The file to keep the index in, if any
+        """
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            with io.open(path, encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('version') == self._VERSION:
+                self._entries = stored.get('configurations', {})
+
+    def _save(self):
+        if self.path is None:
+            return
+        state = {
+            'version': self._VERSION,
+            'configurations': self._entries,
+        }
+        temp_path = self.path + '.tmp'
+        with io.open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text_type(json.dumps(state, sort_keys=True)))
+        _replace(temp_path, self.path)
+
+    def _add(self, configuration, requested=None):
+        data = configuration._json_data
+        entry = {key: data[key]
+                 for key in ('id', 'type', 'attributes', 'meta')
+                 if key in data}
+        digest = configuration_hash(data.get('attributes') or {})
+        self._entries[digest] = entry
+        # The server may normalize the attributes it was asked to
+        # create, so created configurations are found by both
+        if requested is not None:
+            self._entries[requested] = entry
+
+    def __len__(self):
+        """The number of indexed configurations."""
+        return len(set(entry.get('id') for entry in self._entries.values()))
+
+    def load(self, session):
+        """Replace the index with all configurations of the session.
+
+        Args:
+
+            session(Session): The session to fetch configurations with
+
+        Returns:
+
+            ConfigurationIndex: This index
+        """
+        def _process(json):
+            configurations = Configuration._mk_many(session)(json)
+            with self._lock:
+                self._entries = {}
+                for configuration in configurations:
+                    self._add(configuration)
+                self._save()
+            return self
+        url = session._build_url(Configuration._resource_path())
+        return session.get(url, CB.json(200, _process))
+
+    def get(self, session, attributes):
+        """Look up a configuration by its attributes.
+
+        Args:
+
+            session(Session): The session to attach the configuration to
+
+            attributes(dict): The attributes of the configuration
+
+        Returns:
+
+            Configuration: The matching configuration or ``None``
+        """
+        entry = self._entries.get(configuration_hash(attributes))
+        if entry is None:
+            return None
+        return Configuration(entry, session)
+
+    def get_or_create(self, session, attributes):
+        """Get a configuration with the given attributes.
+
+        An indexed configuration with the same attributes is reused,
+        otherwise the configuration is created and indexed.
+
+        Args:
+
+            session(Session): The session to use
+
+            attributes(dict): The attributes of the configuration
+
+        Returns:
+
+            Configuration: The existing or created configuration
+        """
+        return self._get_or_create(session, [attributes], None,
+                                   lambda configurations: configurations[0])
+
+    def get_or_create_many(self, session, attributes, concurrency=None):
+        """Get configurations for a number of attribute dictionaries.
+
+        Every distinct configuration that is not indexed yet is created
+        once, concurrently, no matter how often its attributes occur.
+
+        Args:
+
+            session(Session): The session to use
+
+            attributes(list): The attribute dictionaries
+
+        Keyword Args:
+
+            concurrency(int): The maximum number of concurrent requests
+
+        Returns:
+
+            list(Configuration): The configurations in the order of the
+                given attributes. Raises the first error that occured
+                creating configurations, after indexing the others.
+        """
+        return self._get_or_create(session, attributes, concurrency,
+                                   lambda configurations: configurations)
+
+    def _get_or_create(self, session, attributes, concurrency, callback):
+        attributes = list(attributes)
+        digests = [configuration_hash(attrs) for attrs in attributes]
+        missing = OrderedDict()
+        for digest, attrs in zip(digests, attributes):
+            if digest not in self._entries:
+                missing.setdefault(digest, attrs)
+        calls = [partial(Configuration.create, session, attributes=attrs)
+                 for attrs in missing.values()]
+
+        def _process(results):
+            error = None
+            with self._lock:
+                for digest, result in zip(missing, results):
+                    if isinstance(result, Exception):
+                        error = error or result
+                    else:
+                        self._add(result, requested=digest)
+                self._save()
+            if error is not None:
+                raise error
+            return callback([Configuration(self._entries[digest], session)
+                             for digest in digests])
+        return session.gather(calls, _process, concurrency=concurrency)
@@ -59,6 +59,35 @@ class DeviceConfiguration(Resource):
         return super(DeviceConfiguration, cls).create(session,
                                                       **kwargs)
 
+    @classmethod
+    def rollout(cls, session, configuration, devices, **kwargs):
+        """Apply a configuration to many devices.
+
+        Creates a device configuration for every device, concurrently,
+        and waits for them to be loaded by polling the status of the
+        ones that are still pending. See :class:`Rollout` for the
+        keyword arguments, which control the concurrency, polling and
+        progress reporting.
+
+        Args:
+
+            session(Session): The session to use for the requests
+
+            configuration(Configuration): The configuration to apply
+
+            devices(list): The devices, such as an `Element` or a
+                `Sensor`, to apply the configuration to
+
+        Returns:
+
+            RolloutResult: The loaded and still pending device
+            configurations and the devices that failed
+
+        """
+        from .rollout import Rollout
+        return session.rollout(Rollout(session, configuration, devices,
+                                       **kwargs))
+
     def is_loaded(self):
         """Check is a device configuration is loaded.
 
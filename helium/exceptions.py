@@ -50,6 +50,25 @@ class ClientError(Error):
 class ServerError(Error):
     pass
 
+
+class LiveTimeoutError(Error):
+    """A live endpoint has been silent for longer than its idle timeout."""
+
+    def __init__(self, msg):
+        """Construct a LiveTimeoutError.
+
+        :param str msg: The description of the timeout
+        """
+        super(Error, self).__init__(msg)
+        self.response = None
+        self.code = None
+        self.errors = []
+        self.msg = msg
+
+    def __str__(self):
+        return self.msg
+
+
 error_classes = {
     404: NotFoundError
 }
@@ -0,0 +1,882 @@
+"""Shared behavior for live endpoints.
+
+The adapters each implement their own live iterators on top of their
+respective HTTP libraries. The classes in this module hold the state
+and policies that are independent of the adapter in use.
+
+"""
+
+from __future__ import unicode_literals
+from collections import deque, namedtuple, OrderedDict
+from datetime import timedelta
+import heapq
+import re
+import struct
+import time
+
+from .util import from_iso_date
+
+
+Event = namedtuple('Event', ['id', 'event', 'data'])
+
+_LINE_END = re.compile(b'\r\n|\r|\n')
+_BOM = b'\xef\xbb\xbf'
+
+
+class EventParser(object):
+    """An incremental parser for server-sent event streams.
+
+    The parser is fed the raw bytes of a ``text/event-stream`` response
+    in chunks as they arrive from the network. Chunks may be split at
+    arbitrary boundaries, including in the middle of a line, a UTF-8
+    sequence or a ``\\r\\n`` line ending. Complete events are returned
+    as soon as their terminating blank line has been received, as
+    :class:`Event` tuples of the last event id, the event type and the
+    decoded data.
+
+    All fields of the `server-sent events
+    <https://html.spec.whatwg.org/multipage/server-sent-events.html>`_
+    format are supported: multi-line ``data``, ``event`` types, ``id``
+    which persists across events as ``last_event_id``, and ``retry``
+    which is exposed in milliseconds. Comment lines are counted in
+    ``comments``.
+
+    Field values are kept as bytes until an event is dispatched, when
+    its data lines are joined and decoded once.
+
+    """
+
+    def __init__(self):
+        """Construct a parser for a new stream."""
+        self._buffer = b''
+        self._started = False
+        self._skip_lf = False
+        self._data = []
+        self._event = None
+        self.last_event_id = None
+        self.retry = None
+        self.comments = 0
+
+    def feed(self, chunk):
+        """Parse a chunk of the stream.
+
+        Args:
+
+            chunk(bytes): The next bytes of the stream
+
+        Returns:
+
+            list(Event): The events completed by this chunk
+        """
+        if not self._started:
+            chunk = self._buffer + chunk
+            self._buffer = b''
+            if len(chunk) < len(_BOM) and _BOM.startswith(chunk):
+                self._buffer = chunk
+                return []
+            self._started = True
+            if chunk.startswith(_BOM):
+                chunk = chunk[len(_BOM):]
+        if self._skip_lf and chunk:
+            self._skip_lf = False
+            if chunk[:1] == b'\n':
+                chunk = chunk[1:]
+        buffer = self._buffer + chunk if self._buffer else chunk
+
+        events = []
+        data = self._data
+        pos = 0
+        end = len(buffer)
+        for match in _LINE_END.finditer(buffer):
+            line = buffer[pos:match.start()]
+            pos = match.end()
+            if not line:
+                # An event with an empty data buffer is not dispatched
+                value = b'\n'.join(data)
+                if value:
+                    events.append(Event(self.last_event_id,
+                                        self._event or 'message',
+                                        value.decode('utf-8', 'replace')))
+                data = self._data = []
+                self._event = None
+                continue
+            colon = line.find(b':')
+            if colon == 0:
+                self.comments += 1
+                continue
+            if colon < 0:
+                field, value = line, b''
+            else:
+                field = line[:colon]
+                start = colon + 1
+                if line[start:start + 1] == b' ':
+                    start += 1
+                value = line[start:]
+            if field == b'data':
+                data.append(value)
+            elif field == b'event':
+                self._event = value.decode('utf-8', 'replace')
+            elif field == b'id':
+                if b'\0' not in value:
+                    self.last_event_id = value.decode('utf-8', 'replace')
+            elif field == b'retry':
+                if value.isdigit():
+                    self.retry = int(value)
+        if pos == end and buffer[end - 1:end] == b'\r':
+            # The \r\n line ending may continue in the next chunk
+            self._skip_lf = True
+        self._buffer = buffer[pos:]
+        return events
+
+
+class SeenSet(object):
+    """A bounded set of recently seen ids.
+
+    Only the most recent ``size`` ids are remembered, which keeps
+    memory bounded on long running streams while still catching the
+    duplicates that are produced by reconnects and backfills.
+
+    """
+
+    __slots__ = ('_order', '_ids')
+
+    def __init__(self, size=1024):
+        """Construct a seen set.
+
+        Keyword Args:
+
+            size(int): The number of ids to remember
+        """
+        self._order = deque(maxlen=size)
+        self._ids = set()
+
+    def add(self, id):
+        """Remember an id.
+
+        Args:
+
+            id: The id to remember
+
+        Returns:
+
+            True if the id was not seen before, False otherwise.
+        """
+        ids = self._ids
+        if id in ids:
+            return False
+        order = self._order
+        if len(order) == order.maxlen:
+            ids.discard(order[0])
+        order.append(id)
+        ids.add(id)
+        return True
+
+    def __contains__(self, id):
+        """Check whether an id was recently seen."""
+        return id in self._ids
+
+    def __len__(self):
+        """Return the number of remembered ids."""
+        return len(self._ids)
+
+
+class LiveStats(object):
+    """Counters for a live stream.
+
+    Attributes:
+
+        reconnects(int): The number of times the stream reconnected
+
+        gaps(int): The number of reconnects that had to backfill
+            missed datapoints
+
+        backfilled(int): The total number of datapoints recovered
+            through backfill
+
+        last_gap(int): The number of datapoints backfilled after the
+            last reconnect
+
+        duplicates(int): The number of duplicate datapoints that were
+            suppressed
+
+    """
+
+    def __init__(self):
+        """Construct zeroed counters."""
+        self.reconnects = 0
+        self.gaps = 0
+        self.backfilled = 0
+        self.last_gap = 0
+        self.duplicates = 0
+
+    def __repr__(self):
+        """The string representation of the counters."""
+        return ('<LiveStats {{ reconnects: {s.reconnects}, '
+                'gaps: {s.gaps}, backfilled: {s.backfilled}, '
+                'duplicates: {s.duplicates} }}>').format(s=self)
+
+
+class Resume(object):
+    """Reconnect and backfill policy for a live stream.
+
+    A live stream that is resumed tracks the id of the last received
+    event and the timestamp of the last received datapoint. When the
+    connection drops the stream reconnects with exponential backoff,
+    passing the last event id in a ``Last-Event-ID`` header, and
+    backfills any datapoints that were missed during the outage using
+    the regular timeseries endpoint.
+
+    Datapoints that were already delivered are suppressed using a
+    bounded :class:`SeenSet`.
+
+    You normally don't construct this directly but call
+    :meth:`Timeseries.live` with ``resume=True``.
+
+    """
+
+    def __init__(self, backfill=None,
+                 max_reconnects=None,
+                 backoff=1.0,
+                 max_backoff=30.0,
+                 seen_size=1024):
+        """Construct a resume policy.
+
+        Keyword Args:
+
+            backfill(func): A function that, given an ISO8601 start
+                timestamp, returns a :class:`Timeseries` of the
+                datapoints since that time.
+
+            max_reconnects(int): The maximum number of consecutive
+                reconnect attempts before giving up, or ``None`` to
+                retry forever
+
+            backoff(float): The initial reconnect delay in seconds
+
+            max_backoff(float): The maximum reconnect delay in seconds
+
+            seen_size(int): The number of datapoint ids to remember for
+                duplicate suppression
+        """
+        self._backfill = backfill
+        self.max_reconnects = max_reconnects
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.seen = SeenSet(seen_size)
+        self.stats = LiveStats()
+        self.last_event_id = None
+        self.last_timestamp = None
+        self.attempts = 0
+
+    def headers(self):
+        """Return the headers to resume the stream with."""
+        if not self.last_event_id:
+            return None
+        return {'Last-Event-ID': self.last_event_id}
+
+    def event(self, event_id):
+        """Record the id of a received event."""
+        if event_id is not None:
+            self.last_event_id = event_id
+
+    def retry(self, milliseconds):
+        """Use the reconnect delay requested by the server."""
+        self.backoff = milliseconds / 1000.0
+
+    def accept(self, resource):
+        """Record a received resource.
+
+        Args:
+
+            resource(Resource): The received resource
+
+        Returns:
+
+            True if the resource should be delivered, False if it is a
+            duplicate.
+        """
+        if not self._record(resource):
+            self.stats.duplicates += 1
+            return False
+        self.attempts = 0
+        return True
+
+    def _record(self, resource):
+        if not self.seen.add(resource.id):
+            return False
+        timestamp = resource._json_data.get('attributes', {}).get('timestamp')
+        if timestamp is not None:
+            last = self.last_timestamp
+            if last is None or timestamp > last:
+                self.last_timestamp = timestamp
+        return True
+
+    def next_delay(self):
+        """Return the delay before the next reconnect attempt.
+
+        Returns:
+
+            The delay in seconds, or ``None`` if the maximum number of
+            reconnect attempts was reached.
+        """
+        max_reconnects = self.max_reconnects
+        if max_reconnects is not None and self.attempts >= max_reconnects:
+            return None
+        delay = min(self.max_backoff, self.backoff * (2 ** self.attempts))
+        self.attempts += 1
+        return delay
+
+    def reconnected(self):
+        """Record that the stream was re-established."""
+        self.stats.reconnects += 1
+
+    def backfill(self):
+        """Return a timeseries of possibly missed datapoints, or None."""
+        if self._backfill is None or self.last_timestamp is None:
+            return None
+        return self._backfill(self.last_timestamp)
+
+    def backfilled(self, resources):
+        """Filter and record backfilled resources.
+
+        Args:
+
+            resources(list): The backfilled resources, newest first
+
+        Returns:
+
+            The resources that were missed, in ascending time order
+        """
+        # Backfills overlap with delivered datapoints by design, so
+        # those are not counted as duplicates
+        missed = [resource for resource in reversed(resources)
+                  if self._record(resource)]
+        self.stats.last_gap = len(missed)
+        if missed:
+            self.stats.gaps += 1
+            self.stats.backfilled += len(missed)
+        return missed
+
+
+class BufferStats(object):
+    """Counters for a live stream buffer.
+
+    Attributes:
+
+        received(int): The number of resources read from the stream
+
+        delivered(int): The number of resources handed to the consumer
+
+        dropped(int): The number of resources dropped on overflow
+
+        coalesced(int): The number of resources replaced by a newer
+            resource for the same sensor and port
+
+        depth(int): The number of currently buffered resources
+
+        max_depth(int): The highest number of buffered resources
+
+        lag(float): The time in seconds the last delivered resource
+            spent in the buffer
+
+    """
+
+    def __init__(self):
+        """Construct zeroed counters."""
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.depth = 0
+        self.max_depth = 0
+        self.lag = 0.0
+
+    def __repr__(self):
+        """The string representation of the counters."""
+        return ('<BufferStats {{ depth: {s.depth}, lag: {s.lag:.3f}, '
+                'received: {s.received}, delivered: {s.delivered}, '
+                'dropped: {s.dropped}, coalesced: {s.coalesced} }}>'
+                ).format(s=self)
+
+
+class LiveBuffer(object):
+    """A bounded buffer between a live stream and its consumer.
+
+    The buffer decides what happens when the stream produces resources
+    faster than they are consumed. The ``overflow`` policy is one of:
+
+    :block: Stop reading the stream until the consumer catches up
+    :drop-oldest: Drop the oldest buffered resource
+    :drop-newest: Drop the newly received resource
+    :coalesce: Keep only the latest resource per sensor and port,
+        dropping the oldest entry if there are more distinct sensor
+        and port pairs than fit the buffer
+
+    The buffer itself does not wait or lock, that is left to the
+    adapter specific readers that use it.
+
+    """
+
+    POLICIES = ('block', 'drop-oldest', 'drop-newest', 'coalesce')
+
+    def __init__(self, maxsize=1000, overflow='block'):
+        """Construct a buffer.
+
+        Keyword Args:
+
+            maxsize(int): The maximum number of buffered resources
+
+            overflow(string): The overflow policy
+        """
+        if overflow not in self.POLICIES:
+            raise ValueError("Unknown overflow policy: {}".format(overflow))
+        if maxsize < 1:
+            raise ValueError("The buffer size must be at least 1")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._coalesce = overflow == 'coalesce'
+        self._entries = OrderedDict() if self._coalesce else deque()
+        self.stats = BufferStats()
+
+    def __len__(self):
+        """Return the number of buffered resources."""
+        return len(self._entries)
+
+    def full(self):
+        """Check whether the buffer is full."""
+        return len(self._entries) >= self.maxsize
+
+    @property
+    def lag(self):
+        """The age in seconds of the oldest buffered resource."""
+        entries = self._entries
+        if not entries:
+            return 0.0
+        if self._coalesce:
+            arrived = next(iter(entries.values()))[0]
+        else:
+            arrived = entries[0][0]
+        return time.time() - arrived
+
+    @staticmethod
+    def _key(resource):
+        try:
+            sensor_id = resource.sensor_id
+        except AttributeError:
+            sensor_id = None
+        port = resource._json_data.get('attributes', {}).get('port')
+        return (sensor_id, port)
+
+    def put(self, resource):
+        """Add a resource according to the overflow policy.
+
+        Args:
+
+            resource(Resource): The resource read from the stream
+
+        Returns:
+
+            False if the buffer is full and the policy is ``block``,
+            True otherwise.
+        """
+        entries = self._entries
+        stats = self.stats
+        if self._coalesce:
+            key = self._key(resource)
+            if key in entries:
+                # Keep the position and arrival time of the entry
+                entries[key] = (entries[key][0], resource)
+                stats.received += 1
+                stats.coalesced += 1
+                return True
+        if len(entries) >= self.maxsize:
+            if self.overflow == 'block':
+                return False
+            stats.received += 1
+            stats.dropped += 1
+            if self.overflow == 'drop-newest':
+                return True
+            if self._coalesce:
+                entries.popitem(last=False)
+            else:
+                entries.popleft()
+        else:
+            stats.received += 1
+        entry = (time.time(), resource)
+        if self._coalesce:
+            entries[key] = entry
+        else:
+            entries.append(entry)
+        stats.depth = len(entries)
+        stats.max_depth = max(stats.max_depth, stats.depth)
+        return True
+
+    def get(self):
+        """Remove and return the oldest buffered resource.
+
+        Raises an IndexError if the buffer is empty.
+        """
+        entries = self._entries
+        if self._coalesce:
+            if not entries:
+                raise IndexError("get from an empty buffer")
+            arrived, resource = entries.popitem(last=False)[1]
+        else:
+            arrived, resource = entries.popleft()
+        stats = self.stats
+        stats.delivered += 1
+        stats.depth = len(entries)
+        stats.lag = time.time() - arrived
+        return resource
+
+
+class ReorderStats(object):
+    """Counters for a reorder stage.
+
+    Attributes:
+
+        reordered(int): The number of datapoints that arrived after a
+            datapoint with a later timestamp
+
+        duplicates(int): The number of dropped duplicate datapoints
+
+        late(int): The number of datapoints that arrived after the
+            watermark had passed them
+
+        pending(int): The number of currently held datapoints
+
+    """
+
+    def __init__(self):
+        """Construct zeroed counters."""
+        self.reordered = 0
+        self.duplicates = 0
+        self.late = 0
+        self.pending = 0
+
+    def __repr__(self):
+        """The string representation of the counters."""
+        return ('<ReorderStats {{ pending: {s.pending}, '
+                'reordered: {s.reordered}, duplicates: {s.duplicates}, '
+                'late: {s.late} }}>').format(s=self)
+
+
+class Reorderer(object):
+    """Deliver live datapoints in timestamp order without duplicates.
+
+    Datapoints are held for up to ``delay`` seconds and released in
+    ``timestamp`` order once the watermark passes them. The watermark
+    is the latest timestamp received minus the delay, and it also
+    advances to the timestamps of datapoints that have been held for
+    ``delay`` seconds of wall clock time, so a quiet stream does not
+    hold datapoints forever.
+
+    Datapoints with an id that was recently delivered are dropped
+    using a bounded :class:`SeenSet`. Datapoints that arrive with a
+    timestamp before the last delivered one can no longer be delivered
+    in order and are passed to the ``on_late`` callback instead, or
+    kept in the bounded ``late`` queue.
+
+    You normally don't construct this directly but call ``reorder`` on
+    a live stream.
+
+    """
+
+    def __init__(self, delay=1.0, seen_size=10000, on_late=None,
+                 late_size=1000):
+        """Construct a reorder stage.
+
+        Keyword Args:
+
+            delay(float): The number of seconds to hold datapoints
+
+            seen_size(int): The number of datapoint ids to remember for
+                duplicate detection
+
+            on_late(func): A function called with every late datapoint
+
+            late_size(int): The number of late datapoints to keep when
+                no ``on_late`` function is given
+        """
+        self.delay = delay
+        self._delta = timedelta(seconds=delay)
+        self._seen = SeenSet(seen_size)
+        self._on_late = on_late
+        self.late = deque(maxlen=late_size)
+        self._heap = []
+        self._arrivals = deque()
+        self._sequence = 0
+        self._latest = None
+        self._watermark = None
+        self._emitted = None
+        self.stats = ReorderStats()
+
+    def push(self, point):
+        """Add a received datapoint.
+
+        Args:
+
+            point(DataPoint): The received datapoint
+
+        Returns:
+
+            A list of the datapoints that are released, in timestamp order
+        """
+        stats = self.stats
+        if not self._seen.add(point.id):
+            stats.duplicates += 1
+            return []
+        timestamp = from_iso_date(
+            point._json_data.get('attributes', {}).get('timestamp'))
+        if self._emitted is not None and timestamp < self._emitted:
+            stats.late += 1
+            if self._on_late is not None:
+                self._on_late(point)
+            else:
+                self.late.append(point)
+            return []
+        if self._latest is not None and timestamp < self._latest:
+            stats.reordered += 1
+        self._sequence += 1
+        heapq.heappush(self._heap, (timestamp, self._sequence, point))
+        self._arrivals.append((time.time(), timestamp))
+        if self._latest is None or timestamp > self._latest:
+            self._latest = timestamp
+        self._advance(self._latest - self._delta)
+        return self.poll()
+
+    def _advance(self, watermark):
+        if self._watermark is None or watermark > self._watermark:
+            self._watermark = watermark
+
+    def poll(self):
+        """Release the datapoints that were held for the full delay.
+
+        Returns:
+
+            A list of the datapoints that are released, in timestamp order
+        """
+        arrivals = self._arrivals
+        due = time.time() - self.delay
+        while arrivals and arrivals[0][0] <= due:
+            self._advance(arrivals.popleft()[1])
+        return self._release(self._watermark)
+
+    def flush(self):
+        """Release all held datapoints.
+
+        Returns:
+
+            A list of the held datapoints in timestamp order
+        """
+        self._arrivals.clear()
+        return self._release(None)
+
+    def next_due(self):
+        """Return the number of seconds until a held datapoint is due.
+
+        Returns:
+
+            The number of seconds, or ``None`` if no datapoint is held
+        """
+        if not self._heap:
+            self._arrivals.clear()
+            return None
+        if not self._arrivals:
+            return 0
+        return max(0, self._arrivals[0][0] + self.delay - time.time())
+
+    def _release(self, watermark):
+        heap = self._heap
+        released = []
+        while heap and (watermark is None or heap[0][0] <= watermark):
+            timestamp, _, point = heapq.heappop(heap)
+            self._emitted = timestamp
+            released.append(point)
+        self.stats.pending = len(heap)
+        return released
+
+
+def datapoint_columns(points):
+    """Convert a list of datapoints into columns.
+
+    Args:
+
+        points(list): The :class:`DataPoint` instances to convert
+
+    Returns:
+
+        An ordered dictionary mapping ``id``, ``port``, ``value``,
+        ``timestamp`` and ``sensor_id`` to lists of the respective
+        datapoint values.
+    """
+    columns = OrderedDict((name, []) for name in ('id', 'port', 'value',
+                                                  'timestamp', 'sensor_id'))
+    ids, ports, values, timestamps, sensor_ids = columns.values()
+    for point in points:
+        data = point._json_data
+        attributes = data.get('attributes', {})
+        relationships = data.get('relationships') or {}
+        sensor = (relationships.get('sensor') or {}).get('data') or {}
+        ids.append(data.get('id'))
+        ports.append(attributes.get('port'))
+        values.append(attributes.get('value'))
+        timestamps.append(attributes.get('timestamp'))
+        sensor_ids.append(sensor.get('id'))
+    return columns
+
+
+def make_batch(resources, columnar=False):
+    """Return a batch of resources as a list or as columns."""
+    return datapoint_columns(resources) if columnar else resources
+
+
+def batches(stream, max_size=100, max_latency=1.0, columnar=False):
+    """Group a live stream into batches.
+
+    A batch is yielded once it holds ``max_size`` resources, or once
+    ``max_latency`` seconds have passed since its first resource was
+    received, even if no further resources arrive. The stream is read
+    with timed polls so that a quiet stream does not hold back a
+    partial batch.
+
+    Args:
+
+        stream: The live stream to batch, with a ``poll(timeout)``
+            method that returns the next resource or ``None``, and a
+            ``done`` property, like a threaded live stream
+
+    Keyword Args:
+
+        max_size(int): The maximum number of resources in a batch
+
+        max_latency(float): The maximum age in seconds of the first
+            resource in a batch
+
+        columnar(bool): Whether to yield :func:`datapoint_columns`
+            instead of lists
+
+    Returns:
+
+        A generator of batches
+    """
+    batch = []
+    deadline = None
+    while True:
+        timeout = None
+        if deadline is not None:
+            timeout = max(0, deadline - time.time())
+        resource = stream.poll(timeout)
+        if resource is None:
+            if stream.done:
+                break
+            # The latency bound of the batch was reached
+            yield make_batch(batch, columnar)
+            batch = []
+            deadline = None
+            continue
+        if not batch:
+            deadline = time.time() + max_latency
+        batch.append(resource)
+        if len(batch) >= max_size:
+            yield make_batch(batch, columnar)
+            batch = []
+            deadline = None
+    if batch:
+        yield make_batch(batch, columnar)
+
+
+_RECORDING_MAGIC = b'HELIUM-SSE-1\n'
+_RECORD_HEADER = struct.Struct('!dI')
+
+
+class Recorder(object):
+    """Record the raw bytes of a live stream with their timing.
+
+    A recording stores every chunk read from a live connection along
+    with the number of seconds since the recording started. Recordings
+    can be served again with :func:`read_recording` or the replay
+    adapter in :mod:`helium.adapter.replay`, which makes live stream
+    consumers testable and benchmarkable offline.
+
+    You normally don't construct this directly but call ``record`` on
+    a live stream:
+
+    .. code-block:: python
+
+        with sensor.timeseries().live().record('sensor.sse') as live:
+            live.take(100)
+
+    """
+
+    def __init__(self, path):
+        """Construct a recorder.
+
+        Args:
+
+            path(string): The file to write the recording to
+        """
+        self._file = open(path, 'wb')
+        self._file.write(_RECORDING_MAGIC)
+        self._start = None
+
+    def write(self, chunk):
+        """Record a chunk of the stream."""
+        now = time.time()
+        if self._start is None:
+            self._start = now
+        self._file.write(_RECORD_HEADER.pack(now - self._start, len(chunk)))
+        self._file.write(chunk)
+
+    def close(self):
+        """Finish the recording."""
+        self._file.close()
+
+
+def read_recording(path):
+    """Read a live stream recording.
+
+    Args:
+
+        path(string): The file written by a :class:`Recorder`
+
+    Returns:
+
+        A generator of ``(offset, chunk)`` tuples, where ``offset`` is
+        the number of seconds since the start of the recording
+    """
+    size = _RECORD_HEADER.size
+    with open(path, 'rb') as recording:
+        if recording.read(len(_RECORDING_MAGIC)) != _RECORDING_MAGIC:
+            raise ValueError("Not a live stream recording: {}".format(path))
+        while True:
+            header = recording.read(size)
+            if len(header) < size:
+                return
+            offset, length = _RECORD_HEADER.unpack(header)
+            yield offset, recording.read(length)
+
+
+def replay_recording(path, speed=1.0):
+    """Replay the chunks of a recording with their original timing.
+
+    Args:
+
+        path(string): The file written by a :class:`Recorder`
+
+    Keyword Args:
+
+        speed(float): The replay speed relative to the recording, or
+            ``None`` to replay as fast as possible
+
+    Returns:
+
+        A generator of chunks
+    """
+    start = time.time()
+    for offset, chunk in read_recording(path):
+        if speed:
+            delay = start + offset / speed - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        yield chunk
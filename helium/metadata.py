@@ -1,7 +1,22 @@
 """The metadata resource."""
 
 from __future__ import unicode_literals
-from . import Resource, CB, build_request_body
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from builtins import str as text_type
+from collections import OrderedDict
+from functools import partial
+from json import dumps as to_json
+from numbers import Number
+from . import Resource, BulkResult, CB, build_request_body
+
+
+def _notify(session, target_resource_path, metadata):
+    for index in list(session._metadata_indexes):
+        index._updated(target_resource_path, metadata)
+    return metadata
 
 
 class Metadata(Resource):
@@ -25,17 +40,37 @@ class Metadata(Resource):
     Replacing the metadata replaces the entire JSON object with the
     given value.
 
+    Like any resource, metadata attributes can also be assigned and
+    saved, which updates only the assigned attributes:
+
+    .. code-block:: python
+
+        metadata = sensor.metadata()
+        metadata.site = 'sf'
+        metadata.save()
+
     """
 
     def __init__(self, json, session, target_resource_path):
         super(Metadata, self).__init__(json, session)
         self._target_resource_path = target_resource_path
 
-    def _publish_metadata(self, publish, attributes):
-        session = self._session
-        resource_type = self.__class__._resource_type()
-        target_resource_path = self._target_resource_path
-        target_resource_id = None if self.is_singleton() else self.id
+    def _serialization_state(self):
+        state = super(Metadata, self)._serialization_state()
+        state['target'] = self._target_resource_path
+        return state
+
+    @classmethod
+    def _from_serialization_state(cls, json, session, state):
+        result = cls(json, session, state['target'])
+        if state.get('singleton'):
+            setattr(result, '_singleton', True)
+        return result
+
+    @classmethod
+    def _publish(cls, session, publish, target_resource_path,
+                 target_resource_id, attributes, then=None):
+        resource_type = cls._resource_type()
         url = session._build_url(target_resource_path, target_resource_id,
                                  resource_type)
         body = build_request_body(resource_type,
@@ -43,9 +78,27 @@ class Metadata(Resource):
                                   attributes=attributes)
         def _process(json):
             data = json.get('data')
-            return Metadata(data, session, target_resource_path)
+            metadata = Metadata(data, session, target_resource_path)
+            _notify(session, target_resource_path, metadata)
+            return metadata if then is None else then(metadata)
         return publish(url, CB.json(200, _process), json=body)
 
+    @classmethod
+    def _publish_for(cls, session, publish, resource, attributes):
+        target_resource_id = None if resource.is_singleton() else resource.id
+        return cls._publish(session, publish, resource._resource_path(),
+                            target_resource_id, attributes)
+
+    def _publish_metadata(self, publish, attributes, then=None):
+        target_resource_id = None if self.is_singleton() else self.id
+        return self._publish(self._session, publish,
+                             self._target_resource_path, target_resource_id,
+                             attributes, then=then)
+
+    def _update(self, attributes, then=None):
+        return self._publish_metadata(self._session.patch, attributes,
+                                      then=then)
+
     def update(self, attributes):
         """Update metadata.
 
@@ -63,7 +116,7 @@ class Metadata(Resource):
             The updated metadata
 
         """
-        return self._publish_metadata(self._session.patch, attributes)
+        return self._update(attributes)
 
     def replace(self, attributes):
         """Replace the metadata.
@@ -83,6 +136,87 @@ class Metadata(Resource):
         """
         return self._publish_metadata(self._session.put, attributes)
 
+    @classmethod
+    def update_all(cls, session, resources, attributes, replace=False,
+                   concurrency=None):
+        """Update the metadata of a number of resources concurrently.
+
+        The given attributes are either a dictionary that is merged
+        into the metadata of every resource, or a function that is
+        called with a resource and its current metadata attributes and
+        returns the attributes to merge into the metadata of that
+        resource:
+
+        .. code-block:: python
+
+            result = Metadata.update_all(session, sensors, {'site': 'sf'},
+                                         concurrency=20)
+
+            def rename(sensor, attributes):
+                return {'site': attributes.get('location')}
+
+            result = Metadata.update_all(session, sensors, rename)
+
+        A dictionary is sent with a single request per resource, since
+        updating merges it into the existing metadata on the server. A
+        function needs the current metadata, which is fetched first.
+        If the function returns ``None`` the metadata of that resource
+        is left as it is. Resources that are given more than once are
+        updated once.
+
+        Args:
+
+            session(Session): The session to update the metadata with
+
+            resources(list): The resources whose metadata to update
+
+            attributes(dict or func): The attributes to merge, or the
+                function returning them for a resource
+
+        Keyword Args:
+
+            replace(bool): Replace the metadata with the attributes
+                instead of merging them
+
+            concurrency(int): The maximum number of concurrent requests
+
+        Returns:
+
+            BulkResult: The updated metadata and the resources that
+                failed to update with their errors.
+
+        """
+        resources = list(OrderedDict((resource.id, resource)
+                                     for resource in resources).values())
+        publish = session.put if replace else session.patch
+
+        def _fetch_and_update(resource):
+            target_resource_path = resource._resource_path()
+            target_resource_id = None if resource.is_singleton() \
+                else resource.id
+            url = session._build_url(target_resource_path,
+                                     target_resource_id,
+                                     cls._resource_type())
+
+            def _process(json):
+                data = json.get('data')
+                current = dict(data.get('attributes') or {})
+                changes = attributes(resource, current)
+                if changes is None:
+                    return Metadata(data, session, target_resource_path)
+                return cls._publish_for(session, publish, resource, changes)
+            return session.get(url, CB.json(200, _process))
+
+        if callable(attributes):
+            calls = [partial(_fetch_and_update, resource)
+                     for resource in resources]
+        else:
+            calls = [partial(cls._publish_for, session, publish, resource,
+                             attributes)
+                     for resource in resources]
+        process = partial(BulkResult._from_results, resources)
+        return session.gather(calls, process, concurrency=concurrency)
+
 
 def metadata():
     """Create a metadata method builder.
@@ -111,7 +245,7 @@ def metadata():
                 metadata = Metadata(data, session, resource_path)
                 if self.is_singleton():
                     setattr(metadata, '_singleton', True)
-                return metadata
+                return _notify(session, resource_path, metadata)
 
             return session.get(url, CB.json(200, _process))
 
@@ -120,3 +254,482 @@ def metadata():
         return cls
 
     return method_builder
+
+
+def _token(value):
+    # Numbers compare by value, everything else by its canonical JSON
+    # so that unhashable values can be indexed and strings never equal
+    # numbers or booleans
+    if isinstance(value, Number) and not isinstance(value, bool):
+        return value
+    return to_json(value, sort_keys=True)
+
+
+def _kind(value):
+    if isinstance(value, Number) and not isinstance(value, bool):
+        return 'number'
+    if isinstance(value, text_type):
+        return 'string'
+    return None
+
+
+def _contains(actual, expected):
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and all(
+            key in actual and _contains(actual[key], value)
+            for key, value in expected.items())
+    if isinstance(expected, list):
+        return isinstance(actual, list) and all(
+            any(_contains(item, value) for item in actual)
+            for value in expected)
+    return _token(actual) == _token(expected)
+
+
+class MetadataIndex(object):
+    """A local, queryable index of the metadata of many resources.
+
+    Filtering resources on metadata with :meth:`Resource.where` makes a
+    request for every filter, and fetching the metadata of resources
+    one by one makes a request per resource. An index loads the
+    metadata of all resources of a class concurrently once and answers
+    metadata queries without any requests:
+
+    .. code-block:: python
+
+        index = MetadataIndex.load(client, Sensor, concurrency=20)
+        freezers = index.contains(site='sf', kind='freezer')
+        recent = index.range('installed', gte='2016-09-01')
+
+    The index inverts the metadata on its top level keys and values.
+    Containment and equality queries are answered from the intersection
+    of the matching entries, range queries from a sorted view of the
+    numbers or strings stored under a key.
+
+    Metadata fetched, updated or replaced through the session the index
+    was loaded with is written to the index, so it stays current for
+    the indexed resources. The index is safe to share between threads.
+
+    """
+
+    def __init__(self, session, resource_class):
+        """Construct an empty metadata index.
+
+        You normally don't construct this directly but call
+        :meth:`load`.
+
+        Args:
+
+            session(Session): The session to keep the index current with
+
+            resource_class(Resource): The class of the indexed resources
+        """
+        self._session = session
+        self.resource_class = resource_class
+        self._resource_path = resource_class._resource_path()
+        self._resources = OrderedDict()
+        self._positions = {}
+        self._metadata = {}
+        self._keys = {}
+        self._values = {}
+        self._sorted = {}
+        self._lock = threading.RLock()
+        session._metadata_indexes.add(self)
+
+    @classmethod
+    def load(cls, session, resource_class, resources=None,
+             concurrency=None):
+        """Load the metadata of resources into a new index.
+
+        Args:
+
+            session(Session): The session to load the metadata with
+
+            resource_class(Resource): The class of the indexed resources
+
+        Keyword Args:
+
+            resources(list): The resources to index, all resources of
+                the given class are fetched and indexed if not given
+
+            concurrency(int): The maximum number of concurrent requests
+
+        Returns:
+
+            MetadataIndex: The loaded index
+        """
+        index = cls(session, resource_class)
+
+        def _load(resources):
+            def _process(results):
+                for resource, result in zip(resources, results):
+                    if isinstance(result, Exception):
+                        raise result
+                    index.add(resource, result)
+                return index
+            calls = [resource.metadata for resource in resources]
+            return session.gather(calls, _process, concurrency=concurrency)
+
+        if resources is not None:
+            return _load(list(resources))
+        url = session._build_url(index._resource_path)
+        process = resource_class._mk_many(session)
+        return session.get(url, CB.json(200,
+                                        lambda json: _load(process(json))))
+
+    def add(self, resource, metadata):
+        """Add or replace the metadata of a resource.
+
+        Args:
+
+            resource(Resource): The resource the metadata belongs to
+
+            metadata(Metadata): The metadata of the resource
+        """
+        with self._lock:
+            if resource.id not in self._resources:
+                self._positions[resource.id] = len(self._positions)
+            self._resources[resource.id] = resource
+            self._set(resource.id, metadata._json_data.get('attributes'))
+
+    def remove(self, resource):
+        """Remove a resource from the index.
+
+        Args:
+
+            resource: The resource, or its id, to remove
+        """
+        id = getattr(resource, 'id', resource)
+        with self._lock:
+            if self._resources.pop(id, None) is not None:
+                self._unset(id)
+                del self._metadata[id]
+
+    def _set(self, id, attributes):
+        if id in self._metadata:
+            self._unset(id)
+        attributes = attributes or {}
+        self._metadata[id] = attributes
+        for key, value in attributes.items():
+            self._keys.setdefault(key, set()).add(id)
+            self._values.setdefault((key, _token(value)), set()).add(id)
+            self._sorted.pop(key, None)
+
+    def _unset(self, id):
+        for key, value in self._metadata[id].items():
+            self._keys[key].discard(id)
+            self._values[(key, _token(value))].discard(id)
+            self._sorted.pop(key, None)
+
+    def _updated(self, resource_path, metadata):
+        if resource_path != self._resource_path:
+            return
+        with self._lock:
+            if metadata.id in self._resources:
+                self._set(metadata.id,
+                          metadata._json_data.get('attributes'))
+
+    def _resolve(self, ids):
+        positions = self._positions
+        resources = self._resources
+        return [resources[id] for id in sorted(ids, key=positions.get)]
+
+    def metadata(self, resource):
+        """Get the indexed metadata attributes of a resource.
+
+        Args:
+
+            resource: The resource, or its id, to get the metadata for
+
+        Returns:
+
+            dict: The metadata attributes, or ``None`` if the resource
+                is not indexed
+        """
+        return self._metadata.get(getattr(resource, 'id', resource))
+
+    def contains(self, attributes=None, **kwargs):
+        """Find the resources whose metadata contains the given attributes.
+
+        This matches like the metadata filter of :meth:`Resource.where`:
+        nested objects only need to contain the given keys and lists
+        only need to contain the given items.
+
+        Args:
+
+            attributes(dict): The metadata attributes to match
+
+        Keyword Args:
+
+            **kwargs: Additional metadata attributes to match
+
+        Returns:
+
+            list(Resource): The matching resources
+        """
+        expected = dict(attributes or {}, **kwargs)
+        with self._lock:
+            if not expected:
+                return list(self._resources.values())
+            candidates, nested = [], []
+            for key, value in expected.items():
+                if isinstance(value, (dict, list)):
+                    candidates.append(self._keys.get(key, ()))
+                    nested.append((key, value))
+                else:
+                    candidates.append(
+                        self._values.get((key, _token(value)), ()))
+            candidates.sort(key=len)
+            ids = set(candidates[0])
+            for other in candidates[1:]:
+                ids.intersection_update(other)
+            metadata = self._metadata
+            ids = [id for id in ids
+                   if all(_contains(metadata[id][key], value)
+                          for key, value in nested)]
+            return self._resolve(ids)
+
+    def equals(self, key, value):
+        """Find the resources with a metadata attribute of a given value.
+
+        Args:
+
+            key(string): The metadata attribute
+
+            value: The value the attribute must equal
+
+        Returns:
+
+            list(Resource): The matching resources
+        """
+        with self._lock:
+            return self._resolve(self._values.get((key, _token(value)), ()))
+
+    def has(self, key):
+        """Find the resources that have a given metadata attribute.
+
+        Args:
+
+            key(string): The metadata attribute
+
+        Returns:
+
+            list(Resource): The matching resources
+        """
+        with self._lock:
+            return self._resolve(self._keys.get(key, ()))
+
+    def range(self, key, gt=None, gte=None, lt=None, lte=None):
+        """Find the resources with a metadata attribute in a range.
+
+        Numbers are compared to numeric bounds and strings, like ISO8601
+        timestamps, to string bounds. Values of other types never match.
+
+        Args:
+
+            key(string): The metadata attribute
+
+        Keyword Args:
+
+            gt: Exclusive lower bound
+            gte: Inclusive lower bound
+            lt: Exclusive upper bound
+            lte: Inclusive upper bound
+
+        Returns:
+
+            list(Resource): The matching resources
+        """
+        bounds = [bound for bound in (gt, gte, lt, lte) if bound is not None]
+        if not bounds:
+            return self.has(key)
+        kind = _kind(bounds[0])
+        with self._lock:
+            values, ids = self._sorted_view(key).get(kind, ((), ()))
+            start, end = 0, len(values)
+            if gt is not None:
+                start = max(start, bisect_right(values, gt))
+            if gte is not None:
+                start = max(start, bisect_left(values, gte))
+            if lt is not None:
+                end = min(end, bisect_left(values, lt))
+            if lte is not None:
+                end = min(end, bisect_right(values, lte))
+            return self._resolve(ids[start:end])
+
+    def _sorted_view(self, key):
+        view = self._sorted.get(key)
+        if view is None:
+            entries = {}
+            metadata = self._metadata
+            for id in self._keys.get(key, ()):
+                value = metadata[id][key]
+                kind = _kind(value)
+                if kind is not None:
+                    entries.setdefault(kind, []).append((value, id))
+            view = {}
+            for kind, pairs in entries.items():
+                pairs.sort(key=lambda pair: pair[0])
+                view[kind] = ([value for value, _ in pairs],
+                              [id for _, id in pairs])
+            self._sorted[key] = view
+        return view
+
+    def __contains__(self, resource):
+        """Check whether a resource, or resource id, is indexed."""
+        return getattr(resource, 'id', resource) in self._resources
+
+    def __len__(self):
+        """The number of indexed resources."""
+        return len(self._resources)
+
+
+class MetadataWriter(object):
+    """Coalesces metadata updates into fewer requests.
+
+    Updates made through a writer are held back and merged per
+    resource, so a resource that is updated many times in a short
+    window has its metadata updated with a single request:
+
+    .. code-block:: python
+
+        writer = MetadataWriter(client, window=2.0, concurrency=20)
+        for reading in readings:
+            writer.update(reading.sensor, {'last_value': reading.value})
+        writer.flush()
+
+    Pending updates are sent, concurrently, ``window`` seconds after the
+    oldest pending update by a timer of the session's adapter, by the
+    first :meth:`update` made after that time, or by :meth:`flush`.
+    Later values for a top level metadata attribute replace earlier
+    ones. Whatever is still pending is sent when the writer is closed,
+    which a writer used as a context manager is on exit:
+
+    .. code-block:: python
+
+        with MetadataWriter(client) as writer:
+            writer.update(sensor, {'last_value': 42})
+
+    With the asyncio adapter use ``async with`` instead.
+
+    """
+
+    def __init__(self, session, window=1.0, concurrency=None,
+                 on_flush=None, clock=time.time):
+        """Construct a metadata writer.
+
+        Args:
+
+            session(Session): The session to update the metadata with
+
+        Keyword Args:
+
+            window(float): The number of seconds to hold back updates
+
+            concurrency(int): The maximum number of concurrent requests
+
+            on_flush(func): Called with the :class:`BulkResult` of every
+                flush, including the ones made by the timer
+
+            clock(func): The function returning the current time
+        """
+        self._session = session
+        self.window = window
+        self.concurrency = concurrency
+        self.on_flush = on_flush
+        self._clock = clock
+        self._pending = OrderedDict()
+        self._started = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def update(self, resource, attributes):
+        """Update the metadata of a resource.
+
+        Args:
+
+            resource(Resource): The resource whose metadata to update
+
+            attributes(dict): The attributes to merge into the metadata
+
+        Returns:
+
+            The result of :meth:`flush` if the pending updates were
+            sent, or ``None``
+        """
+        with self._lock:
+            entry = self._pending.get(resource.id)
+            if entry is None:
+                self._pending[resource.id] = (resource, dict(attributes))
+            else:
+                entry[1].update(attributes)
+            if self._started is None:
+                self._started = self._clock()
+                self._timer = self._session.schedule(self.window,
+                                                     self.flush)
+        if self.due:
+            return self.flush()
+        return self._session.gather([], lambda results: None)
+
+    @property
+    def due(self):
+        """Whether the oldest pending update is older than the window."""
+        started = self._started
+        return started is not None and \
+            self._clock() - started >= self.window
+
+    def flush(self):
+        """Send all pending updates.
+
+        Returns:
+
+            BulkResult: The updated metadata and the resources that
+                failed to update with their errors.
+        """
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._started = None
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        session = self._session
+        calls = [partial(Metadata._publish_for, session, session.patch,
+                         resource, attributes)
+                 for resource, attributes in pending]
+        resources = [resource for resource, _ in pending]
+
+        def _process(results):
+            result = BulkResult._from_results(resources, results)
+            if self.on_flush is not None:
+                self.on_flush(result)
+            return result
+        return session.gather(calls, _process, concurrency=self.concurrency)
+
+    def close(self):
+        """Send all pending updates and stop the timer.
+
+        Returns:
+
+            BulkResult: The result of the final :meth:`flush`
+        """
+        return self.flush()
+
+    def __enter__(self):
+        """Use the writer in a with statement."""
+        return self
+
+    def __exit__(self, *exc):
+        """Close the writer when leaving a with statement."""
+        self.close()
+
+    def __aenter__(self):
+        """Use the writer in an async with statement."""
+        return self._session.gather([], lambda results: self)
+
+    def __aexit__(self, *exc):
+        """Close the writer when leaving an async with statement."""
+        return self.close()
+
+    def __len__(self):
+        """The number of resources with pending updates."""
+        return len(self._pending)
@@ -0,0 +1,221 @@
+"""Declarative queries over resource collections."""
+
+from __future__ import unicode_literals
+from datetime import datetime
+from json import dumps as to_json
+from . import from_iso_date
+
+
+class Query(object):
+    """A declarative filter for resource collections.
+
+    A query describes the resources to fetch from a collection in terms
+    of attribute equality, attribute ranges, metadata containment and
+    sets of ids. Every query method returns a new query, so a query
+    can be built up in steps and reused:
+
+    .. code-block:: python
+
+        query = Query(name='freezer').range('meta.created',
+                                            gte=datetime(2016, 9, 1))
+        sensors = Sensor.where(session, query=query.metadata(site='sf'))
+
+    Only metadata containment is evaluated by the Helium API and pushed
+    into the request parameters. Every other condition is evaluated
+    client side: the collection is still fetched in full and the
+    conditions are compiled into a single predicate that is evaluated
+    against the raw JSON of every returned entry *before* a
+    :class:`Resource` is constructed for it, so entries that don't
+    match are never materialized.
+
+    Attribute paths name an attribute (``name``), the resource ``id``,
+    or a dotted path into the resource ``meta`` (``meta.created``).
+    Underscores in a path also match dashed JSON keys, just like
+    resource attribute lookup does. An explicit ``null`` in the JSON
+    equals ``None``, while a missing attribute matches no condition.
+
+    """
+
+    def __init__(self, **conditions):
+        """Construct a query.
+
+        Keyword Args:
+
+            **conditions: Attribute paths to the values they must equal
+
+        """
+        self._checks = ()
+        self._metadata = None
+        for path, value in sorted(conditions.items()):
+            self._checks += (('eq', path, value),)
+
+    def _extend(self, *checks):
+        query = Query()
+        query._checks = self._checks + checks
+        query._metadata = self._metadata
+        return query
+
+    def equals(self, **conditions):
+        """Require attributes to equal the given values.
+
+        Keyword Args:
+
+            **conditions: Attribute paths to the values they must equal
+
+        Returns:
+
+            Query: A new query with the added conditions
+        """
+        return self._extend(*[('eq', path, value)
+                              for path, value in sorted(conditions.items())])
+
+    def range(self, path, gt=None, gte=None, lt=None, lte=None):
+        """Require an attribute to be within a range.
+
+        Bounds that are :class:`datetime` objects compare against ISO8601
+        timestamp attributes, like ``meta.created``.
+
+        Args:
+
+            path(string): The attribute path to check
+
+        Keyword Args:
+
+            gt: Exclusive lower bound
+            gte: Inclusive lower bound
+            lt: Exclusive upper bound
+            lte: Inclusive upper bound
+
+        Returns:
+
+            Query: A new query with the added condition
+        """
+        return self._extend(('range', path, (gt, gte, lt, lte)))
+
+    def ids(self, ids):
+        """Require the resource id to be one of the given ids.
+
+        Args:
+
+            ids(iterable): The resource ids to accept
+
+        Returns:
+
+            Query: A new query with the added condition
+        """
+        return self._extend(('ids', 'id', frozenset(ids)))
+
+    def metadata(self, attributes=None, **kwargs):
+        """Require the resource metadata to contain the given attributes.
+
+        Metadata conditions are evaluated by the Helium API.
+
+        Args:
+
+            attributes(dict): The metadata attributes to match
+
+        Keyword Args:
+
+            **kwargs: Additional metadata attributes to match
+
+        Returns:
+
+            Query: A new query with the added condition
+        """
+        query = self._extend()
+        metadata = dict(self._metadata or {})
+        metadata.update(attributes or {})
+        metadata.update(kwargs)
+        query._metadata = metadata
+        return query
+
+    def _build_params(self, params):
+        """Push the conditions the API supports into request params."""
+        if self._metadata is not None:
+            if 'filter[metadata]' in params:
+                raise ValueError("Query metadata can not be combined "
+                                 "with a metadata filter")
+            params['filter[metadata]'] = to_json(self._metadata)
+        return params
+
+    def _predicate(self):
+        """Compile the remaining conditions into a raw JSON predicate.
+
+        Returns:
+
+            A function that given the JSON data of a resource returns
+                whether it matches, or ``None`` if every entry matches.
+
+        """
+        checks = [_compile_check(*check) for check in self._checks]
+        if len(checks) == 0:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+
+        def predicate(json):
+            for check in checks:
+                if not check(json):
+                    return False
+            return True
+        return predicate
+
+
+_MISSING = object()
+
+
+def _compile_getter(path):
+    if path == 'id':
+        return lambda json: json.get('id', _MISSING)
+    parts = path.split('.')
+    if parts[0] == 'meta':
+        section, parts = 'meta', parts[1:]
+    else:
+        section = 'attributes'
+    keys = [(part, part.replace('_', '-')) for part in parts]
+
+    def getter(json):
+        value = json.get(section)
+        for key, alt_key in keys:
+            if not isinstance(value, dict):
+                return _MISSING
+            found = value.get(key, _MISSING)
+            if found is _MISSING:
+                found = value.get(alt_key, _MISSING)
+            value = found
+        return value
+    return getter
+
+
+def _compile_check(kind, path, argument):
+    getter = _compile_getter(path)
+    if kind == 'eq':
+        return lambda json: getter(json) == argument
+    if kind == 'ids':
+        return lambda json: getter(json) in argument
+
+    gt, gte, lt, lte = argument
+    bounds = [bound for bound in argument if bound is not None]
+    if any(isinstance(bound, datetime) for bound in bounds):
+        raw_getter = getter
+
+        def getter(json):
+            value = raw_getter(json)
+            if value is _MISSING or value is None:
+                return value
+            return from_iso_date(value)
+
+    def check(json):
+        value = getter(json)
+        if value is _MISSING or value is None:
+            return False
+        if gt is not None and not value > gt:
+            return False
+        if gte is not None and not value >= gte:
+            return False
+        if lt is not None and not value < lt:
+            return False
+        if lte is not None and not value <= lte:
+            return False
+        return True
+    return check
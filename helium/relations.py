@@ -1,13 +1,17 @@
 """Manage relationships between resources."""
 
 from __future__ import unicode_literals
+from collections import OrderedDict, namedtuple
+from functools import partial
 from inflection import pluralize
 from builtins import filter as _filter
 from . import (
     CB,
     Resource,
+    ResourceIterable,
     build_request_relationship,
-    build_request_include
+    build_request_include,
+    build_request_fields
 )
 
 
@@ -35,6 +39,61 @@ class RelationType(object):
     """Use the direct relationship approach"""
 
 
+class Relation(namedtuple('Relation', ['name', 'dest_class', 'type', 'many',
+                                       'writable', 'resource_classes'])):
+    """Describes a relationship declared with ``to_one`` or ``to_many``.
+
+    ``name`` is the name of the generated fetch method, ``dest_class``
+    the target :class:`Resource` class and ``many`` whether it is a
+    to-many relationship.
+
+    """
+
+    __slots__ = ()
+
+
+def _register_relation(cls, relation):
+    relations = cls.__dict__.get('_relations')
+    if relations is None:
+        relations = OrderedDict()
+        setattr(cls, '_relations', relations)
+    relations[relation.name] = relation
+
+
+def declared_relations(cls):
+    """Get the relationships declared for a resource class.
+
+    Args:
+
+        cls(Resource): The resource class, relationships declared on
+            its base classes are included
+
+    Returns:
+
+        dict: The relationship names to their :class:`Relation`
+    """
+    result = OrderedDict()
+    for clazz in reversed(cls.__mro__):
+        result.update(clazz.__dict__.get('_relations', {}))
+    return result
+
+
+class SyncResult(namedtuple('SyncResult', ['added', 'removed', 'errors'])):
+    """The result of synchronizing a relationship.
+
+    ``added`` and ``removed`` are the resources that were added to and
+    removed from the relationship. ``errors`` is a list of
+    ``(resources, error)`` pairs for the requests that failed.
+
+    """
+
+    __slots__ = ()
+
+
+def _chunks(items, size):
+    return [items[n:n + size] for n in range(0, len(items), size)]
+
+
 def _build_relatonship(self, dest_resource_type, objs):
     session = self._session
     id = None if self.is_singleton() else self.id
@@ -50,6 +109,76 @@ def _build_relatonship(self, dest_resource_type, objs):
     return (session, url, json)
 
 
+def _relationship_cache(resource):
+    return getattr(resource._session, 'relationship_cache', None)
+
+
+def _cached_get(self, name, url, process, params=None, cacheable=True):
+    # Fetch a relationship through the session's relationship cache
+    session = self._session
+    cache = _relationship_cache(self)
+    if cache is None or not cacheable:
+        return session.get(url, CB.json(200, process), params=params)
+    key = (self._resource_type(), self.id, name)
+    json = cache.get(key)
+    if json is not None:
+        return session.gather([], lambda results: process(json))
+
+    def _process(json):
+        cache.set(key, json)
+        return process(json)
+    return session.get(url, CB.json(200, _process), params=params)
+
+
+def _resource_classes(cls):
+    classes = [cls]
+    for clazz in classes:
+        classes.extend(clazz.__subclasses__())
+    return classes
+
+
+def _related(class_a, class_b):
+    return issubclass(class_a, class_b) or issubclass(class_b, class_a)
+
+
+def _reverse_names(target_class, source_class):
+    return [relation.name
+            for relation in declared_relations(target_class).values()
+            if _related(source_class, relation.dest_class)]
+
+
+def _invalidating(self, name, dest_class, targets, callback, replace=False):
+    # Invalidate cached fetches of a relationship once it was mutated
+    if targets is None:
+        targets = []
+    elif isinstance(targets, Resource):
+        targets = [targets]
+    else:
+        targets = list(targets)
+
+    def func(response):
+        result = callback(response)
+        cache = _relationship_cache(self)
+        if cache is None:
+            return result
+        source_class = self.__class__
+        cache.invalidate(self._resource_type(), self.id, name)
+        if replace:
+            # The previous targets are not known, so drop the reverse
+            # relationship for all of them
+            for clazz in _resource_classes(dest_class):
+                for reverse_name in _reverse_names(clazz, source_class):
+                    cache.invalidate(clazz._resource_type(),
+                                     relationship=reverse_name)
+        for target in targets:
+            for reverse_name in _reverse_names(target.__class__,
+                                               source_class):
+                cache.invalidate(target._resource_type(), target.id,
+                                 reverse_name)
+        return result
+    return func
+
+
 def to_one(dest_class, type=RelationType.DIRECT, resource_classes=None,
            reverse=None, reverse_type=RelationType.DIRECT,
            writable=False):
@@ -93,6 +222,7 @@ def to_one(dest_class, type=RelationType.DIRECT, resource_classes=None,
     def method_builder(cls):
         dest_resource_type = dest_class._resource_type()
         dest_method_name = dest_resource_type.replace('-', '_')
+        decoder = dest_class._decoder(resource_classes)
         doc_variables = {
             'from_class': cls.__name__,
             'to_class': dest_class.__name__,
@@ -117,43 +247,38 @@ def to_one(dest_class, type=RelationType.DIRECT, resource_classes=None,
             included = self._included.get(dest_resource_type)
             if len(included) == 0:
                 return None
-            mk_one = dest_class._mk_one(session,
-                                        resource_classes=resource_classes)
-            return mk_one({
-                'data': included[0]
-            })
+            return decoder.one(included[0], session, fields=self._fields)
 
-        def fetch_relationship_direct(self, use_included=False):
+        def fetch_relationship_direct(self, use_included=False, fields=None):
             if use_included:
                 return _fetch_relationship_included(self)
             session = self._session
             id = None if self.is_singleton() else self.id
             url = session._build_url(self._resource_path(), id,
                                      dest_resource_type)
+            params = build_request_fields(fields, None)
             process = dest_class._mk_one(session,
-                                         resource_classes=resource_classes)
-            return session.get(url, CB.json(200, process))
+                                         resource_classes=resource_classes,
+                                         fields=fields)
+            return _cached_get(self, dest_method_name, url, process,
+                               params=params, cacheable=fields is None)
 
-        def fetch_relationship_include(self, use_included=False):
+        def fetch_relationship_include(self, use_included=False, fields=None):
             if use_included:
                 return _fetch_relationship_included(self)
             session = self._session
             id = None if self.is_singleton() else self.id
             url = session._build_url(self._resource_path(), id)
             params = build_request_include([dest_class], None)
+            params = build_request_fields(fields, params)
 
             def _process(json):
                 included = json.get('included')
                 if len(included) == 0:
                     return None
-
-                mk_one = dest_class._mk_one(session,
-                                            resource_classes=resource_classes)
-                return mk_one({
-                    'data': included[0]
-                })
-            return session.get(url, CB.json(200, _process),
-                               params=params)
+                return decoder.one(included[0], session, fields=fields)
+            return _cached_get(self, dest_method_name, url, _process,
+                               params=params, cacheable=fields is None)
 
         if type == RelationType.DIRECT:
             fetch_relationship = fetch_relationship_direct
@@ -177,13 +302,17 @@ def to_one(dest_class, type=RelationType.DIRECT, resource_classes=None,
             """
             session, url, json = _build_relatonship(self, dest_resource_type,
                                                     resource)
-            return session.patch(url, CB.boolean(200), json=json)
+            callback = _invalidating(self, dest_method_name, dest_class,
+                                     resource, CB.boolean(200), replace=True)
+            return session.patch(url, callback, json=json)
 
         methods = [(dest_method_name, fetch_relationship)]
         if writable:
             methods.extend([
                 ('update_{}'.format(dest_method_name), update_method)
             ])
+        _register_relation(cls, Relation(dest_method_name, dest_class, type,
+                                         False, writable, resource_classes))
         for name, method in methods:
             method.__doc__ = method.__doc__.format(**doc_variables)
             setattr(cls, name, method)
@@ -255,6 +384,7 @@ def to_many(dest_class, type=RelationType.DIRECT,
     def method_builder(cls):
         dest_resource_type = dest_class._resource_type()
         dest_method_name = pluralize(dest_resource_type).replace('-', '_')
+        decoder = dest_class._decoder(resource_classes)
         doc_variables = {
             'from_class': cls.__name__,
             'to_class': dest_class.__name__,
@@ -263,12 +393,39 @@ def to_many(dest_class, type=RelationType.DIRECT,
 
         fetch_method_doc = """Fetch the {to_name} associated with this :class:`{from_class}`.
 
+        Keyword Args:
+
+              use_included(bool): Use included resources instead of
+                  making a request
+
+              filter(func): A function to filter the resulting {to_name}
+
+              fields(dict): Resource classes to the list of attribute
+                  names to fetch for them
+
+              query(Query): A query the {to_name} need to match
+
         Returns:
 
               iterable({to_class}): The {to_name} of :class:`{from_class}`
         """
 
-        def _fetch_relationship_included(self, filter=None):
+        if type == RelationType.DIRECT:
+            fetch_method_doc += """
+        Direct relationships can also be paged through lazily by
+        passing ``iterate=True`` and an optional ``page_size``, which
+        returns a :class:`ResourceIterable` instead of a list.
+        """
+
+        def _included_predicate(query):
+            if query is None:
+                return None
+            if query._metadata is not None:
+                raise ValueError("Metadata queries are not supported "
+                                 "on included relationships")
+            return query._predicate()
+
+        def _fetch_relationship_included(self, filter=None, query=None):
             session = self._session
             include = self._include
             if include is None or dest_class not in include:
@@ -277,38 +434,61 @@ def to_many(dest_class, type=RelationType.DIRECT,
                 error = "{} was not included".format(dest_class.__name__)
                 raise AttributeError(error)
             included = self._included.get(dest_resource_type)
-            mk_one = dest_class._mk_one(session,
-                                        resource_classes=resource_classes)
-            result = [mk_one({'data': entry}) for entry in included]
+            predicate = _included_predicate(query)
+            if predicate is not None:
+                included = [entry for entry in included if predicate(entry)]
+            result = decoder.many(included, session, fields=self._fields)
             return result if filter is None else list(_filter(filter, result))
 
-        def fetch_relationship_include(self, use_included=False, filter=None):
+        def fetch_relationship_include(self, use_included=False, filter=None,
+                                       fields=None, query=None):
             if use_included:
-                return _fetch_relationship_included(self, filter=filter)
+                return _fetch_relationship_included(self, filter=filter,
+                                                    query=query)
             session = self._session
             id = None if self.is_singleton() else self.id
             url = session._build_url(self._resource_path(), id)
             params = build_request_include([dest_class], None)
+            params = build_request_fields(fields, params)
+            predicate = _included_predicate(query)
 
             def _process(json):
                 included = json.get('included')
-                mk_one = dest_class._mk_one(session,
-                                            resource_classes=resource_classes)
-                result = [mk_one({'data': entry}) for entry in included]
+                if predicate is not None:
+                    included = [entry for entry in included
+                                if predicate(entry)]
+                result = decoder.many(included, session, fields=fields)
                 return result if filter is None else list(_filter(filter, result))
-            return session.get(url, CB.json(200, _process), params=params)
+            return _cached_get(self, dest_method_name, url, _process,
+                               params=params, cacheable=fields is None)
 
-        def fetch_relationship_direct(self, use_included=False, filter=None):
+        def fetch_relationship_direct(self, use_included=False, filter=None,
+                                      iterate=False, page_size=None,
+                                      fields=None, query=None):
             if use_included:
-                return _fetch_relationship_included(self)
+                return _fetch_relationship_included(self, query=query)
             session = self._session
             id = None if self.is_singleton() else self.id
             url = session._build_url(self._resource_path(), id,
                                      dest_resource_type)
+            if iterate:
+                return ResourceIterable(session, dest_class, url,
+                                        page_size=page_size,
+                                        resource_classes=resource_classes,
+                                        filter=filter,
+                                        fields=fields,
+                                        query=query)
+            params = build_request_fields(fields, None)
+            if query is not None:
+                params = query._build_params(params)
             process = dest_class._mk_many(session,
                                           resource_classes=resource_classes,
-                                          filter=filter)
-            return session.get(url, CB.json(200, process))
+                                          filter=filter,
+                                          fields=fields,
+                                          query=query)
+            return _cached_get(self, dest_method_name, url, process,
+                               params=params,
+                               cacheable=fields is None and query is None)
 
         if type == RelationType.DIRECT:
             fetch_relationship = fetch_relationship_direct
@@ -332,8 +512,10 @@ def to_many(dest_class, type=RelationType.DIRECT,
             """
             session, url, json = _build_relatonship(self, dest_resource_type,
                                                     resources)
-            return session.post(url, CB.boolean(200, false_code=204),
-                                json=json)
+            callback = _invalidating(self, dest_method_name, dest_class,
+                                     resources,
+                                     CB.boolean(200, false_code=204))
+            return session.post(url, callback, json=json)
 
         def remove_many(self, resources):
             """Remove {to_name} from this :class:`{from_class}`.
@@ -348,8 +530,72 @@ def to_many(dest_class, type=RelationType.DIRECT,
             """
             session, url, json = _build_relatonship(self, dest_resource_type,
                                                     resources)
-            return session.delete(url, CB.boolean(200, false_code=204),
-                                  json=json)
+            callback = _invalidating(self, dest_method_name, dest_class,
+                                     resources,
+                                     CB.boolean(200, false_code=204))
+            return session.delete(url, callback, json=json)
+
+        def sync_many(self, resources, chunk_size=100, concurrency=None):
+            """Make the {to_name} of this :class:`{from_class}` match a list.
+
+            Unlike ``update_{to_name}``, which sends the complete list,
+            this fetches the current {to_name} once and only adds and
+            removes the ones that differ. Large differences are sent
+            in chunks of at most ``chunk_size`` {to_name}, concurrently.
+
+            Args:
+
+              resources: A list of :class:`{to_class}` to end up with
+
+            Keyword Args:
+
+              chunk_size(int): The maximum number of {to_name} per
+                  request
+
+              concurrency(int): The maximum number of concurrent
+                  requests
+
+            Returns:
+
+                SyncResult: The added and removed {to_name}, and the
+                    requests that failed
+            """
+            session = self._session
+            id = None if self.is_singleton() else self.id
+            url = session._build_url(self._resource_path(), id,
+                                     'relationships', dest_resource_type)
+            desired = OrderedDict((resource.id, resource)
+                                  for resource in resources)
+
+            def _sync(json):
+                current = json.get('data') or []
+                current_ids = frozenset(entry.get('id') for entry in current)
+                added = [resource for resource_id, resource in desired.items()
+                         if resource_id not in current_ids]
+                removed = decoder.many([entry for entry in current
+                                        if entry.get('id') not in desired],
+                                       session)
+                changes = [(add_many, chunk)
+                           for chunk in _chunks(added, chunk_size)]
+                changes.extend([(remove_many, chunk)
+                                for chunk in _chunks(removed, chunk_size)])
+                calls = [partial(method, self, chunk)
+                         for method, chunk in changes]
+
+                def _process(results):
+                    errors = [(chunk, result)
+                              for (_, chunk), result in zip(changes, results)
+                              if isinstance(result, Exception)]
+                    failed = frozenset(resource.id
+                                       for chunk, _ in errors
+                                       for resource in chunk)
+                    return SyncResult(
+                        [r for r in added if r.id not in failed],
+                        [r for r in removed if r.id not in failed],
+                        errors)
+                return session.gather(calls, _process,
+                                      concurrency=concurrency)
+            return session.get(url, CB.json(200, _sync))
 
         def update_method(self, resources):
             """Set the {to_name} for this :class:`{from_class}`.
@@ -366,15 +612,21 @@ def to_many(dest_class, type=RelationType.DIRECT,
             """
             session, url, json = _build_relatonship(self, dest_resource_type,
                                                     resources)
-            return session.patch(url, CB.boolean(200), json=json)
+            callback = _invalidating(self, dest_method_name, dest_class,
+                                     resources, CB.boolean(200),
+                                     replace=True)
+            return session.patch(url, callback, json=json)
 
         methods = [(dest_method_name, fetch_relationship)]
         if writable:
             methods.extend([
                 ('add_{}'.format(dest_method_name), add_many),
                 ('remove_{}'.format(dest_method_name), remove_many),
+                ('sync_{}'.format(dest_method_name), sync_many),
                 ('update_{}'.format(dest_method_name), update_method)
             ])
+        _register_relation(cls, Relation(dest_method_name, dest_class, type,
+                                         True, writable, resource_classes))
         for name, method in methods:
             method.__doc__ = method.__doc__.format(**doc_variables)
             setattr(cls, name, method)
@@ -385,3 +637,156 @@ def to_many(dest_class, type=RelationType.DIRECT,
         return cls
 
     return method_builder
+
+
+def _attach_included(resource, dest_class, entries):
+    # Make the entries available to use_included fetches without
+    # touching include lists shared with other resources
+    include = list(resource._include or [])
+    if dest_class not in include:
+        include.append(dest_class)
+    included = resource._included
+    included = dict(included) if isinstance(included, dict) else {}
+    included[dest_class._resource_type()] = entries
+    resource._include = include
+    resource._included = included
+
+
+def _attach_fetched(resources, dest_classes, fetched):
+    by_id = {}
+    for resource in (fetched if isinstance(fetched, list) else [fetched]):
+        by_id[resource.id] = resource
+    for resource in resources:
+        match = by_id.get(resource.id)
+        if match is None:
+            continue
+        for dest_class in dest_classes:
+            entries = match._included.get(dest_class._resource_type(), [])
+            _attach_included(resource, dest_class, entries)
+
+
+def _attach_direct(resource, relation, result):
+    if relation.many:
+        entries = [related._json_data for related in result]
+    else:
+        entries = [] if result is None else [result._json_data]
+    _attach_included(resource, relation.dest_class, entries)
+
+
+def prefetch_related(resources, *names, **kwargs):
+    """Fetch relationships for many resources at once.
+
+    Fetching a relationship for each of a list of resources costs a
+    request per resource. This function loads the given relationships
+    for all resources with as few requests as possible and attaches
+    the results, so the relationship methods can then be called with
+    ``use_included=True`` without making any further requests:
+
+    .. code-block:: python
+
+        sensors = Sensor.all(session)
+        prefetch_related(sensors, 'labels', 'element')
+        for sensor in sensors:
+            print(sensor.labels(use_included=True))
+
+    When at least ``collection_threshold`` resources of a class are
+    given, the collection of that class is fetched from its collection
+    endpoint with the relationships included, which is a single
+    request for all of them. Below the threshold, where that request
+    would mostly return resources that were not given, the
+    relationships are fetched for each resource concurrently instead.
+
+    Args:
+
+        resources(list): The resources to fetch the relationships for
+
+        *names: The relationship names, which are the names of the
+            relationship methods, for example ``'labels'``
+
+    Keyword Args:
+
+        collection(bool): Whether to use the collection endpoints,
+            defaults to using them as ``collection_threshold`` says
+
+        collection_threshold(int): The number of resources of a class
+            from which on to use its collection endpoint, defaults
+            to 3
+
+        concurrency(int): The maximum number of concurrent requests
+
+        session(Session): The session to use, defaults to the session
+            of the first resource
+
+    Returns:
+
+        list(Resource): The given resources. If any of the requests
+            fails its error is raised after the other results have been
+            attached.
+
+    """
+    collection = kwargs.pop('collection', None)
+    collection_threshold = kwargs.pop('collection_threshold', 3)
+    concurrency = kwargs.pop('concurrency', None)
+    resources = list(resources)
+    session = kwargs.pop('session', None)
+    if session is None and resources:
+        session = resources[0]._session
+    if session is None:
+        return resources
+
+    groups = OrderedDict()
+    for resource in resources:
+        groups.setdefault(resource.__class__, []).append(resource)
+
+    calls = []
+    handlers = []
+    for cls, group in groups.items():
+        declared = declared_relations(cls)
+        missing = [name for name in names if name not in declared]
+        if missing:
+            raise ValueError("Unknown relationship for {}: {}"
+                             .format(cls.__name__, ', '.join(missing)))
+        group_relations = [declared[name] for name in names]
+        use_collection = collection
+        if use_collection is None:
+            use_collection = len(group) >= collection_threshold
+        if any(resource.is_singleton() for resource in group):
+            use_collection = False
+
+        if use_collection:
+            dest_classes = [relation.dest_class
+                            for relation in group_relations]
+            calls.append(partial(cls.all, session, include=dest_classes))
+            handlers.append(partial(_attach_fetched, group, dest_classes))
+            continue
+
+        dest_classes = [relation.dest_class for relation in group_relations
+                        if relation.type == RelationType.INCLUDE]
+        for resource in group:
+            if dest_classes:
+                if resource.is_singleton():
+                    call = partial(cls.singleton, session,
+                                   include=dest_classes)
+                else:
+                    call = partial(cls.find, session, resource.id,
+                                   include=dest_classes)
+                calls.append(call)
+                handlers.append(partial(_attach_fetched, [resource],
+                                        dest_classes))
+            for relation in group_relations:
+                if relation.type == RelationType.INCLUDE:
+                    continue
+                calls.append(getattr(resource, relation.name))
+                handlers.append(partial(_attach_direct, resource, relation))
+
+    def _process(results):
+        error = None
+        for handler, result in zip(handlers, results):
+            if isinstance(result, Exception):
+                error = error or result
+            else:
+                handler(result)
+        if error is not None:
+            raise error
+        return resources
+    return session.gather(calls, _process, concurrency=concurrency)
@@ -4,10 +4,13 @@ from __future__ import unicode_literals
 from future.utils import iteritems
 from builtins import filter as _filter
 from json import dumps as to_json
+from collections import Iterable, OrderedDict, namedtuple
+from functools import partial
 from . import (
     CB,
     build_request_body,
     build_request_include,
+    build_request_fields,
     from_iso_date
 )
 
@@ -65,6 +68,123 @@ class Base(object):
                 raise AttributeError(attribute)
         return self._promote_json_attribute(attribute, value)
 
+    def __setstate__(self, state):
+        """Restore pickled state."""
+        self.__dict__.update(state)
+
+
+class BulkResult(namedtuple('BulkResult', ['successes', 'errors'])):
+    """The result of a bulk operation on resources.
+
+    ``successes`` is the list of results for the items that succeeded,
+    in the order the items were given. ``errors`` is a list of
+    ``(item, error)`` pairs for the items that failed, where ``error``
+    is usually an :class:`Error` raised by the request for that item.
+
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def _from_results(cls, items, results, use_items=False):
+        successes = []
+        errors = []
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                errors.append((item, result))
+            else:
+                successes.append(item if use_items else result)
+        return cls(successes, errors)
+
+
+class _IncludedIndex(dict):
+    """Included resources by id, shared by the resources of a response.
+
+    Each id maps to the ``(position, json)`` pairs of the included
+    resources with that id, so the included resources related to a
+    resource are found without scanning all of them.
+
+    """
+
+    def __init__(self, included):
+        super(_IncludedIndex, self).__init__()
+        for position, entry in enumerate(included or []):
+            self.setdefault(entry.get('id'), []).append((position, entry))
+
+
+class Decoder(object):
+    """Construct resources from JSONAPI data.
+
+    A decoder maps the JSONAPI ``type`` of the data to one of a list of
+    resource classes. Decoders are built once per resource class and
+    list of classes, see :meth:`Resource._decoder`. Data of a type that
+    is not in the list raises a :class:`ValueError`.
+
+    """
+
+    __slots__ = ('registry',)
+
+    def __init__(self, classes):
+        """Construct a decoder.
+
+        Args:
+
+            classes(list): The resource classes to construct
+        """
+        self.registry = {clazz._resource_type(): clazz for clazz in classes}
+
+    def _class_for(self, data):
+        resource_type = data.get('type')
+        clazz = self.registry.get(resource_type)
+        if clazz is None:
+            raise ValueError("Unexpected resource type {!r}, expected one "
+                             "of: {}".format(resource_type,
+                                             ', '.join(sorted(self.registry))))
+        return clazz
+
+    def one(self, data, session, include=None, included=None, fields=None):
+        """Construct a resource.
+
+        Args:
+
+            data(dict): The JSONAPI data of the resource
+
+            session(Session): The session for the resource
+
+        Keyword Args:
+
+            include([Resource class]): Resource classes that are included
+
+            included([json]): All included json resources
+
+            fields(dict): The requested sparse fieldsets
+
+        Returns:
+
+            Resource: The resource
+        """
+        return self._class_for(data)(data, session, include=include,
+                                     included=included, fields=fields)
+
+    def many(self, entries, session, include=None, included=None,
+             fields=None):
+        """Construct a list of resources.
+
+        Takes the same arguments as :meth:`one`, but with a list of
+        JSONAPI data. The included resources are indexed once for all
+        of the resources.
+
+        Returns:
+
+            list(Resource): The resources
+        """
+        class_for = self._class_for
+        if include is not None:
+            included = _IncludedIndex(included)
+        return [class_for(entry)(entry, session, include=include,
+                                 included=included, fields=fields)
+                for entry in entries]
+
 
 class ResourceMeta(Base):
     """Meta information for a resource.
@@ -99,9 +219,15 @@ class Resource(Base):
     specify this since the Resource retrieval methods like ``all`` and
     ``find`` take care of this behavior.
 
+    A resource can also be requested with a sparse fieldset using the
+    ``fields`` argument, in which case only the given attributes are
+    fetched. Accessing an attribute that was left out of the fieldset
+    raises an :class:`AttributeError` explaining why it is missing.
+
     """
 
-    def __init__(self, json, session, include=None, included=None):
+    def __init__(self, json, session, include=None, included=None,
+                 fields=None):
         """Create a Resource.
 
         Args:
@@ -116,52 +242,75 @@ class Resource(Base):
 
             included([json]): A list of all included json resources
 
+            fields(dict): Resource classes to the attribute names that
+                were requested for them
+
         """
         self._session = session
         self._include = include
         self._included = included
+        self._fields = fields
         super(Resource, self).__init__(json)
 
     @classmethod
-    def _resource_class(cls, data, registry):
-        type = data.get('type')
-        return registry.get(type)
+    def _decoder(cls, resource_classes=None):
+        """Get the decoder for this class or the given classes.
+
+        Decoders are cached on the class, so the type registry for a
+        class and list of resource classes is only built once. They are
+        built on first use rather than when the class is defined, since
+        the resource classes a decoder maps to may not all be defined
+        yet at that point. Relationship methods get theirs when they
+        are declared.
+
+        """
+        key = tuple(resource_classes) if resource_classes else None
+        decoders = cls.__dict__.get('_decoders')
+        if decoders is None:
+            decoders = {}
+            setattr(cls, '_decoders', decoders)
+        decoder = decoders.get(key)
+        if decoder is None:
+            decoder = decoders[key] = Decoder(resource_classes or [cls])
+        return decoder
 
     @classmethod
     def _mk_one(cls, session,
-                singleton=False, include=None, resource_classes=None):
-        classes = resource_classes or [cls]
-        registry = {clazz._resource_type(): clazz for clazz in classes}
+                singleton=False, include=None, resource_classes=None,
+                fields=None):
+        decoder = cls._decoder(resource_classes)
 
         def func(json):
             included = json.get('included') if include else None
             data = json.get('data')
             result = None
             if data:
-                clazz = cls._resource_class(data, registry)
-                result = clazz(data, session,
-                               include=include, included=included)
+                result = decoder.one(data, session,
+                                     include=include, included=included,
+                                     fields=fields)
                 if singleton:
                     setattr(result, '_singleton', True)
             return result
         return func
 
     @classmethod
-    def _mk_many(cls, session, include=None, resource_classes=None, filter=None):
-        classes = resource_classes or [cls]
-        registry = {clazz._resource_type(): clazz for clazz in classes}
+    def _mk_many(cls, session, include=None, resource_classes=None,
+                 filter=None, fields=None, query=None):
+        decoder = cls._decoder(resource_classes)
+        predicate = query._predicate() if query is not None else None
 
         def func(json):
             included = json.get('included') if include else None
             data = json.get('data')
-            result = [cls._resource_class(entry, registry)
-                      (entry, session, include=include, included=included)
-                      for entry in data]
+            if predicate is not None:
+                data = [entry for entry in data if predicate(entry)]
+            result = decoder.many(data, session, include=include,
+                                  included=included, fields=fields)
             return result if filter is None else list(_filter(filter, result))
         return func
 
     @classmethod
-    def all(cls, session, include=None):
+    def all(cls, session, include=None, fields=None, query=None):
         """Get all resources of the given resource class.
 
         This should be called on sub-classes only.
@@ -189,16 +338,22 @@ class Resource(Base):
             incldue: A list of resource classes to include in the
                 request.
 
+            fields(dict): Resource classes to the list of attribute
+                names to fetch for them.
+
+            query(Query): A query the resources need to match
+
         Returns:
 
             iterable(Resource): An iterator over all the resources of
                 this type
 
         """
-        return cls.where(session, include=include)
+        return cls.where(session, include=include, fields=fields,
+                         query=query)
 
     @classmethod
-    def find(cls, session, resource_id, include=None):
+    def find(cls, session, resource_id, include=None, fields=None):
         """Retrieve a single resource.
 
         This should only be called from sub-classes.
@@ -213,6 +368,9 @@ class Resource(Base):
 
             include: Resource classes to include
 
+            fields(dict): Resource classes to the list of attribute
+                names to fetch for them
+
         Returns:
 
             Resource: An instance of a resource, or throws a
@@ -221,11 +379,13 @@ class Resource(Base):
         """
         url = session._build_url(cls._resource_path(), resource_id)
         params = build_request_include(include, None)
-        process = cls._mk_one(session, include=include)
+        params = build_request_fields(fields, params)
+        process = cls._mk_one(session, include=include, fields=fields)
         return session.get(url, CB.json(200, process), params=params)
 
     @classmethod
-    def where(cls, session, include=None, metadata=None, filter=None):
+    def where(cls, session, include=None, metadata=None, filter=None,
+              fields=None, query=None):
         """Get filtered resources of the given resource class.
 
         This should be called on sub-classes only.
@@ -263,6 +423,25 @@ class Resource(Base):
         Will fetch all sensors and apply the given filter to only
         return sensors who's name start with the given string.
 
+        The fields argument limits the attributes that are fetched
+        for each resource type. For example::
+
+        .. code-block::python
+
+            sensors = Sensor.where(session, fields={Sensor: ['name']})
+
+        Will fetch only the name of all sensors.
+
+        The query argument takes a declarative :class:`Query`. Parts
+        of the query the API supports are sent with the request, the
+        rest is evaluated on the returned JSON before any resources
+        are constructed. For example::
+
+        .. code-block::python
+
+            query = Query(name='freezer').metadata(site='sf')
+            sensors = Sensor.where(session, query=query)
+
 
         Args:
 
@@ -275,6 +454,11 @@ class Resource(Base):
 
             metadata(dict or list): The metadata filter to apply
 
+            fields(dict): Resource classes to the list of attribute
+                names to fetch for them
+
+            query(Query): A query the resources need to match
+
         Returns:
 
             iterable(Resource): An iterator over all found resources
@@ -283,11 +467,72 @@ class Resource(Base):
         """
         url = session._build_url(cls._resource_path())
         params = build_request_include(include, None)
+        params = build_request_fields(fields, params)
         if metadata is not None:
             params['filter[metadata]'] = to_json(metadata)
-        process = cls._mk_many(session, include=include, filter=filter)
+        if query is not None:
+            params = query._build_params(params)
+        process = cls._mk_many(session, include=include, filter=filter,
+                               fields=fields, query=query)
         return session.get(url, CB.json(200, process), params=params)
 
+    @classmethod
+    def iterate(cls, session, include=None, metadata=None, filter=None,
+                page_size=None, fields=None, query=None):
+        """Lazily page through resources of the given resource class.
+
+        This should be called on sub-classes only.
+
+        Unlike :meth:`where`, which retrieves all resources in a single
+        request, this returns a :class:`ResourceIterable` that fetches
+        one page at a time by following the ``next`` link of each
+        response. This keeps memory bounded when iterating over large
+        collections:
+
+        .. code-block:: python
+
+            for sensor in Sensor.iterate(session, page_size=100):
+                print(sensor.name)
+
+        Args:
+
+            session(Session): The session to look up the resources in
+
+        Keyword Args:
+
+            include(list): The resource classes to include in the
+                request.
+
+            metadata(dict or list): The metadata filter to apply
+
+            filter(func): A function to filter the resulting resources
+
+            page_size(int): The size of pages to fetch (defaults to
+                server preference)
+
+            fields(dict): Resource classes to the list of attribute
+                names to fetch for them
+
+            query(Query): A query the resources need to match
+
+        Returns:
+
+            ResourceIterable: A lazy iterable over the found resources
+                of this type
+
+        """
+        url = session._build_url(cls._resource_path())
+        params = build_request_include(include, None)
+        if metadata is not None:
+            params['filter[metadata]'] = to_json(metadata)
+        return ResourceIterable(session, cls, url,
+                                params=params,
+                                page_size=page_size,
+                                include=include,
+                                filter=filter,
+                                fields=fields,
+                                query=query)
+
     @classmethod
     def create(cls, session, attributes=None, relationships=None):
         """Create a resource of the resource.
@@ -319,7 +564,101 @@ class Resource(Base):
         return session.post(url, CB.json(201, process), json=json)
 
     @classmethod
-    def singleton(cls, session, include=None):
+    def create_many(cls, session, attributes, concurrency=None):
+        """Create a number of resources concurrently.
+
+        This should only be called from sub-classes
+
+        .. code-block:: python
+
+            result = Sensor.create_many(session, [
+                {'name': 'sensor-{}'.format(n)} for n in range(100)
+            ], concurrency=20)
+
+        Args:
+
+          session(Session): The session to create the resources in.
+
+          attributes(list): A list of attribute dictionaries, one for
+              each resource to create.
+
+        Keyword Args:
+
+          concurrency(int): The maximum number of concurrent requests
+
+        Returns:
+
+          BulkResult: The created resources and the attribute
+              dictionaries that failed with their errors.
+
+        """
+        calls = [partial(cls.create, session, attributes=attrs)
+                 for attrs in attributes]
+        process = partial(BulkResult._from_results, attributes)
+        return session.gather(calls, process, concurrency=concurrency)
+
+    @classmethod
+    def update_many(cls, session, updates, concurrency=None):
+        """Update a number of resources concurrently.
+
+        .. code-block:: python
+
+            result = Sensor.update_many(session, [
+                (sensor, {'name': sensor.name.upper()})
+                for sensor in sensors
+            ])
+
+        Args:
+
+          session(Session): The session to update the resources in.
+
+          updates(list): A list of ``(resource, attributes)`` pairs
+
+        Keyword Args:
+
+          concurrency(int): The maximum number of concurrent requests
+
+        Returns:
+
+          BulkResult: The updated resources and the resources that
+              failed to update with their errors.
+
+        """
+        updates = list(updates)
+        calls = [partial(resource.update, attributes=attrs)
+                 for resource, attrs in updates]
+        process = partial(BulkResult._from_results,
+                          [resource for resource, _ in updates])
+        return session.gather(calls, process, concurrency=concurrency)
+
+    @classmethod
+    def delete_many(cls, session, resources, concurrency=None):
+        """Delete a number of resources concurrently.
+
+        Args:
+
+          session(Session): The session to delete the resources in.
+
+          resources(list): The resources to delete
+
+        Keyword Args:
+
+          concurrency(int): The maximum number of concurrent requests
+
+        Returns:
+
+          BulkResult: The deleted resources and the resources that
+              failed to delete with their errors.
+
+        """
+        resources = list(resources)
+        calls = [resource.delete for resource in resources]
+        process = partial(BulkResult._from_results, resources,
+                          use_items=True)
+        return session.gather(calls, process, concurrency=concurrency)
+
+    @classmethod
+    def singleton(cls, session, include=None, fields=None):
         """Get the a singleton API resource.
 
         Some Helium API resources are singletons. The authorized user
@@ -336,10 +675,15 @@ class Resource(Base):
 
             include: Resource classes to include
 
+            fields(dict): Resource classes to the list of attribute
+                names to fetch for them
+
         """
         params = build_request_include(include, None)
+        params = build_request_fields(fields, params)
         url = session._build_url(cls._resource_path())
-        process = cls._mk_one(session, singleton=True, include=include)
+        process = cls._mk_one(session, singleton=True, include=include,
+                              fields=fields)
         return session.get(url, CB.json(200, process), params=params)
 
     @classmethod
@@ -350,6 +694,29 @@ class Resource(Base):
     def _resource_path(cls):
         return cls._resource_type()
 
+    def __getattr__(self, attribute):
+        """Get a given missing attribute.
+
+        Raises an :class:`AttributeError` that explains the missing
+        attribute if it was left out of a requested sparse fieldset.
+
+        """
+        try:
+            return super(Resource, self).__getattr__(attribute)
+        except AttributeError:
+            fields = self.__dict__.get('_fields')
+            if not fields or attribute.startswith('_'):
+                raise
+            for clazz, names in fields.items():
+                if clazz._resource_type() != self._resource_type():
+                    continue
+                if attribute not in names:
+                    error = "{} was not in the requested fields for {}: {}"
+                    raise AttributeError(error.format(attribute,
+                                                      clazz.__name__,
+                                                      ', '.join(names)))
+            raise
+
     def _promote_json_attribute(self, attribute, value):
         if attribute == 'meta':
             value = ResourceMeta(value)
@@ -367,6 +734,9 @@ class Resource(Base):
             # Look up relationships and the types we were told are included
             relationships = json.pop('relationships', {})
             included_types = [cls._resource_type() for cls in self._include]
+            index = self._included
+            if not isinstance(index, _IncludedIndex):
+                index = _IncludedIndex(index)
 
             def _filter_included(resource_type):
                 # Get the relationship list and store the ids
@@ -377,11 +747,13 @@ class Resource(Base):
                     related = frozenset([related.get('id')])
                 else:
                     related = frozenset([r.get('id') for r in related])
-
-                def _resource_filter(resource):
-                    return resource.get('id') in related
-                # Filter all included objects for the resources
-                return list(_filter(_resource_filter, self._included))
+                # Look up the included objects for the resources, in
+                # the order they were included
+                entries = []
+                for id in related:
+                    entries.extend(index.get(id, ()))
+                entries.sort(key=lambda entry: entry[0])
+                return [entry for _, entry in entries]
 
             # Construct a dictionary of filtered included resources
             # and replace the initial stash
@@ -411,26 +783,63 @@ class Resource(Base):
         """The string representation of the resource."""
         return '<{s.__class__.__name__} {{ id: {s.id} }}>'.format(s=self)
 
+    def __getstate__(self):
+        """Get the state to pickle, leaving out the session."""
+        state = self.__dict__.copy()
+        state['_session'] = None
+        return state
+
     def is_singleton(self):
         """Whether this instance is a singleton."""
         return hasattr(self, '_singleton')
 
-    def update(self, attributes=None):
-        """Update this resource.
+    def _serialization_state(self):
+        return {'singleton': True} if self.is_singleton() else {}
 
-        Not all aspects of a resource can be updated. If the server
-        rejects updates an error will be thrown.
+    @classmethod
+    def _from_serialization_state(cls, json, session, state):
+        result = cls(json, session)
+        if state.get('singleton'):
+            setattr(result, '_singleton', True)
+        return result
 
-        Keyword Arguments:
+    def to_bytes(self):
+        """Serialize this resource into a compact binary form.
 
-          attributes(dict): Attributes that are to be updated
+        Only the JSONAPI data of the resource is serialized, the
+        session is not. This requires the optional ``msgpack``
+        package.
 
         Returns:
 
-          Resource: A new instance of this type of resource with the
-          updated attribute. On errors an exception is thrown.
+            The bytes representing this resource. Use
+            :meth:`from_bytes` to load the resource again.
 
         """
+        from helium.serialize import dumps
+        return dumps(self)
+
+    @classmethod
+    def from_bytes(cls, data, session=None):
+        """Load a resource serialized with :meth:`to_bytes`.
+
+        Args:
+
+            data(bytes): The serialized resource
+
+        Keyword Args:
+
+            session(Session): The session to attach the resource to
+
+        Returns:
+
+            Resource: The loaded resource
+
+        """
+        from helium.serialize import loads
+        return loads(data, session=session, cls=cls)
+
+    def _update(self, attributes, then=None):
         resource_type = self._resource_type()
         resource_path = self._resource_path()
         session = self._session
@@ -440,8 +849,133 @@ class Resource(Base):
         attributes = build_request_body(resource_type, self.id,
                                         attributes=attributes)
         process = self._mk_one(session, singleton=singleton)
+        if then is not None:
+            mk_one = process
+
+            def process(json):
+                return then(mk_one(json))
         return session.patch(url, CB.json(200, process), json=attributes)
 
+    def update(self, attributes=None):
+        """Update this resource.
+
+        Not all aspects of a resource can be updated. If the server
+        rejects updates an error will be thrown.
+
+        Keyword Arguments:
+
+          attributes(dict): Attributes that are to be updated
+
+        Returns:
+
+          Resource: A new instance of this type of resource with the
+          updated attribute. On errors an exception is thrown.
+
+        """
+        return self._update(attributes)
+
+    def changes(self):
+        """Get the attributes changed since this resource was fetched.
+
+        Assigning a JSON attribute, like ``sensor.name = 'freezer'``,
+        is a change unless the assigned value equals the fetched one.
+        Changes made inside a value, like appending to a list, are not
+        seen, assign the changed value instead.
+
+        Returns:
+
+          dict: The JSON attribute names to their assigned values
+
+        """
+        json = self._json_data
+        attributes = json.get('attributes') or {}
+        changes = OrderedDict()
+        for attribute, value in iteritems(self.__dict__):
+            if attribute.startswith('_') or attribute in ('id', 'meta'):
+                continue
+            key = attribute
+            if key not in attributes:
+                dashed = attribute.replace('_', '-')
+                if dashed in attributes:
+                    key = dashed
+                else:
+                    # Skip values promoted from outside the attributes,
+                    # like the resource type
+                    source = attribute if attribute in json else dashed
+                    if source in json and value is json[source]:
+                        continue
+            if key in attributes and attributes[key] == value:
+                continue
+            changes[key] = value
+        return changes
+
+    def _saved(self, resource):
+        # Drop the promoted attributes and take on the saved state
+        for attribute in list(self.__dict__):
+            if not attribute.startswith('_') and attribute != 'id':
+                del self.__dict__[attribute]
+        self._json_data = resource._json_data
+        for (k, v) in iteritems(self._json_data.get('attributes', {})):
+            self._promote_json_attribute(k, v)
+        return self
+
+    def save(self):
+        """Save the changed attributes of this resource.
+
+        Only the attributes that were assigned since the resource was
+        fetched or last saved are sent, see :meth:`changes`. If no
+        attributes changed no request is made.
+
+        .. code-block:: python
+
+            sensor.name = 'freezer'
+            sensor.save()
+
+        Returns:
+
+          Resource: This resource, updated with the saved state. On
+          errors an exception is thrown and the changes are kept.
+
+        """
+        changes = self.changes()
+        if not changes:
+            return self._session.gather([], lambda results: self)
+        return self._update(changes, self._saved)
+
+    @classmethod
+    def save_all(cls, session, resources, concurrency=None):
+        """Save the changed attributes of a number of resources concurrently.
+
+        Resources without changes are skipped, see :meth:`save`.
+
+        .. code-block:: python
+
+            for sensor in sensors:
+                sensor.name = sensor.name.upper()
+            result = Sensor.save_all(session, sensors, concurrency=20)
+
+        Args:
+
+          session(Session): The session to save the resources in.
+
+          resources(list): The resources to save
+
+        Keyword Args:
+
+          concurrency(int): The maximum number of concurrent requests
+
+        Returns:
+
+          BulkResult: The saved resources and the resources that failed
+              to save with their errors.
+
+        """
+        resources = [resource for resource in resources
+                     if resource.changes()]
+        calls = [resource.save for resource in resources]
+        process = partial(BulkResult._from_results, resources)
+        return session.gather(calls, process, concurrency=concurrency)
+
     def delete(self):
         """Delete the resource.
 
@@ -454,3 +988,99 @@ class Resource(Base):
         session = self._session
         url = session._build_url(self._resource_path(), self.id)
         return session.delete(url, CB.boolean(204))
+
+
+class ResourceIterable(Iterable):
+    """A lazily paged collection of resources.
+
+    Instances of this class represent a single collection query. Much
+    like a :class:`Timeseries`, the collection will not make any
+    requests to the Helium API until you start iterating over it, and
+    then only fetches the next page of resources once the current one
+    is exhausted.
+
+    The iterable is returned by :meth:`Resource.iterate` and by
+    to-many relationship methods called with ``iterate=True``:
+
+    .. code-block:: python
+
+        org = Organization.singleton(session)
+        for sensor in org.sensors(iterate=True, page_size=50):
+            print(sensor.name)
+
+    """
+
+    def __init__(self, session, resource_class, url,
+                 params=None,
+                 page_size=None,
+                 include=None,
+                 resource_classes=None,
+                 filter=None,
+                 fields=None,
+                 query=None):
+        """Construct a resource collection.
+
+        Args:
+
+            session(Session): The session to use for requests
+
+            resource_class(Resource): The Resource subclass to construct
+
+            url(string): The URL of the collection endpoint
+
+        Keyword Args:
+
+            params(dict): Additional request parameters for the first page
+
+            page_size(int): The size of pages to fetch (defaults to server
+                preference)
+
+            include([Resource class]): Resource classes to include
+
+            resource_classes([Resource class]): The kinds of resources to
+                expect in the collection
+
+            filter(func): A function to filter the resulting resources
+
+            fields(dict): Resource classes to the list of attribute
+                names to fetch for them
+
+            query(Query): A query the resources need to match
+
+        """
+        self._session = session
+        self._resource_class = resource_class
+        self._base_url = url
+        params = build_request_fields(fields, params)
+        if query is not None:
+            params = query._build_params(params)
+        if page_size is not None:
+            params['page[size]'] = page_size
+        self._params = params
+        self._process = resource_class._mk_many(
+            session,
+            include=include,
+            resource_classes=resource_classes,
+            filter=filter,
+            fields=fields,
+            query=query)
+
+    def __iter__(self):
+        """Construct an iterator for this collection."""
+        return self._session.resources(self)
+
+    def __aiter__(self):  # pragma: no cover
+        """Construct an async iterator for this collection."""
+        return self._session.resources(self)
+
+    def take(self, n):
+        """Return the next n resources.
+
+        Args:
+            n(int): The number of resources to retrieve
+
+        Returns:
+
+            A list of at most `n` resources.
+        """
+        return self._session.adapter.take(self, n)
@@ -0,0 +1,312 @@
+"""Share a live stream between processes through a ring buffer.
+
+When several processes on one machine consume the same live stream,
+one process can read and parse the stream once and publish the
+datapoints into a ring buffer in shared memory, which the other
+processes read from:
+
+.. code-block:: python
+
+    # The publishing process
+    ring = RingBuffer.create('/dev/shm/helium-sensors', slots=4096)
+    with sensor.timeseries().live() as live:
+        ring.publish(live)
+
+    # Any number of subscribing processes
+    ring = RingBuffer.open('/dev/shm/helium-sensors')
+    for point in ring.reader().datapoints(session):
+        print(point.value)
+
+The ring buffer is a memory mapped file made up of fixed size slots.
+Every record is stamped with a sequence number, which lets readers
+detect when the publisher has overwritten records they had not read
+yet. Those overruns are skipped and counted rather than returned
+garbled.
+
+Readers access records in place: :meth:`RingReader.read` returns a
+:class:`memoryview` into the shared memory without copying it. A view
+is only valid until the publisher wraps around and reuses its slot,
+which is checked with :meth:`RingReader.valid` after using the view.
+
+Datapoints are encoded with :func:`helium.serialize.dumps_datapoints`,
+so publishing and reading datapoints requires the optional ``msgpack``
+package.
+
+"""
+
+from __future__ import unicode_literals
+
+import mmap
+import os
+import struct
+import time
+
+_MAGIC = b'HELRING1'
+_HEADER = struct.Struct('<8sIIQ')
+_SLOT_HEADER = struct.Struct('<QI')
+_COUNT_OFFSET = _HEADER.size - 8
+
+
+class RingBuffer(object):
+    """A single writer, multiple reader ring buffer in shared memory."""
+
+    def __init__(self, path, file, mapping):
+        """Construct a ring buffer over a memory mapped file.
+
+        You normally don't construct this directly but call
+        :meth:`create` or :meth:`open`.
+        """
+        self.path = path
+        self._file = file
+        self._mmap = mapping
+        magic, slots, slot_size, _ = _HEADER.unpack_from(mapping, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a ring buffer: {}".format(path))
+        self.slots = slots
+        self.slot_size = slot_size
+        self._stride = _SLOT_HEADER.size + slot_size
+
+    @classmethod
+    def create(cls, path, slots=1024, slot_size=512):
+        """Create a new ring buffer.
+
+        Args:
+
+            path(string): The file to map, preferably on a memory
+                backed file system like ``/dev/shm``
+
+        Keyword Args:
+
+            slots(int): The number of records the ring buffer holds
+
+            slot_size(int): The maximum size in bytes of a record
+
+        Returns:
+
+            RingBuffer: The ring buffer, ready to be written to
+        """
+        size = _HEADER.size + slots * (_SLOT_HEADER.size + slot_size)
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, slots, slot_size, 0))
+            f.truncate(size)
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path):
+        """Open an existing ring buffer.
+
+        Args:
+
+            path(string): The file of the ring buffer
+
+        Returns:
+
+            RingBuffer: The ring buffer
+        """
+        f = open(path, 'r+b')
+        mapping = mmap.mmap(f.fileno(), os.fstat(f.fileno()).st_size)
+        return cls(path, f, mapping)
+
+    @property
+    def count(self):
+        """The number of records written so far."""
+        return struct.unpack_from('<Q', self._mmap, _COUNT_OFFSET)[0]
+
+    def _offset(self, sequence):
+        return _HEADER.size + (sequence % self.slots) * self._stride
+
+    def write(self, payload):
+        """Write a record.
+
+        Args:
+
+            payload(bytes): The record, at most ``slot_size`` bytes
+
+        Returns:
+
+            The sequence number of the record
+        """
+        length = len(payload)
+        if length > self.slot_size:
+            raise ValueError("Record of {} bytes exceeds the slot size of {}"
+                             .format(length, self.slot_size))
+        mapping = self._mmap
+        sequence = self.count
+        offset = self._offset(sequence)
+        # Mark the slot as being written, then publish it
+        _SLOT_HEADER.pack_into(mapping, offset, 0, length)
+        start = offset + _SLOT_HEADER.size
+        mapping[start:start + length] = payload
+        _SLOT_HEADER.pack_into(mapping, offset, sequence + 1, length)
+        struct.pack_into('<Q', mapping, _COUNT_OFFSET, sequence + 1)
+        return sequence
+
+    def publish(self, points):
+        """Publish datapoints until the iterable ends.
+
+        Args:
+
+            points(iterable): The :class:`DataPoint` instances to
+                publish, for example a live stream
+        """
+        from .serialize import dumps_datapoints
+        for point in points:
+            self.write(dumps_datapoints([point]))
+
+    def reader(self, start='latest'):
+        """Construct a reader for this ring buffer.
+
+        Keyword Args:
+
+            start('latest' or 'oldest'): Whether to start reading with
+                the next record to be written or the oldest record
+                still in the ring buffer
+
+        Returns:
+
+            RingReader: A reader positioned at ``start``
+        """
+        reader = RingReader(self)
+        if start == 'oldest':
+            reader.position = max(0, self.count - self.slots + 1)
+        else:
+            reader.position = self.count
+        return reader
+
+    def close(self):
+        """Unmap the ring buffer.
+
+        All readers, and views returned by them, must be released
+        first.
+        """
+        self._mmap.close()
+        self._file.close()
+
+
+class RingReader(object):
+    """A reader of a :class:`RingBuffer`.
+
+    Attributes:
+
+        position(int): The sequence number of the next record to read
+
+        overruns(int): The number of records that were overwritten
+            before they could be read
+
+    """
+
+    def __init__(self, ring):
+        """Construct a reader.
+
+        You normally don't construct this directly but call
+        :meth:`RingBuffer.reader`.
+        """
+        self._ring = ring
+        self._view = memoryview(ring._mmap)
+        self.position = 0
+        self.overruns = 0
+        self._last = None
+
+    def read(self):
+        """Return the next record without copying it.
+
+        Returns:
+
+            A :class:`memoryview` of the record in shared memory, or
+            ``None`` if no new record has been written
+        """
+        ring = self._ring
+        while True:
+            count = ring.count
+            position = self.position
+            if position >= count:
+                return None
+            # Keep one slot of slack for a write in progress
+            oldest = count - ring.slots + 1
+            if position < oldest:
+                self.overruns += oldest - position
+                self.position = position = oldest
+            offset = ring._offset(position)
+            sequence, length = _SLOT_HEADER.unpack_from(self._view, offset)
+            if sequence != position + 1:
+                # Overwritten since count was read, try again
+                continue
+            self.position = position + 1
+            self._last = (offset, sequence)
+            start = offset + _SLOT_HEADER.size
+            return self._view[start:start + length]
+
+    def valid(self):
+        """Check whether the last read record is still intact.
+
+        Returns:
+
+            False if the publisher overwrote the record while it was
+            being used, True otherwise
+        """
+        if self._last is None:
+            return False
+        offset, sequence = self._last
+        return _SLOT_HEADER.unpack_from(self._view, offset)[0] == sequence
+
+    def poll(self, timeout=None, interval=0.001):
+        """Wait for the next record.
+
+        Keyword Args:
+
+            timeout(float): The number of seconds to wait, or ``None`` to
+                wait until a record is written
+
+            interval(float): The number of seconds between checks
+
+        Returns:
+
+            A :class:`memoryview` of the record, or ``None`` if no
+            record was written within the timeout
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            record = self.read()
+            if record is not None:
+                return record
+            if deadline is not None and time.time() >= deadline:
+                return None
+            time.sleep(interval)
+
+    def datapoints(self, session=None, timeout=None):
+        """Iterate over published datapoints.
+
+        Keyword Args:
+
+            session(Session): The session to attach datapoints to
+
+            timeout(float): Stop iterating when no datapoint has been
+                published for this many seconds, or ``None`` to keep
+                waiting
+
+        Returns:
+
+            A generator of :class:`DataPoint` instances
+        """
+        from .serialize import loads_datapoints
+        while True:
+            record = self.poll(timeout)
+            if record is None:
+                return
+            try:
+                points = loads_datapoints(record, session)
+            except Exception:
+                # A record torn by the publisher fails to decode
+                if self.valid():
+                    raise
+                points = None
+            del record
+            if points is None or not self.valid():
+                self.overruns += 1
+                continue
+            for point in points:
+                yield point
+
+    def close(self):
+        """Release the reader's view of the shared memory."""
+        self._view = None
@@ -0,0 +1,288 @@
+"""Roll a configuration out to many devices.
+
+Applying a :class:`Configuration` to a fleet of devices means creating
+a :class:`DeviceConfiguration` for every device and waiting for each
+of them to be loaded. A rollout does both:
+
+.. code-block:: python
+
+    def progress(device, status, device_configuration):
+        print(device.id, status)
+
+    result = DeviceConfiguration.rollout(client, configuration, sensors,
+                                         concurrency=20, timeout=600,
+                                         on_progress=progress)
+    for device_configuration in result.stragglers:
+        print("still pending", device_configuration.id)
+
+The device configurations are created concurrently. Their status is
+then tracked with a single request for the collection of device
+configurations per poll, rather than a request per device, and the
+pending ones are picked out of it before they are decoded. Once fewer
+than ``collection_threshold`` device configurations are pending they
+are fetched individually instead, which avoids transferring the whole
+collection for the last few stragglers. The polling interval starts at
+``interval`` and grows up to ``max_interval`` while nothing changes,
+falling back to ``interval`` whenever a device configuration loads.
+
+"""
+
+from __future__ import unicode_literals
+
+import time
+from collections import namedtuple
+from functools import partial
+from . import DeviceConfiguration, Query
+
+PENDING = 'pending'
+"""The device configuration was created but is not loaded yet"""
+
+LOADED = 'loaded'
+"""The device configuration was loaded"""
+
+FAILED = 'failed'
+"""The device configuration could not be created"""
+
+
+class RolloutResult(namedtuple('RolloutResult',
+                               ['loaded', 'stragglers', 'failed'])):
+    """The outcome of a rollout.
+
+    ``loaded`` are the device configurations that were loaded,
+    ``stragglers`` the ones that were still pending when the rollout
+    ended, and ``failed`` is a list of ``(device, error)`` pairs for
+    the devices a device configuration could not be created for.
+
+    """
+
+    __slots__ = ()
+
+
+class Rollout(object):
+    """Tracks the rollout of a configuration to devices.
+
+    A rollout is run by the session's adapter, you normally call
+    :meth:`DeviceConfiguration.rollout` instead of constructing one.
+
+    Attributes:
+
+        status(dict): Device ids to their rollout status, one of
+            ``pending``, ``loaded`` or ``failed``
+
+        polls(int): The number of status requests made so far
+
+    """
+
+    def __init__(self, session, configuration, devices,
+                 concurrency=None, interval=1.0, max_interval=30.0,
+                 backoff=1.5, timeout=600.0, max_polls=None,
+                 collection_threshold=10, on_progress=None,
+                 clock=time.time):
+        """Construct a rollout.
+
+        Args:
+
+            session(Session): The session to roll out with
+
+            configuration(Configuration): The configuration to apply
+
+            devices(list): The devices to apply the configuration to
+
+        Keyword Args:
+
+            concurrency(int): The maximum number of concurrent requests
+                creating device configurations
+
+            interval(float): The initial number of seconds between
+                status requests
+
+            max_interval(float): The maximum number of seconds between
+                status requests
+
+            backoff(float): The factor to grow the interval by while
+                no device configuration loads
+
+            timeout(float): The number of seconds after creation to
+                wait for device configurations to load, ten minutes by
+                default, or ``None`` to wait until all are loaded
+
+            max_polls(int): The maximum number of status requests
+
+            collection_threshold(int): The number of pending device
+                configurations from which on a poll fetches the
+                collection rather than each pending one
+
+            on_progress(func): Called with a device, its new status and
+                its device configuration, or the error for failed
+                devices, whenever the status of a device changes
+
+            clock(func): The function returning the current time
+        """
+        self.session = session
+        self.configuration = configuration
+        self.devices = list(devices)
+        self.concurrency = concurrency
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.max_polls = max_polls
+        self.collection_threshold = collection_threshold
+        self.on_progress = on_progress
+        self._clock = clock
+        self._delay = interval
+        self._deadline = None
+        self._device_configurations = {}
+        self._errors = {}
+        self.status = {}
+        self.polls = 0
+
+    def _update(self, device, status, value):
+        if self.status.get(device.id) == status:
+            return False
+        self.status[device.id] = status
+        if self.on_progress is not None:
+            self.on_progress(device, status, value)
+        return True
+
+    def create_calls(self):
+        """Get the calls that create the device configurations.
+
+        Returns:
+
+            list: Functions without arguments, one per device
+        """
+        return [partial(DeviceConfiguration.create, self.session,
+                        device=device, configuration=self.configuration)
+                for device in self.devices]
+
+    def created(self, results):
+        """Record the results of the create calls.
+
+        Args:
+
+            results(list): The created device configurations, or the
+                errors raised, in the order of the devices
+        """
+        for device, result in zip(self.devices, results):
+            if isinstance(result, Exception):
+                self._errors[device.id] = result
+                self._update(device, FAILED, result)
+            else:
+                self._device_configurations[device.id] = result
+                status = LOADED if result.is_loaded() else PENDING
+                self._update(device, status, result)
+        if self.timeout is not None:
+            self._deadline = self._clock() + self.timeout
+
+    def poll(self):
+        """Request the status of the pending device configurations.
+
+        With at least ``collection_threshold`` pending device
+        configurations this is a single request for the collection,
+        otherwise a concurrent request for each pending one.
+
+        Returns:
+
+            The fetched device configurations, which are passed to
+            :meth:`polled`. Device configurations that could not be
+            fetched are left out.
+        """
+        self.polls += 1
+        ids = [self._device_configurations[device.id].id
+               for device in self.pending]
+        if len(ids) >= self.collection_threshold:
+            return DeviceConfiguration.where(self.session,
+                                             query=Query().ids(ids))
+        calls = [partial(DeviceConfiguration.find, self.session, id)
+                 for id in ids]
+
+        def fetched(results):
+            return [result for result in results
+                    if not isinstance(result, Exception)]
+        return self.session.gather(calls, fetched,
+                                   concurrency=self.concurrency)
+
+    def polled(self, device_configurations):
+        """Record the result of a status request.
+
+        Device configurations that are not part of the result stay
+        pending.
+
+        Args:
+
+            device_configurations(list): The fetched device
+                configurations, or the error raised fetching them
+        """
+        progressed = False
+        if not isinstance(device_configurations, Exception):
+            by_id = {device_configuration.id: device_configuration
+                     for device_configuration in device_configurations}
+            for device in self.devices:
+                if self.status.get(device.id) != PENDING:
+                    continue
+                current = self._device_configurations[device.id]
+                fetched = by_id.get(current.id)
+                if fetched is None:
+                    continue
+                self._device_configurations[device.id] = fetched
+                if fetched.is_loaded():
+                    progressed = self._update(device, LOADED, fetched)
+        if progressed:
+            self._delay = self.interval
+        else:
+            self._delay = min(self._delay * self.backoff, self.max_interval)
+
+    def next_delay(self):
+        """Get the number of seconds to wait before the next poll."""
+        if self._deadline is None:
+            return self._delay
+        return max(0, min(self._delay, self._deadline - self._clock()))
+
+    @property
+    def pending(self):
+        """The devices whose device configuration is not loaded yet."""
+        return [device for device in self.devices
+                if self.status.get(device.id) == PENDING]
+
+    @property
+    def done(self):
+        """Whether the rollout finished or gave up waiting."""
+        if not self.pending:
+            return True
+        if self.max_polls is not None and self.polls >= self.max_polls:
+            return True
+        return self._deadline is not None and self._clock() >= self._deadline
+
+    def progress(self):
+        """Count the devices by status.
+
+        Returns:
+
+            dict: The number of devices for every status
+        """
+        counts = {PENDING: 0, LOADED: 0, FAILED: 0}
+        for status in self.status.values():
+            counts[status] += 1
+        return counts
+
+    def result(self):
+        """Get the outcome of the rollout.
+
+        Returns:
+
+            RolloutResult: The loaded and pending device configurations
+                and the failed devices
+        """
+        loaded, stragglers, failed = [], [], []
+        for device in self.devices:
+            status = self.status.get(device.id)
+            if status == FAILED:
+                failed.append((device, self._errors[device.id]))
+                continue
+            device_configuration = self._device_configurations[device.id]
+            if status == LOADED:
+                loaded.append(device_configuration)
+            else:
+                stragglers.append(device_configuration)
+        return RolloutResult(loaded, stragglers, failed)
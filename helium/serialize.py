@@ -0,0 +1,214 @@
+"""Compact binary serialization of resources.
+
+Resources can be serialized into a compact `msgpack
+<https://msgpack.org>`_ based encoding for caching or passing them
+between processes. Unlike pickling, only the JSONAPI data of a resource
+is kept. The session a resource was attached to is not serialized,
+instead a session is passed in when loading the resource again:
+
+.. code-block:: python
+
+    data = sensor.to_bytes()
+    sensor = Sensor.from_bytes(data, session)
+
+Lists of resources, and in particular lists of datapoints, can be
+encoded in a single batch which avoids repeating per resource
+overhead:
+
+.. code-block:: python
+
+    data = dumps_datapoints(timeseries.take(1000))
+    points = loads_datapoints(data, session)
+
+This module requires the optional ``msgpack`` package.
+
+"""
+
+from __future__ import unicode_literals
+
+import msgpack
+
+from . import Resource
+from .live import datapoint_columns
+
+FORMAT_VERSION = 1
+
+_RESOURCE = 0
+_RESOURCES = 1
+_DATAPOINTS = 2
+
+
+def _pack(obj):
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def _unpack(data, kind):
+    obj = msgpack.unpackb(data, raw=False)
+    if obj[0] != FORMAT_VERSION or obj[1] != kind:
+        raise ValueError("Unsupported serialization format")
+    return obj
+
+
+def _resource_classes(cls):
+    classes = [cls]
+    for clazz in classes:
+        classes.extend(clazz.__subclasses__())
+    return classes
+
+
+_registry = {}
+
+
+def _resource_class(cls, resource_type):
+    clazz = _registry.get((cls, resource_type))
+    if clazz is not None:
+        return clazz
+    for clazz in _resource_classes(cls):
+        if clazz._resource_type() == resource_type:
+            _registry[(cls, resource_type)] = clazz
+            return clazz
+    raise ValueError("Unknown resource type: {}".format(resource_type))
+
+
+def _resource_entry(resource):
+    return [resource._resource_type(),
+            resource._json_data,
+            resource._serialization_state()]
+
+
+def _load_entry(cls, entry, session):
+    resource_type, data, state = entry
+    clazz = _resource_class(cls, resource_type)
+    return clazz._from_serialization_state(data, session, state)
+
+
+def dumps(resource):
+    """Serialize a single resource.
+
+    Args:
+
+        resource(Resource): The resource to serialize
+
+    Returns:
+
+        The bytes representing the resource
+    """
+    return _pack([FORMAT_VERSION, _RESOURCE, _resource_entry(resource)])
+
+
+def loads(data, session=None, cls=Resource):
+    """Deserialize a single resource.
+
+    Args:
+
+        data(bytes): Bytes returned by :func:`dumps`
+
+    Keyword Args:
+
+        session(Session): The session to attach the resource to
+
+        cls(Resource): The resource class, or base class, to expect
+
+    Returns:
+
+        Resource: The deserialized resource
+    """
+    _, _, entry = _unpack(data, _RESOURCE)
+    return _load_entry(cls, entry, session)
+
+
+def dumps_many(resources):
+    """Serialize a list of resources.
+
+    Args:
+
+        resources(list): The resources to serialize
+
+    Returns:
+
+        The bytes representing the resources
+    """
+    entries = [_resource_entry(resource) for resource in resources]
+    return _pack([FORMAT_VERSION, _RESOURCES, entries])
+
+
+def loads_many(data, session=None, cls=Resource):
+    """Deserialize a list of resources.
+
+    Args:
+
+        data(bytes): Bytes returned by :func:`dumps_many`
+
+    Keyword Args:
+
+        session(Session): The session to attach the resources to
+
+        cls(Resource): The resource class, or base class, to expect
+
+    Returns:
+
+        list(Resource): The deserialized resources
+    """
+    _, _, entries = _unpack(data, _RESOURCES)
+    return [_load_entry(cls, entry, session) for entry in entries]
+
+
+def dumps_datapoints(datapoints):
+    """Serialize a list of datapoints in columnar form.
+
+    The attributes, sensor relationship and meta information of the
+    datapoints are stored as columns, which is considerably more
+    compact than serializing each datapoint on its own.
+
+    Args:
+
+        datapoints(list): The :class:`DataPoint` instances to serialize
+
+    Returns:
+
+        The bytes representing the datapoints
+    """
+    datapoints = list(datapoints)
+    columns = list(datapoint_columns(datapoints).values())
+    columns.append([datapoint._json_data.get('meta')
+                    for datapoint in datapoints])
+    aggregate = any(datapoint._is_aggregate for datapoint in datapoints)
+    return _pack([FORMAT_VERSION, _DATAPOINTS, aggregate, columns])
+
+
+def loads_datapoints(data, session=None):
+    """Deserialize a list of datapoints.
+
+    Args:
+
+        data(bytes): Bytes returned by :func:`dumps_datapoints`
+
+    Keyword Args:
+
+        session(Session): The session to attach the datapoints to
+
+    Returns:
+
+        list(DataPoint): The deserialized datapoints
+    """
+    from . import DataPoint
+    _, _, aggregate, columns = _unpack(data, _DATAPOINTS)
+    result = []
+    for id, port, value, timestamp, sensor_id, meta in zip(*columns):
+        json = {
+            'id': id,
+            'type': DataPoint._resource_type(),
+            'attributes': {
+                'port': port,
+                'value': value,
+                'timestamp': timestamp,
+            },
+        }
+        if sensor_id is not None:
+            json['relationships'] = {
+                'sensor': {'data': {'id': sensor_id, 'type': 'sensor'}}
+            }
+        if meta is not None:
+            json['meta'] = meta
+        result.append(DataPoint(json, session, is_aggregate=aggregate))
+    return result
@@ -3,6 +3,7 @@
 from __future__ import unicode_literals
 from .exceptions import error_for
 from collections import namedtuple
+from weakref import WeakSet
 from json import loads as load_json
 
 
@@ -98,12 +99,17 @@ class Session(object):
     different syncrhonous and asynchronous approaches. The default
     adapter is a synchronous `requests` based adapter.
 
+    A response callback can itself return the result of another
+    request on the session. This chains requests that depend on an
+    earlier response in a way that works with every adapter.
+
     """
 
     def __init__(self,
                  adapter=None,
                  api_token=None,
-                 base_url='https://api.helium.com/v1'):
+                 base_url='https://api.helium.com/v1',
+                 relationship_cache=None):
         """Construct a session with the Helium API.
 
         This sets up the correct headers, content-types and
@@ -113,8 +119,12 @@ class Session(object):
             adapter: The adapter to use for requests
             api_token: Your Helium API Token
             base_url: The base URL to the Helium API
+            relationship_cache: An optional :class:`RelationshipCache`
+                for relationship fetches
         """
         super(Session, self).__init__()
+        self.relationship_cache = relationship_cache
+        self._metadata_indexes = WeakSet()
         self.adapter = adapter
         if self.adapter is None:
             from helium.adapter.requests import Adapter
@@ -259,10 +269,96 @@ class Session(object):
         """
         return self.adapter.delete(url, callback, json=json)
 
+    def gather(self, calls, callback, concurrency=None):
+        """Execute a number of requests concurrently.
+
+        Each of the given calls is a function without arguments that
+        issues a single request through this session, for example:
+
+        .. code-block:: python
+
+            calls = [partial(sensor.delete) for sensor in sensors]
+            session.gather(calls, lambda results: results)
+
+        The calls are run over pooled connections with at most
+        ``concurrency`` requests in flight at a time.
+
+        Args:
+
+            calls(list): The request functions to execute
+
+            callback(func): The callback to handle the list of results
+
+        Keyword Args:
+
+            concurrency(int): The maximum number of concurrent requests
+                (defaults to the adapter preference)
+
+        Returns:
+
+            The result of the callback handling the list of results, in
+                the order of the given calls. A call that raised an
+                exception has that exception as its result.
+
+        """
+        return self.adapter.gather(calls, callback, concurrency=concurrency)
+
+    def schedule(self, delay, call):
+        """Call a function after a delay.
+
+        The call is made in the background, on a timer thread or on the
+        event loop depending on the adapter.
+
+        Args:
+
+            delay(float): The number of seconds to wait
+
+            call(func): The function to call without arguments. With an
+                asynchronous adapter its result is awaited.
+
+        Returns:
+
+            A timer with a ``cancel()`` method to cancel the call
+
+        """
+        return self.adapter.schedule(delay, call)
+
+    def rollout(self, rollout):
+        """Run a configuration rollout.
+
+        Args:
+
+            rollout(Rollout): The rollout to run
+
+        Returns:
+
+            RolloutResult: The outcome of the rollout. Depending on the
+                adapter this blocks until the rollout is done.
+
+        """
+        return self.adapter.rollout(rollout)
+
     def datapoints(self, timeseries):
         return self.adapter.datapoints(timeseries)
 
-    def live(self, url, resource_class, resource_args, params=None):
+    def resources(self, collection):
+        """Get an iterator over a paged resource collection.
+
+        Args:
+
+            collection(ResourceIterable): The collection to iterate over
+
+        Returns:
+
+            An iterator over the resources in the collection. Depending
+                on the adapter the iterator will allow asynchronous
+                behavior.
+
+        """
+        return self.adapter.resources(collection)
+
+    def live(self, url, resource_class, resource_args, params=None,
+             resume=None, idle_timeout=None):
         """Get a live endpoint.
 
         Args:
@@ -279,6 +375,13 @@ class Session(object):
 
             params(dict): Request parameters for the live url
 
+            resume(Resume): An optional policy to reconnect and
+                backfill the live endpoint when the connection drops
+
+            idle_timeout(float): The number of seconds without any
+                data, including heartbeat comments, after which the
+                connection is considered dead
+
         Returns:
 
             An iterator over the live endpoint. Depending on the
@@ -288,7 +391,8 @@ class Session(object):
 
         """
         return self.adapter.live(self, url, resource_class, resource_args,
-                                 params=params)
+                                 params=params, resume=resume,
+                                 idle_timeout=idle_timeout)
 
     def _build_url(self, *args, **kwargs):
         parts = [kwargs.get('base_url', self.base_url)]
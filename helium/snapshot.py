@@ -0,0 +1,351 @@
+"""An in-memory snapshot of an organization.
+
+A snapshot loads all sensors, elements, labels, users, device
+configurations and configurations of the authorized organization with
+as few requests as possible, and indexes them for constant time
+lookups:
+
+.. code-block:: python
+
+    snapshot = client.snapshot()
+    sensor = snapshot[sensor_id]
+    for label in snapshot.related(sensor, Label):
+        print(label.name)
+
+Relationships are indexed in both directions, so the labels of a
+sensor and the sensors of a label are found without any requests,
+whichever side of the relationship the API reports.
+
+The organization is fetched with its users, elements, sensors and
+labels included, and the device configurations are fetched with their
+configurations included. Both requests are made concurrently.
+
+"""
+
+from __future__ import unicode_literals
+from collections import OrderedDict, namedtuple
+from functools import partial
+from . import (
+    CB,
+    NotFoundError,
+    build_request_include,
+    Organization,
+    User,
+    Element,
+    Sensor,
+    Label,
+    Configuration,
+    DeviceConfiguration,
+)
+
+_ORGANIZATION_INCLUDE = [User, Element, Sensor, Label]
+_DEVICE_CONFIGURATION_INCLUDE = [Configuration]
+_CLASSES = [Organization] + _ORGANIZATION_INCLUDE + \
+    [DeviceConfiguration] + _DEVICE_CONFIGURATION_INCLUDE
+
+
+def _references(json):
+    relationships = json.get('relationships') or {}
+    for relationship in relationships.values():
+        data = (relationship or {}).get('data')
+        if data is None:
+            continue
+        if isinstance(data, dict):
+            data = [data]
+        for reference in data:
+            yield reference.get('type'), reference.get('id')
+
+
+def _identity(json):
+    return json
+
+
+class SnapshotChanges(namedtuple('SnapshotChanges',
+                                 ['added', 'updated', 'removed'])):
+    """The changes applied to a :class:`Snapshot` by a refresh.
+
+    ``added`` and ``updated`` are the new resources, ``removed`` the
+    resources that are no longer part of the organization.
+
+    """
+
+    __slots__ = ()
+
+
+class Snapshot(object):
+    """An indexed, in-memory view of an organization.
+
+    Resources are looked up by id with ``snapshot[id]`` or
+    :meth:`get`, and by class with :meth:`all`. The snapshot does not
+    change unless it is refreshed.
+
+    Attributes:
+
+        organization(Organization): The authorized organization
+
+    """
+
+    def __init__(self, session):
+        """Construct an empty snapshot.
+
+        You normally don't construct this directly but call
+        :meth:`Client.snapshot` or :meth:`load`.
+        """
+        self._session = session
+        self._registry = {clazz._resource_type(): clazz
+                          for clazz in _CLASSES}
+        self._resources = {}
+        self._types = {type: OrderedDict() for type in self._registry}
+        self._forward = {}
+        self._reverse = {}
+        self.organization = None
+
+    @classmethod
+    def load(cls, session, concurrency=None):
+        """Load a snapshot of the authorized organization.
+
+        Args:
+
+            session(Session): The session to load the snapshot with
+
+        Keyword Args:
+
+            concurrency(int): The maximum number of concurrent requests
+
+        Returns:
+
+            Snapshot: The loaded snapshot
+        """
+        snapshot = cls(session)
+        return snapshot._fetch(snapshot._replace, concurrency)
+
+    def _fetch(self, process, concurrency):
+        session = self._session
+        organization_params = build_request_include(_ORGANIZATION_INCLUDE,
+                                                    None)
+        configuration_params = build_request_include(
+            _DEVICE_CONFIGURATION_INCLUDE, None)
+        calls = [
+            partial(session.get,
+                    session._build_url(Organization._resource_path()),
+                    CB.json(200, _identity), params=organization_params),
+            partial(session.get,
+                    session._build_url(DeviceConfiguration._resource_path()),
+                    CB.json(200, _identity), params=configuration_params),
+        ]
+
+        def _process(results):
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+            entries = OrderedDict()
+            for json in results:
+                data = json.get('data')
+                data = data if isinstance(data, list) else [data]
+                for entry in data + (json.get('included') or []):
+                    if entry.get('type') in self._registry:
+                        entries[entry.get('id')] = entry
+            return process(entries)
+        return session.gather(calls, _process, concurrency=concurrency)
+
+    def _construct(self, json):
+        clazz = self._registry[json.get('type')]
+        if clazz is Organization:
+            return Organization._mk_one(self._session,
+                                        singleton=True)({'data': json})
+        return clazz(json, self._session)
+
+    def _add(self, resource):
+        id = resource.id
+        resource_type = resource._resource_type()
+        self._resources[id] = resource
+        self._types[resource_type][id] = resource
+        if isinstance(resource, Organization):
+            self.organization = resource
+        forward = self._forward[id] = {}
+        for type, related_id in _references(resource._json_data):
+            if type not in self._registry:
+                continue
+            forward.setdefault(type, set()).add(related_id)
+            reverse = self._reverse.setdefault(related_id, {})
+            reverse.setdefault(resource_type, set()).add(id)
+
+    def _discard(self, id):
+        resource = self._resources.pop(id)
+        resource_type = resource._resource_type()
+        del self._types[resource_type][id]
+        for type, related_ids in self._forward.pop(id).items():
+            for related_id in related_ids:
+                reverse = self._reverse.get(related_id, {})
+                reverse.get(resource_type, set()).discard(id)
+        return resource
+
+    def _replace(self, entries):
+        for id, json in entries.items():
+            self._add(self._construct(json))
+        return self
+
+    def _apply(self, entries, removed_ids):
+        added, updated, removed = [], [], []
+        for id in removed_ids:
+            if id in self._resources:
+                removed.append(self._discard(id))
+        for id, json in entries.items():
+            current = self._resources.get(id)
+            if current is not None:
+                if current._json_data == json:
+                    continue
+                self._discard(id)
+            resource = self._construct(json)
+            self._add(resource)
+            (added if current is None else updated).append(resource)
+        return SnapshotChanges(added, updated, removed)
+
+    def refresh(self, resources=None, concurrency=None):
+        """Bring the snapshot up to date.
+
+        Without arguments the organization is fetched again and only
+        the resources that were added, changed or removed since are
+        replaced in the snapshot and its indexes. Resources that did
+        not change are kept as they are.
+
+        When a list of resources is given, only those resources are
+        fetched again, concurrently, which is cheaper when it is known
+        which resources changed.
+
+        Keyword Args:
+
+            resources(list): The resources, or their ids, to refresh
+
+            concurrency(int): The maximum number of concurrent requests
+
+        Returns:
+
+            SnapshotChanges: The resources that were added, updated or
+                removed
+        """
+        if resources is None:
+            def _process(entries):
+                removed_ids = [id for id in self._resources
+                               if id not in entries]
+                return self._apply(entries, removed_ids)
+            return self._fetch(_process, concurrency)
+
+        ids = [getattr(resource, 'id', resource) for resource in resources]
+        ids = [id for id in ids if id in self._resources]
+        session = self._session
+        calls = []
+        for id in ids:
+            clazz = self._resources[id].__class__
+            url = session._build_url(clazz._resource_path(),
+                                     None if clazz is Organization else id)
+            calls.append(partial(session.get, url, CB.json(200, _identity)))
+
+        def _process_many(results):
+            entries = OrderedDict()
+            removed_ids = []
+            for id, result in zip(ids, results):
+                if isinstance(result, NotFoundError):
+                    removed_ids.append(id)
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    entries[id] = result.get('data')
+            return self._apply(entries, removed_ids)
+        return session.gather(calls, _process_many,
+                              concurrency=concurrency)
+
+    def __getitem__(self, id):
+        """Get a resource by id."""
+        return self._resources[id]
+
+    def __contains__(self, id):
+        """Check whether a resource with the given id is in the snapshot."""
+        return id in self._resources
+
+    def __len__(self):
+        """The number of resources in the snapshot."""
+        return len(self._resources)
+
+    def get(self, id, default=None):
+        """Get a resource by id.
+
+        Args:
+
+            id: The id of the resource
+
+        Keyword Args:
+
+            default: The value to return if the resource is not found
+
+        Returns:
+
+            Resource: The resource, or ``default``
+        """
+        return self._resources.get(id, default)
+
+    def all(self, resource_class):
+        """Get all resources of a class.
+
+        Args:
+
+            resource_class(Resource): The class of resources to return
+
+        Returns:
+
+            list(Resource): The resources in the order they were loaded
+        """
+        return list(self._types[resource_class._resource_type()].values())
+
+    def related(self, resource, resource_class):
+        """Get the resources of a class related to a resource.
+
+        Args:
+
+            resource: The resource, or its id, to get related resources
+                for
+
+            resource_class(Resource): The class of related resources to
+                return
+
+        Returns:
+
+            list(Resource): The related resources
+        """
+        id = getattr(resource, 'id', resource)
+        type = resource_class._resource_type()
+        related_ids = set(self._forward.get(id, {}).get(type, ()))
+        related_ids.update(self._reverse.get(id, {}).get(type, ()))
+        resources = self._resources
+        return [resources[related_id] for related_id in sorted(related_ids)
+                if related_id in resources]
+
+    @property
+    def sensors(self):
+        """The sensors by id."""
+        return self._types[Sensor._resource_type()]
+
+    @property
+    def elements(self):
+        """The elements by id."""
+        return self._types[Element._resource_type()]
+
+    @property
+    def labels(self):
+        """The labels by id."""
+        return self._types[Label._resource_type()]
+
+    @property
+    def users(self):
+        """The users by id."""
+        return self._types[User._resource_type()]
+
+    @property
+    def device_configurations(self):
+        """The device configurations by id."""
+        return self._types[DeviceConfiguration._resource_type()]
+
+    @property
+    def configurations(self):
+        """The configurations by id."""
+        return self._types[Configuration._resource_type()]
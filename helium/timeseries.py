@@ -5,6 +5,7 @@ from __future__ import unicode_literals
 from . import Resource, CB
 from . import to_iso_date
 from . import build_request_body
+from .live import Resume
 from collections import Iterable, namedtuple, OrderedDict
 from future.utils import iteritems
 
@@ -42,6 +43,16 @@ class DataPoint(Resource):
     def _resource_path(cls):
         return "timeseries"
 
+    def _serialization_state(self):
+        state = super(DataPoint, self)._serialization_state()
+        if self._is_aggregate:
+            state['aggregate'] = True
+        return state
+
+    @classmethod
+    def _from_serialization_state(cls, json, session, state):
+        return cls(json, session, is_aggregate=state.get('aggregate', False))
+
     def _promote_json_attribute(self, attribute, value):
         if attribute == 'value' and self._is_aggregate:
             value = AggregateValue(**value)
@@ -268,7 +279,11 @@ class Timeseries(Iterable):
         return session.post(self._base_url, CB.json(201, _process),
                             json=attributes)
 
-    def live(self):
+    def live(self, resume=False,
+             max_reconnects=None,
+             backoff=1.0,
+             max_backoff=30.0,
+             idle_timeout=None):
         """Get a live stream of timeseries readings.
 
         This returns an Iterable over a live stream of readings. Note
@@ -289,17 +304,63 @@ class Timeseries(Iterable):
                 # Wait for 10 readings
                 first10 = list(islice(live, 10))
 
+        Live streams are long lived connections which can drop. Pass
+        ``resume=True`` to have the stream reconnect with exponential
+        backoff. The stream resumes from the last received event id
+        and backfills any readings that were missed while disconnected
+        from this timeseries, so no readings are lost or delivered
+        twice. The ``stats`` of the returned stream count reconnects,
+        gaps and backfilled readings.
+
+        A connection can also go silent without being closed. With an
+        ``idle_timeout`` a stream that receives no data, including the
+        heartbeat comments the server sends, for that many seconds is
+        considered dead. It then reconnects if resumable, or raises a
+        :class:`LiveTimeoutError`. The ``last_event_age`` of a stream
+        is the number of seconds since it last received data, readings
+        or heartbeats, which can be used to detect stuck consumers.
+
+        Keyword Args:
+
+            resume(bool): Whether to reconnect and backfill when the
+                connection drops
+
+            max_reconnects(int): The maximum number of consecutive
+                reconnect attempts, or ``None`` to retry forever
+
+            backoff(float): The initial reconnect delay in seconds
+
+            max_backoff(float): The maximum reconnect delay in seconds
+
+            idle_timeout(float): The number of seconds of silence after
+                which the connection is considered dead
+
         Returns:
 
+            The live stream of :class:`DataPoint` readings
         """
         session = self._session
         url = "{}/live".format(self._base_url)
         supported_params = frozenset(['filter[port]'])
         params = {k: v for k, v in iteritems(self._params)
                   if k in supported_params}
+        if resume:
+            resume = Resume(backfill=self._backfill,
+                            max_reconnects=max_reconnects,
+                            backoff=backoff,
+                            max_backoff=max_backoff)
+        else:
+            resume = None
         return session.live(url, self._datapoint_class, {
             'is_aggregate': self._is_aggregate
-        }, params=params)
+        }, params=params, resume=resume, idle_timeout=idle_timeout)
+
+    def _backfill(self, start):
+        return Timeseries(self._session, self._resource_class,
+                          self._resource_id,
+                          datapoint_class=self._datapoint_class,
+                          port=self._params.get('filter[port]'),
+                          start=start)
 
 
 def timeseries():
@@ -137,3 +137,35 @@ def build_request_include(include, params):
     if include is not None:
         params['include'] = ','.join([cls._resource_type() for cls in include])
     return params
+
+
+def build_request_fields(fields, params):
+    """Augment request parameters with sparse fieldsets.
+
+    JSONAPI allows a request to limit the attributes and relationships
+    returned for each resource type using a ``fields[type]`` query
+    parameter. This function extends the given parameters for a
+    request with a fieldset for every resource class passed in as keys
+    of the given dictionary.
+
+    Args:
+
+        fields(dict): A dictionary of resource classes to the list of
+            attribute and relationship names to fetch for that class
+
+        params(dict): The (optional) dictionary of request parameters to extend
+
+    Returns:
+
+        An updated or new dictionary of parameters extended with
+        a fields query parameter per resource type.
+
+    """
+    params = params or OrderedDict()
+    if fields is not None:
+        fieldsets = sorted((cls._resource_type(), names)
+                           for cls, names in fields.items())
+        for resource_type, names in fieldsets:
+            key = 'fields[{}]'.format(resource_type)
+            params[key] = ','.join(names)
+    return params
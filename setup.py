@@ -7,7 +7,11 @@ requires = [
     "future>=0.15",
     "requests>=2.12.5",
     "inflection>=0.3",
+    'futures>=3.0; python_version < "3"',
 ]
+extras_require = {
+    'msgpack': ['msgpack>=0.5.2'],
+}
 setup_requires = [
     'vcversioner',
 ]
@@ -24,6 +28,7 @@ setup(
     packages=packages,
     setup_requires=setup_requires,
     install_requires=requires,
+    extras_require=extras_require,
     include_package_data=True,
     license='BSD',
     vcversioner={
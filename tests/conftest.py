@@ -43,6 +43,22 @@ def recorder(request):
         yield recorder
 
 
+class Clock(object):
+    """A clock that only moves when its ``now`` is set."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Return a fake clock for components that take a ``clock``."""
+    return Clock()
+
+
 @pytest.fixture
 def client(recorder):
     """Return the helium.Client object used by the current recorder."""
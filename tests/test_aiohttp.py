@@ -3,10 +3,16 @@
 from __future__ import unicode_literals
 
 import os
+import asyncio
 import pytest
+from functools import partial
 import aiohttp
-from helium import Client, Label, Sensor
-from helium.adapter.aiohttp import Adapter
+from helium import (
+    Client, Label, Sensor, Organization, Timeseries, DataPoint,
+    LiveTimeoutError, Configuration, DeviceConfiguration, Metadata,
+    MetadataWriter,
+)
+from helium.adapter.aiohttp import Adapter, LiveManager, LiveIterator
 
 
 API_TOKEN = os.environ.get('HELIUM_API_KEY', 'X' * 10)
@@ -85,3 +91,150 @@ async def test_datapoints(aclient):
     assert datapoints[0] == datapoint
 
     assert await sensor.delete() is True
+
+
+async def test_gather(loop):
+    async with Adapter(loop=loop) as adapter:
+        running = []
+
+        async def _call(value):
+            running.append(value)
+            await asyncio.sleep(0.01)
+            if value == 'fail':
+                raise ValueError(value)
+            if value == 'cancel':
+                raise asyncio.CancelledError()
+            return value
+
+        calls = [partial(_call, value) for value in ('a', 'fail', 'b')]
+        results = await adapter.gather(calls, lambda results: results,
+                                       concurrency=3)
+        assert results[::2] == ['a', 'b']
+        assert isinstance(results[1], ValueError)
+
+        calls = [partial(_call, value) for value in ('a', 'cancel', 'b')]
+        with pytest.raises(asyncio.CancelledError):
+            await adapter.gather(calls, lambda results: results,
+                                 concurrency=2)
+        assert len(running) == 6
+
+
+async def _values(subscription):
+    result = []
+    async for point in subscription:
+        result.append(point.value)
+    return result
+
+
+async def test_live_manager(aclient):
+    s1 = 'c48179b1-487c-49e6-928e-241e3fd15b41'
+    s2 = 'd7ab9a10-5aa5-4c3f-9e39-3a0fbd36c0f2'
+    received = []
+
+    async with LiveManager(aclient, resume=False) as manager:
+        manager.route(Timeseries(aclient, Organization, None))
+        first = manager.subscribe(Timeseries(aclient, Sensor, s1))
+        second = manager.subscribe(Timeseries(aclient, Sensor, s1))
+        humidity = manager.subscribe(Timeseries(aclient, Sensor, s1,
+                                                port='h'))
+        manager.subscribe(Timeseries(aclient, Sensor, s2),
+                          callback=received.append)
+        # All sensor subscriptions share the organization stream
+        assert manager.streams == 1
+
+        assert await _values(first) == [1, 3, 5]
+        assert await _values(second) == [1, 3, 5]
+        assert await _values(humidity) == [3]
+        assert [point.value for point in received] == [2, 4]
+
+
+async def test_live_batches(aclient):
+    timeseries = Timeseries(aclient, Sensor,
+                            'c48179b1-487c-49e6-928e-241e3fd15b41')
+    batches = []
+    async with timeseries.live() as live:
+        async for batch in live.batches(max_size=2, columnar=True):
+            batches.append(batch['value'])
+    assert batches == [[1, 2], [3, 4], [5]]
+
+
+async def test_live_buffered(aclient):
+    timeseries = Timeseries(aclient, Sensor,
+                            'c48179b1-487c-49e6-928e-241e3fd15b41')
+    values = []
+    async with timeseries.live() as live:
+        buffered = live.buffered(maxsize=2, overflow='drop-oldest')
+        async for point in buffered:
+            values.append(point.value)
+    # The reader outpaces the consumer and drops the oldest readings
+    assert values == [4, 5]
+    assert buffered.stats.dropped == 3
+
+
+async def test_live_idle_timeout(loop):
+    live = LiveIterator(None, None, DataPoint, {}, idle_timeout=0.05)
+    live._content = asyncio.StreamReader()
+    # A heartbeat is data, but the stream goes silent afterwards
+    live._content.feed_data(b': heartbeat\n\n')
+    with pytest.raises(LiveTimeoutError):
+        await live.__anext__()
+    assert live.last_event_age >= 0.05
+
+
+async def test_live_reorder(aclient):
+    timeseries = Timeseries(aclient, Sensor,
+                            'c48179b1-487c-49e6-928e-241e3fd15b41')
+    values = []
+    async with timeseries.live() as live:
+        reordered = live.reorder(delay=60)
+        async for point in reordered:
+            values.append(point.value)
+    assert values == [1, 2, 3, 4, 5]
+    assert reordered.stats.duplicates == 1
+
+
+async def test_sync(aclient):
+    label = await aclient.label('7ed46ea8-1e01-4bd2-a1df-c2b7b8eb3a40')
+    freezer, fridge = await aclient.sensors()
+    result = await label.sync_sensors([fridge])
+    assert result.added == [fridge]
+    assert result.removed == [freezer]
+    assert result.errors == []
+
+
+async def test_rollout(aclient):
+    configuration = Configuration({
+        'id': '3c2b1a09-8f7e-4d6c-b5a4-9382716050fa',
+        'type': 'configuration',
+    }, aclient)
+    sensors = await aclient.sensors()
+    result = await DeviceConfiguration.rollout(aclient, configuration,
+                                               sensors[::2], concurrency=1,
+                                               interval=0, max_polls=2)
+    assert len(result.loaded) == 1
+    assert len(result.stragglers) == 1
+    assert result.failed == []
+
+
+async def test_metadata_update_all(aclient):
+    sensors = await aclient.sensors()
+    result = await Metadata.update_all(aclient, sensors[:2],
+                                       lambda sensor, _: {'site': 'sf'},
+                                       concurrency=1)
+    assert [metadata.site for metadata in result.successes] == ['sf', 'sf']
+    assert result.errors == []
+
+
+async def test_metadata_writer(aclient):
+    freezer, fridge, _ = await aclient.sensors()
+    flushed = asyncio.Event()
+    writer = MetadataWriter(aclient, window=0.05, concurrency=1,
+                            on_flush=lambda result: flushed.set())
+    assert await writer.update(freezer, {'temp': -18}) is None
+    await asyncio.wait_for(flushed.wait(), 5)
+    assert len(writer) == 0
+
+    async with MetadataWriter(aclient, window=60, concurrency=1) as writer:
+        await writer.update(fridge, {'temp': 4})
+        assert len(writer) == 1
+    assert len(writer) == 0
@@ -0,0 +1,52 @@
+"""Tests for the relationship cache."""
+
+from __future__ import unicode_literals
+from helium import Label, Sensor, RelationshipCache
+import pytest
+
+
+def test_cache(clock):
+    cache = RelationshipCache(maxsize=2, ttl=10, clock=clock)
+    cache.set(('label', 1, 'sensors'), 'a')
+    cache.set(('label', 2, 'sensors'), 'b')
+    assert cache.get(('label', 1, 'sensors')) == 'a'
+    # Evicts the least recently used entry
+    cache.set(('label', 3, 'sensors'), 'c')
+    assert cache.get(('label', 2, 'sensors')) is None
+    assert cache.get(('label', 1, 'sensors')) == 'a'
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    clock.now = 10
+    assert cache.get(('label', 1, 'sensors')) is None
+
+    cache.set(('sensor', 1, 'labels'), 'd')
+    cache.set(('sensor', 2, 'labels'), 'e')
+    cache.invalidate('sensor', relationship='labels')
+    assert len(cache) == 0
+
+
+@pytest.fixture
+def cached_client(client):
+    client.relationship_cache = RelationshipCache()
+    return client
+
+
+def test_relationship_cache(cached_client):
+    cache = cached_client.relationship_cache
+    label = cached_client.label('7ed46ea8-1e01-4bd2-a1df-c2b7b8eb3a40')
+    sensor = cached_client.sensor('1f70c4fa-33b3-4e5f-bdca-82e3b4ac8d1f')
+
+    assert len(label.sensors()) == 1
+    assert len(label.sensors()) == 1
+    assert sensor.labels() == []
+    assert sensor.labels() == []
+    assert cache.hits == 2
+
+    # Mutating invalidates both directions of the relationship
+    assert label.add_sensors([sensor])
+    assert sensor in label.sensors()
+    assert sensor.labels() == [label]
+    assert sensor in label.sensors()
+    assert isinstance(label.sensors()[0], Sensor)
+    assert label in sensor.labels(filter=lambda l: isinstance(l, Label))
+    assert cache.hits == 5
@@ -1,7 +1,7 @@
 """Tests for Configuration."""
 
 from __future__ import unicode_literals
-from helium import Configuration
+from helium import Configuration, ConfigurationIndex, configuration_hash
 
 
 def test_create(client):
@@ -19,3 +19,35 @@ def test_create(client):
 def test_device_configuration(tmp_configuration):
     device_configs = tmp_configuration.device_configurations()
     assert len(device_configs) == 0
+
+
+def test_index(client, tmpdir):
+    path = str(tmpdir.join('configurations.json'))
+    index = ConfigurationIndex(path)
+    assert index.load(client) is index
+    assert len(index) == 1
+
+    # Reused regardless of key order
+    config = index.get_or_create(client, {'mode': 'fast', 'interval': 60})
+    assert config.id == '3c2b1a09-8f7e-4d6c-b5a4-9382716050fa'
+
+    config = index.get_or_create(client, {'interval': 30})
+    assert config.id == '58a7df01-e83a-4587-9501-5f8be381888a'
+
+    # Duplicates are only created once, and found by the requested
+    # attributes even when the server normalizes them
+    configs = index.get_or_create_many(client, [
+        {'interval': 10}, {'interval': 30}, {'interval': 10},
+    ], concurrency=1)
+    assert [c.interval for c in configs] == [10, 30, 10]
+    assert configs[0] == configs[2]
+    assert configs[0].unit == 's'
+    assert index.get_or_create(client, {'interval': 10}) == configs[0]
+
+    # The index survives in its file
+    index = ConfigurationIndex(path)
+    assert len(index) == 3
+    assert index.get(client, {'interval': 10}) == configs[0]
+    assert index.get(client, {'interval': 20}) is None
+    assert configuration_hash({'a': 1, 'b': 2}) == \
+        configuration_hash({'b': 2, 'a': 1})
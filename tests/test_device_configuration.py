@@ -1,7 +1,7 @@
 """Tests for DeviceConfiguration."""
 
 from __future__ import unicode_literals
-from helium import DeviceConfiguration, Device, Configuration
+from helium import DeviceConfiguration, Device, Configuration, Rollout
 
 
 def test_with_sensor(client, tmp_configuration, first_sensor):
@@ -42,3 +42,63 @@ def test_with_element(client, tmp_configuration, first_element):
     assert fetch is None
 
     assert device_config.delete()
+
+
+def test_rollout(client, sensors):
+    configuration = Configuration({
+        'id': '3c2b1a09-8f7e-4d6c-b5a4-9382716050fa',
+        'type': 'configuration',
+    }, client)
+    progress = []
+
+    def on_progress(device, status, value):
+        progress.append((device.name, status))
+
+    # Polls fetch the collection, which has other device configurations
+    result = DeviceConfiguration.rollout(client, configuration, sensors,
+                                         concurrency=1, interval=0,
+                                         max_polls=2, collection_threshold=2,
+                                         on_progress=on_progress)
+    fridge = sensors[1]
+    assert [dc.id for dc in result.loaded] == \
+        ['9a8b7c6d-5e4f-4a3b-8c2d-1e0f9a8b7c6d']
+    assert result.loaded[0].is_loaded()
+    assert len(result.stragglers) == 1
+    assert not result.stragglers[0].is_loaded()
+    assert [device for device, _ in result.failed] == [fridge]
+    assert progress == [
+        ('freezer', 'pending'),
+        ('fridge', 'failed'),
+        ('oven', 'pending'),
+        ('freezer', 'loaded'),
+    ]
+
+
+def test_rollout_interval(client):
+    def device_configuration(loaded):
+        return DeviceConfiguration({
+            'id': 'dc', 'type': 'device-configuration',
+            'meta': {'loaded': loaded},
+        }, client)
+
+    now = [0.0]
+    device = Device({'id': 'device', 'type': 'sensor'}, client)
+    rollout = Rollout(client, None, [device], interval=1, max_interval=4,
+                      backoff=2, timeout=10, clock=lambda: now[0])
+    rollout.created([device_configuration(False)])
+    assert not rollout.done
+    assert rollout.progress() == {'pending': 1, 'loaded': 0, 'failed': 0}
+
+    # The interval grows while nothing changes
+    delays = []
+    for _ in range(3):
+        rollout.polled([device_configuration(False)])
+        delays.append(rollout.next_delay())
+    assert delays == [2, 4, 4]
+
+    # and is bounded by the timeout
+    now[0] = 8
+    assert rollout.next_delay() == 2
+    now[0] = 10
+    assert rollout.done
+    assert rollout.result().stragglers[0].id == 'dc'
@@ -1,6 +1,6 @@
 from __future__ import unicode_literals
 
-from helium import Element, Sensor
+from helium import Element, Sensor, prefetch_related
 
 
 def test_elements(elements, first_element):
@@ -43,3 +43,10 @@ def test_sensor(client):
         assert len(sensors) > 0
         for sensor in sensors:
             assert sensor.element() == elem
+
+
+def test_prefetch(elements, first_element):
+    prefetch_related(elements, 'sensors', concurrency=1)
+    sensors = first_element.sensors(use_included=True)
+    assert len(sensors) == 1
+    assert isinstance(sensors[0], Sensor)
@@ -1,7 +1,7 @@
 """Test for Labels."""
 
 from __future__ import unicode_literals
-from helium import Label
+from helium import Label, ServerError
 import pytest
 
 
@@ -85,3 +85,20 @@ def test_metadata(tmp_label):
 
 def test_meta(tmp_label):
     assert tmp_label.meta is not None
+
+
+def test_sync(client):
+    label = client.label('7ed46ea8-1e01-4bd2-a1df-c2b7b8eb3a40')
+    freezer, fridge, oven = client.sensors()
+
+    result = label.sync_sensors([fridge, oven], chunk_size=1,
+                                concurrency=1)
+    assert result.added == [fridge]
+    assert result.removed == [freezer]
+    assert len(result.errors) == 1
+    chunk, error = result.errors[0]
+    assert chunk == [oven]
+    assert isinstance(error, ServerError)
+
+    # Nothing to change
+    assert label.sync_sensors([fridge]) == ([], [], [])
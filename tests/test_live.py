@@ -0,0 +1,313 @@
+"""Tests for live stream support."""
+
+from __future__ import unicode_literals
+import json
+import random
+import socket
+import threading
+import time
+import pytest
+from itertools import islice
+from helium import Client, DataPoint
+from helium.adapter.requests import LiveIterator
+from helium.live import (
+    SeenSet, Resume, Event, EventParser, LiveBuffer,
+    Recorder, read_recording, replay_recording, Reorderer,
+)
+
+
+def test_seen_set():
+    seen = SeenSet(2)
+    assert seen.add('a')
+    assert not seen.add('a')
+    assert seen.add('b')
+    assert seen.add('c')
+    assert 'a' not in seen
+    assert 'c' in seen
+    assert len(seen) == 2
+
+
+def test_resume_backoff():
+    resume = Resume(max_reconnects=3, backoff=1.0, max_backoff=3.0)
+    assert resume.headers() is None
+    resume.event('42')
+    assert resume.headers() == {'Last-Event-ID': '42'}
+
+    assert [resume.next_delay() for _ in range(4)] == [1.0, 2.0, 3.0, None]
+    # Only re-established streams count as reconnects
+    assert resume.stats.reconnects == 0
+    resume.reconnected()
+    assert resume.stats.reconnects == 1
+
+
+def _parse(chunks):
+    parser = EventParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return parser, events
+
+
+def test_event_parser_fields():
+    stream = (b'\xef\xbb\xbf: heartbeat\n'
+              b'retry: 2500\n'
+              b'id: 1\n'
+              b'event: sensor\n'
+              b'data: {"a":\n'
+              b'data:1}\n'
+              b'\n'
+              b'data\n'
+              b'\n'
+              b'event: \xff\n'
+              b'data: invalid\n'
+              b'\n'
+              b'id\n'
+              b'data: no id\n'
+              b'\n'
+              b'id: 2\n'
+              b'data: incomplete')
+    parser, events = _parse([stream])
+    assert events == [
+        Event('1', 'sensor', '{"a":\n1}'),
+        Event('1', '\ufffd', 'invalid'),
+        Event('', 'message', 'no id'),
+    ]
+    assert parser.retry == 2500
+    assert parser.comments == 1
+    assert parser.last_event_id == '2'
+
+
+def _random_stream(rng, line_end):
+    words = ['temp', 'f\xfcnf', '\u6e29\u5ea6', ':colon', ' space', '{}']
+    lines, expected = [], []
+    last_id = None
+    for n in range(rng.randint(1, 20)):
+        event = rng.choice([None, 'sensor', 'label'])
+        data = [' '.join(rng.choice(words) for _ in range(rng.randint(0, 3)))
+                for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.3:
+            lines.append(': comment')
+        if rng.random() < 0.5:
+            last_id = str(n)
+            lines.append('id: ' + last_id)
+        if event is not None:
+            lines.append('event:' + event)
+        lines.extend('data: ' + value for value in data)
+        lines.append('')
+        value = '\n'.join(data)
+        if value:
+            expected.append(Event(last_id, event or 'message', value))
+    text = line_end.join(lines) + line_end
+    return text.encode('utf-8'), expected
+
+
+def _random_chunks(rng, data):
+    chunks = []
+    pos = 0
+    while pos < len(data):
+        size = rng.choice([1, 2, 3, rng.randint(1, 64)])
+        chunks.append(data[pos:pos + size])
+        pos += size
+    return chunks
+
+
+def test_event_parser_fuzz():
+    rng = random.Random(4711)
+    for _ in range(200):
+        line_end = rng.choice(['\n', '\r\n', '\r'])
+        stream, expected = _random_stream(rng, line_end)
+        assert _parse([stream])[1] == expected
+        assert _parse(_random_chunks(rng, stream))[1] == expected
+        single = [stream[i:i + 1] for i in range(len(stream))]
+        assert _parse(single)[1] == expected
+
+
+def test_last_event_age():
+    class Response(object):
+        def iter_content(self, chunk_size=None):
+            return iter([b': heartbeat\n'])
+
+    response = Response()
+    live = LiveIterator(response, None, DataPoint, {})
+    live._last_event -= 60
+    assert list(live._resources(response)) == []
+    assert live.last_event_age < 60
+
+
+def _quiet_live(*values):
+    """Open a live endpoint that sends datapoints and then goes quiet."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(1)
+    events = b''.join('data: {}\n\n'.format(json.dumps({'data': {
+        'id': 'dp-{}'.format(value),
+        'type': 'data-point',
+        'attributes': {'port': 't', 'value': value,
+                       'timestamp': '2016-09-18T10:00:{:02d}Z'.format(value)},
+    }})).encode('utf-8') for value in values)
+
+    def serve():
+        connection, _ = server.accept()
+        connection.recv(65536)
+        connection.sendall(b'HTTP/1.1 200 OK\r\n'
+                           b'Content-Type: text/event-stream\r\n'
+                           b'Transfer-Encoding: chunked\r\n\r\n' +
+                           '{:x}\r\n'.format(len(events)).encode('ascii') +
+                           events + b'\r\n')
+        # Send nothing more until the client goes away
+        connection.recv(1)
+        connection.close()
+        server.close()
+
+    thread = threading.Thread(target=serve)
+    thread.daemon = True
+    thread.start()
+    url = 'http://127.0.0.1:{}/live'.format(server.getsockname()[1])
+    client = Client(base_url=url)
+    return client.adapter.live(client, url, DataPoint, {})
+
+
+def test_live_batches():
+    with _quiet_live(1, 2, 3) as live:
+        batches = live.batches(max_size=2, max_latency=0.1)
+        assert [point.value for point in next(batches)] == [1, 2]
+        # The partial batch is yielded at its deadline on a quiet stream
+        start = time.time()
+        assert [point.value for point in next(batches)] == [3]
+        assert time.time() - start < 1
+
+
+def _point(value, port='t', sensor='s1'):
+    return DataPoint({
+        'id': 'dp-{}'.format(value),
+        'type': 'data-point',
+        'attributes': {'port': port, 'value': value},
+        'relationships': {'sensor': {'data': {'id': sensor,
+                                              'type': 'sensor'}}},
+    }, None)
+
+
+def _drain(buffer):
+    result = []
+    while len(buffer) > 0:
+        result.append(buffer.get().value)
+    return result
+
+
+def test_buffer_overflow():
+    with pytest.raises(ValueError):
+        LiveBuffer(overflow='explode')
+
+    buffer = LiveBuffer(2, overflow='block')
+    assert all(buffer.put(_point(v)) for v in (1, 2))
+    assert not buffer.put(_point(3))
+    assert _drain(buffer) == [1, 2]
+    assert buffer.stats.received == 2
+
+    buffer = LiveBuffer(2, overflow='drop-oldest')
+    for v in (1, 2, 3):
+        buffer.put(_point(v))
+    assert _drain(buffer) == [2, 3]
+    assert buffer.stats.dropped == 1
+
+    buffer = LiveBuffer(2, overflow='drop-newest')
+    for v in (1, 2, 3):
+        buffer.put(_point(v))
+    assert _drain(buffer) == [1, 2]
+    assert buffer.stats.dropped == 1
+    assert buffer.stats.delivered == 2
+    assert buffer.stats.max_depth == 2
+
+
+def test_buffer_coalesce():
+    buffer = LiveBuffer(2, overflow='coalesce')
+    buffer.put(_point(1, port='t'))
+    buffer.put(_point(2, port='h'))
+    buffer.put(_point(3, port='t'))
+    assert buffer.stats.coalesced == 1
+    buffer.put(_point(4, port='t', sensor='s2'))
+    assert buffer.stats.dropped == 1
+    assert _drain(buffer) == [2, 4]
+    assert buffer.lag == 0.0
+
+
+def test_threaded_close():
+    threaded = _quiet_live(1).threaded()
+    assert threaded.poll(timeout=5).value == 1
+    assert threaded.poll(timeout=0.05) is None
+    # Closing wakes up the reader thread blocked on the quiet stream
+    start = time.time()
+    threaded.close(timeout=5)
+    assert threaded.done
+    assert time.time() - start < 1
+
+
+def test_recording(tmpdir):
+    path = str(tmpdir.join('live.sse'))
+    recorder = Recorder(path)
+    recorder.write(b'data: 1\n')
+    time.sleep(0.05)
+    recorder.write(b'\n')
+    recorder.close()
+
+    chunks = list(read_recording(path))
+    assert [chunk for _, chunk in chunks] == [b'data: 1\n', b'\n']
+    assert chunks[0][0] == 0.0
+    assert chunks[1][0] >= 0.05
+
+    start = time.time()
+    assert b''.join(replay_recording(path, speed=None)) == b'data: 1\n\n'
+    assert b''.join(replay_recording(path, speed=1)) == b'data: 1\n\n'
+    assert time.time() - start >= 0.05
+
+    with pytest.raises(ValueError):
+        list(read_recording(__file__))
+
+
+def _timed_point(value, second):
+    point = _point(value)
+    point._json_data['attributes']['timestamp'] = \
+        '2016-09-18T10:00:{:02d}Z'.format(second)
+    return point
+
+
+def test_reorderer():
+    late = []
+    reorderer = Reorderer(delay=10, on_late=late.append)
+    assert reorderer.push(_timed_point(1, 5)) == []
+    assert reorderer.push(_timed_point(2, 2)) == []
+    assert reorderer.push(_timed_point(2, 2)) == []
+    # The watermark moves to 20 - 10 and releases the earlier points
+    released = reorderer.push(_timed_point(3, 20))
+    assert [point.value for point in released] == [2, 1]
+    # Behind the last delivered timestamp
+    assert reorderer.push(_timed_point(4, 1)) == []
+    assert [point.value for point in late] == [4]
+    assert [point.value for point in reorderer.flush()] == [3]
+
+    stats = reorderer.stats
+    assert stats.duplicates == 1
+    assert stats.reordered == 1
+    assert stats.late == 1
+    assert stats.pending == 0
+
+
+def test_reorderer_delay():
+    reorderer = Reorderer(delay=0.05)
+    assert reorderer.push(_timed_point(1, 0)) == []
+    assert 0 < reorderer.next_due() <= 0.05
+    time.sleep(0.05)
+    assert [point.value for point in reorderer.poll()] == [1]
+    assert reorderer.next_due() is None
+
+
+def test_live_reorder():
+    with _quiet_live(3, 1, 2, 2) as live:
+        reordered = live.reorder(delay=0.1)
+        start = time.time()
+        points = [point.value for point in islice(reordered, 3)]
+        # Held readings are released once due on a quiet stream
+        assert points == [1, 2, 3]
+        assert time.time() - start < 1
+        assert reordered.stats.duplicates == 1
+        assert reordered.stats.reordered == 2
@@ -1,6 +1,10 @@
 """Test for Metadata."""
 
 from __future__ import unicode_literals
+import threading
+from helium import (
+    Metadata, MetadataIndex, MetadataWriter, NotFoundError, Sensor,
+)
 
 
 def test_update(tmp_sensor):
@@ -37,3 +41,110 @@ def test_singleton_update(authorized_organization):
         'test': 42
     })
     assert updated.test == 42
+
+
+def _names(resources):
+    return [resource.name for resource in resources]
+
+
+def test_index(client):
+    index = MetadataIndex.load(client, Sensor, concurrency=1)
+    assert len(index) == 3
+    freezer, fridge, oven = index.has('site')
+    assert oven in index
+    assert index.metadata(freezer)['temp'] == -18
+
+    assert _names(index.contains(site='sf')) == ['freezer', 'fridge']
+    assert _names(index.contains({'tags': ['cold']}, site='sf')) == \
+        ['freezer', 'fridge']
+    assert index.contains(owner={'team': 'ops'}) == [freezer]
+    assert index.contains(site='sf', owner={'team': 'dev'}) == []
+    assert index.equals('tags', ['cold']) == [fridge]
+    assert index.range('temp', gte=4) == [fridge, oven]
+    assert index.range('temp', gt=-18, lt=220) == [fridge]
+    assert index.range('installed', lte='2016-09-15') == [freezer, fridge]
+
+    # Updates and replacements through the session keep the index current
+    oven.metadata().update({'site': 'sf'})
+    assert _names(index.contains(site='sf')) == ['freezer', 'fridge', 'oven']
+    freezer.metadata().replace({'temp': -20})
+    assert index.has('site') == [fridge, oven]
+    assert index.range('temp', lt=0) == [freezer]
+
+
+def test_update_all(client):
+    freezer, fridge, oven = Sensor.all(client)
+    result = Metadata.update_all(client, [freezer, fridge, freezer, oven],
+                                 {'site': 'sf'}, concurrency=1)
+    assert [metadata.id for metadata in result.successes] == \
+        [freezer.id, fridge.id]
+    assert result.successes[0].site == 'sf'
+    assert [(resource, type(error)) for resource, error in result.errors] == \
+        [(oven, NotFoundError)]
+
+    def fahrenheit(sensor, attributes):
+        if 'temp' not in attributes:
+            return None
+        return {'fahrenheit': attributes['temp'] * 1.8 + 32}
+
+    result = Metadata.update_all(client, [fridge, freezer], fahrenheit,
+                                 concurrency=1)
+    assert not result.errors
+    assert result.successes[0].fahrenheit == 39.2
+    assert not hasattr(result.successes[1], 'fahrenheit')
+
+
+def test_writer(client, clock):
+    freezer, fridge, _ = Sensor.all(client)
+    writer = MetadataWriter(client, window=1.0, concurrency=1, clock=clock)
+    assert writer.update(freezer, {'temp': -18}) is None
+    assert writer.update(fridge, {'temp': 4}) is None
+    assert writer.update(freezer, {'humidity': 40}) is None
+    assert len(writer) == 2
+    assert not writer.due
+
+    # Updates within the window are sent as one request per resource
+    clock.now = 1.5
+    result = writer.update(fridge, {'temp': 5})
+    assert len(writer) == 0
+    assert [metadata.id for metadata in result.successes] == \
+        [freezer.id, fridge.id]
+    assert result.successes[0].humidity == 40
+    assert result.successes[1].temp == 5
+    assert writer.flush().successes == []
+
+
+def test_writer_timer(client):
+    freezer, fridge, _ = Sensor.all(client)
+    flushed = threading.Event()
+    results = []
+
+    def on_flush(result):
+        results.append(result)
+        flushed.set()
+
+    # Sent once the window passed without any further update
+    writer = MetadataWriter(client, window=0.05, concurrency=1,
+                            on_flush=on_flush)
+    assert writer.update(freezer, {'temp': -18}) is None
+    assert flushed.wait(5)
+    assert len(writer) == 0
+    assert [metadata.temp for metadata in results[0].successes] == [-18]
+
+    # and when the writer is closed
+    with MetadataWriter(client, window=60, concurrency=1) as writer:
+        writer.update(fridge, {'temp': 4})
+        assert len(writer) == 1
+    assert len(writer) == 0
+    assert writer._timer is None
+
+
+def test_save(client):
+    _, fridge, _ = Sensor.all(client)
+    metadata = fridge.metadata()
+    metadata.site = 'sf'
+    metadata.temp = 4
+    assert metadata.changes() == {'site': 'sf'}
+    assert metadata.save() is metadata
+    assert (metadata.site, metadata.temp) == ('sf', 4)
+    assert metadata.changes() == {}
@@ -0,0 +1,56 @@
+"""Tests for queries."""
+
+from __future__ import unicode_literals
+from datetime import datetime
+from helium import Query, Sensor
+import pytest
+
+
+def _entry(id, name, created='2016-11-04T23:53:02.000000Z', **attributes):
+    attributes['name'] = name
+    return {
+        'id': id,
+        'type': 'sensor',
+        'attributes': attributes,
+        'meta': {'created': created},
+    }
+
+
+def test_predicate():
+    entries = [
+        _entry('a', 'freezer', last_seen=None),
+        _entry('b', 'fridge', created='2015-08-05T19:10:25Z'),
+        _entry('c', 'freezer', **{'last-seen': '2016-11-02T17:45:26Z'}),
+    ]
+
+    def _matching(query):
+        predicate = query._predicate()
+        return [entry['id'] for entry in entries if predicate(entry)]
+
+    assert Query()._predicate() is None
+    assert _matching(Query(name='freezer')) == ['a', 'c']
+    # An explicit null matches None, a missing attribute does not
+    assert _matching(Query(last_seen=None)) == ['a']
+    assert _matching(Query().ids(['a', 'b'])) == ['a', 'b']
+    assert _matching(Query(name='freezer').ids(['b', 'c'])) == ['c']
+    assert _matching(Query().range('meta.created',
+                                   lt=datetime(2016, 1, 1))) == ['b']
+    assert _matching(Query().range('last_seen',
+                                   gte='2016-01-01T00:00:00Z')) == ['c']
+
+
+def test_params():
+    query = Query(name='freezer').metadata(site='sf')
+    params = query._build_params({})
+    assert params == {'filter[metadata]': '{"site": "sf"}'}
+
+    with pytest.raises(ValueError):
+        query._build_params({'filter[metadata]': '{}'})
+
+
+def test_where(client):
+    query = Query(name='freezer').metadata(site='sf')
+    query = query.range('meta.created', gte=datetime(2016, 1, 1))
+    sensors = Sensor.where(client, query=query)
+    assert len(sensors) == 1
+    assert sensors[0].name == 'freezer'
@@ -61,3 +61,115 @@ def test_basic(client, tmp_sensor):
     # __getattr__ lookup
     with pytest.raises(AttributeError):
         tmp_sensor.no_such_attribute
+
+
+def test_iterate(client):
+    sensors = helium.Sensor.iterate(client, page_size=2)
+    assert isinstance(sensors, helium.ResourceIterable)
+
+    found = list(sensors)
+    assert len(found) == 3
+    assert all(isinstance(s, helium.Sensor) for s in found)
+    assert len(set(found)) == 3
+
+
+def test_fields(client):
+    sensors = helium.Sensor.all(client, fields={helium.Sensor: ['name']})
+    sensor = sensors[0]
+    assert sensor.name == 'Sparse Sensor'
+
+    sensor = helium.Sensor.find(client, sensor.id,
+                                fields={helium.Sensor: ['label']})
+    assert sensor.meta is not None
+    with pytest.raises(AttributeError) as raised:
+        sensor.name
+    assert 'requested fields' in str(raised.value)
+
+
+def test_save(client):
+    freezer, fridge, oven = helium.Sensor.all(client)
+    # Assigning the fetched value is not a change
+    freezer.name = 'freezer'
+    assert freezer.changes() == {}
+    assert freezer.save() is freezer
+
+    freezer.name = 'chiller'
+    assert freezer.changes() == {'name': 'chiller'}
+    assert freezer.save() is freezer
+    assert freezer.name == 'chiller'
+    assert freezer.changes() == {}
+    # Saving without changes does not make a request
+    assert freezer.save() is freezer
+
+    fridge.name = 'FRIDGE'
+    oven.name = 'OVEN'
+    result = helium.Sensor.save_all(client, [freezer, fridge, oven],
+                                    concurrency=1)
+    assert result.successes == [fridge]
+    assert [resource for resource, _ in result.errors] == [oven]
+    assert fridge.changes() == {}
+    assert oven.changes() == {'name': 'OVEN'}
+
+
+def test_bulk(client):
+    # Cassette playback is not thread safe, so the bulk requests are
+    # issued one at a time here
+    created = helium.Sensor.create_many(client, [
+        {'name': 'bulk'},
+        {'name': 'bulk'},
+    ], concurrency=1)
+    assert isinstance(created, helium.BulkResult)
+    assert len(created.successes) == 2
+    assert len(created.errors) == 0
+    sensors = sorted(created.successes, key=lambda s: s.id)
+
+    updated = helium.Sensor.update_many(client, [
+        (sensor, {'name': 'renamed'}) for sensor in sensors
+    ], concurrency=1)
+    assert len(updated.successes) == 2
+    assert all(s.name == 'renamed' for s in updated.successes)
+
+    deleted = helium.Sensor.delete_many(client, sensors, concurrency=1)
+    assert deleted.successes == sensors[:1]
+    assert len(deleted.errors) == 1
+    sensor, error = deleted.errors[0]
+    assert sensor == sensors[1]
+    assert isinstance(error, helium.NotFoundError)
+
+
+def test_decoder():
+    session = helium.Client()
+    classes = [helium.Element, helium.Sensor]
+    decoder = helium.Device._decoder(classes)
+    assert helium.Device._decoder(classes) is decoder
+    assert helium.Sensor._decoder() is not decoder
+
+    def entry(type, id, relationships=None):
+        return {'type': type, 'id': id, 'relationships': relationships or {}}
+
+    json = {
+        'data': [
+            entry('element', 'e1', {'sensor': {'data': [
+                {'type': 'sensor', 'id': 's2'},
+                {'type': 'sensor', 'id': 's1'},
+            ]}}),
+            entry('element', 'e2', {'sensor': {'data': []}}),
+        ],
+        'included': [
+            entry('sensor', 's1'),
+            entry('sensor', 's2'),
+            entry('sensor', 's3'),
+        ],
+    }
+    process = helium.Element._mk_many(session, include=[helium.Sensor])
+    first, second = process(json)
+    # Included resources keep the order of the response
+    assert [s.id for s in first.sensors(use_included=True)] == ['s1', 's2']
+    assert second.sensors(use_included=True) == []
+
+    devices = decoder.many([entry('sensor', 's1'), entry('element', 'e1')],
+                           session)
+    assert [d.__class__ for d in devices] == [helium.Sensor, helium.Element]
+    with pytest.raises(ValueError) as raised:
+        decoder.one(entry('label', 'l1'), session)
+    assert 'label' in str(raised.value)
@@ -0,0 +1,94 @@
+"""Tests for the shared memory ring buffer."""
+
+from __future__ import unicode_literals
+import pytest
+from helium import DataPoint
+from helium.ring import RingBuffer
+
+pytest.importorskip('msgpack')
+
+
+def _point(value):
+    return DataPoint({
+        'id': 'dp-{}'.format(value),
+        'type': 'data-point',
+        'attributes': {'port': 't', 'value': value},
+    }, None)
+
+
+@pytest.fixture
+def ring(tmpdir):
+    ring = RingBuffer.create(str(tmpdir.join('ring')), slots=4,
+                             slot_size=64)
+    yield ring
+    ring.close()
+
+
+def test_records(ring):
+    reader = RingBuffer.open(ring.path).reader()
+    assert reader.read() is None
+    assert ring.write(b'first') == 0
+    ring.write(b'second')
+
+    record = reader.read()
+    assert bytes(record) == b'first'
+    assert reader.valid()
+    assert bytes(reader.read()) == b'second'
+    assert reader.read() is None
+    assert reader.poll(timeout=0.01) is None
+
+    with pytest.raises(ValueError):
+        ring.write(b'x' * 65)
+
+
+def test_overrun(ring):
+    reader = ring.reader(start='oldest')
+    ring.write(b'0')
+    record = reader.read()
+    for n in range(1, 10):
+        ring.write(str(n).encode('ascii'))
+    # The slot of the first record has been reused
+    assert not reader.valid()
+    del record
+
+    assert [bytes(reader.read()) for _ in range(3)] == [b'7', b'8', b'9']
+    assert reader.overruns == 6
+
+
+def test_datapoints(ring):
+    reader = ring.reader()
+    ring.publish(_point(v) for v in range(3))
+    points = list(reader.datapoints(timeout=0.01))
+    assert [point.value for point in points] == [0, 1, 2]
+    assert reader.overruns == 0
+
+
+
+def test_datapoints_torn(ring, monkeypatch):
+    from helium import serialize
+    reader = ring.reader()
+    ring.publish([_point(0)])
+    loads_datapoints = serialize.loads_datapoints
+    torn = []
+
+    def overrun(record, session):
+        if not torn:
+            # The publisher laps the reader while it decodes the record
+            torn.append(record)
+            ring.publish(_point(value) for value in range(1, 5))
+            raise ValueError("torn record")
+        return loads_datapoints(record, session)
+    monkeypatch.setattr(serialize, 'loads_datapoints', overrun)
+    points = list(reader.datapoints(timeout=0.01))
+    # The torn record and the lapped one are counted as overruns
+    assert [point.value for point in points] == [2, 3, 4]
+    assert reader.overruns == 2
+
+    # Records that are intact but fail to decode still raise
+
+    def corrupt(record, session):
+        raise ValueError("corrupt record")
+    monkeypatch.setattr(serialize, 'loads_datapoints', corrupt)
+    ring.publish([_point(5)])
+    with pytest.raises(ValueError):
+        list(reader.datapoints(timeout=0.01))
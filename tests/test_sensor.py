@@ -2,7 +2,7 @@
 
 from __future__ import unicode_literals
 from helium import Sensor, Element
-from helium import to_one, to_many, RelationType
+from helium import to_one, to_many, RelationType, prefetch_related
 from builtins import filter
 import pytest
 
@@ -46,6 +46,28 @@ def test_meta(first_sensor):
     assert first_sensor.meta is not None
 
 
+def test_prefetch(client):
+    sensors = Sensor.all(client)
+    # Fetched from the collection endpoint in one request
+    assert prefetch_related(sensors, 'labels', 'element',
+                            collection_threshold=2) == sensors
+    freezer, fridge = sensors
+    assert len(freezer.labels(use_included=True)) == 1
+    assert len(fridge.labels(use_included=True)) == 2
+    assert freezer.element(use_included=True) is None
+    element = fridge.element(use_included=True)
+    assert element.name == 'gateway'
+
+    # Fetched for every sensor concurrently below the threshold
+    prefetch_related(sensors, 'labels', 'element', concurrency=1)
+    names = set(label.name for label in fridge.labels(use_included=True))
+    assert names == set(['kitchen', 'cold'])
+    assert fridge.element(use_included=True) == element
+
+    with pytest.raises(ValueError):
+        prefetch_related(sensors, 'colors')
+
+
 def test_element(client):
     sensors = Sensor.where(client, include=[Element])
     found_sensors = list(filter(lambda s: s.element(use_included=True) is not None,
@@ -0,0 +1,81 @@
+"""Tests for resource serialization."""
+
+from __future__ import unicode_literals
+import pickle
+import pytest
+import helium
+
+serialize = pytest.importorskip('helium.serialize')
+
+
+SENSOR = {
+    'id': '01d53511-228d-4530-8eaf-74d43c17baa8',
+    'type': 'sensor',
+    'attributes': {'name': 'test'},
+    'meta': {'created': '2016-03-29T23:41:29.994176Z'},
+}
+
+
+def _datapoint(n):
+    return {
+        'id': 'dp-{}'.format(n),
+        'type': 'data-point',
+        'attributes': {
+            'port': 't',
+            'value': n,
+            'timestamp': '2016-09-18T23:57:49.477274Z',
+        },
+        'relationships': {
+            'sensor': {'data': {'id': SENSOR['id'], 'type': 'sensor'}},
+        },
+        'meta': {'created': '2016-09-18T23:57:49.577274Z'},
+    }
+
+
+def test_resource():
+    client = helium.Client()
+    sensor = helium.Sensor(SENSOR, client)
+    data = sensor.to_bytes()
+
+    loaded = helium.Sensor.from_bytes(data, client)
+    assert isinstance(loaded, helium.Sensor)
+    assert loaded == sensor
+    assert loaded.name == 'test'
+    assert loaded.meta.created == sensor.meta.created
+    assert loaded._session is client
+
+    # Generic loading finds the resource class
+    assert isinstance(helium.Resource.from_bytes(data), helium.Sensor)
+
+    with pytest.raises(ValueError):
+        helium.Label.from_bytes(data)
+
+
+def test_metadata():
+    metadata = helium.Metadata({'id': SENSOR['id'],
+                                'type': 'metadata',
+                                'attributes': {'asset': 23}},
+                               None, 'sensor')
+    loaded = helium.Metadata.from_bytes(metadata.to_bytes())
+    assert loaded.asset == 23
+    assert loaded._target_resource_path == 'sensor'
+
+
+def test_datapoints():
+    points = [helium.DataPoint(_datapoint(n), None) for n in range(5)]
+    loaded = serialize.loads_datapoints(serialize.dumps_datapoints(points))
+    assert loaded == points
+    assert [p.value for p in loaded] == list(range(5))
+    assert all(p.sensor_id == SENSOR['id'] for p in loaded)
+
+    loaded = serialize.loads_many(serialize.dumps_many(points))
+    assert loaded == points
+
+
+def test_pickle():
+    sensor = helium.Sensor(SENSOR, helium.Client())
+    sensor.meta
+    loaded = pickle.loads(pickle.dumps(sensor))
+    assert loaded == sensor
+    assert loaded._session is None
+    assert loaded.meta.created == sensor.meta.created
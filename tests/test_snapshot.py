@@ -0,0 +1,59 @@
+"""Tests for organization snapshots."""
+
+from __future__ import unicode_literals
+from helium import (
+    Configuration,
+    DeviceConfiguration,
+    Element,
+    Label,
+    Organization,
+    Sensor,
+    User,
+)
+
+
+def _names(resources):
+    return sorted(resource.name for resource in resources)
+
+
+def test_snapshot(client):
+    snapshot = client.snapshot(concurrency=1)
+    assert snapshot.organization.is_singleton()
+    assert len(snapshot.sensors) == 2
+    assert len(snapshot.all(Label)) == 2
+    assert len(snapshot.users) == 1
+    assert len(snapshot.configurations) == 1
+
+    freezer, fridge = snapshot.all(Sensor)
+    assert snapshot[freezer.id] is freezer
+    assert fridge.id in snapshot
+    assert snapshot.get('missing') is None
+
+    # Forward and reverse relationships
+    assert _names(snapshot.related(fridge, Label)) == ['cold', 'kitchen']
+    kitchen = snapshot.related(freezer, Label)[0]
+    assert _names(snapshot.related(kitchen, Sensor)) == ['freezer', 'fridge']
+    gateway = snapshot.related(fridge, Element)[0]
+    assert snapshot.related(gateway, Sensor) == [fridge]
+    assert snapshot.related(fridge, Organization) == [snapshot.organization]
+    device_configuration = snapshot.related(freezer, DeviceConfiguration)[0]
+    configuration = snapshot.related(device_configuration, Configuration)[0]
+    assert isinstance(configuration, Configuration)
+    assert snapshot.related(snapshot.organization, User)[0].name == 'Ada'
+
+    # Full refresh only replaces what changed
+    changes = snapshot.refresh(concurrency=1)
+    assert _names(changes.added) == ['oven']
+    assert _names(changes.updated) == ['Helium', 'chiller']
+    assert _names(changes.removed) == ['cold']
+    assert snapshot[freezer.id] is freezer
+    assert _names(snapshot.related(kitchen, Sensor)) == \
+        ['chiller', 'freezer', 'oven']
+
+    # Targeted refresh
+    oven = snapshot.all(Sensor)[-1]
+    changes = snapshot.refresh([oven, freezer.id], concurrency=1)
+    assert len(changes.updated) == 1
+    assert changes.removed == [freezer]
+    assert freezer.id not in snapshot
+    assert _names(snapshot.related(kitchen, Sensor)) == ['chiller']
@@ -4,8 +4,12 @@ from __future__ import unicode_literals
 from helium import from_iso_date
 from datetime import datetime, timedelta
 from helium import DataPoint
+from helium import Client, Error, Sensor, Timeseries, LiveTimeoutError
+from helium.adapter.replay import Adapter as ReplayAdapter
 from itertools import islice
 import pytest
+import socket
+import threading
 
 
 def _feed_timeseries(timeseries, count):
@@ -138,3 +142,97 @@ def test_live(tmp_sensor):
 def test_datapoint():
     assert DataPoint._resource_type() == 'data-point'
     assert DataPoint._resource_path() == 'timeseries'
+
+
+def test_live_resume(tmp_sensor):
+    # The cassette replays a live stream that ends after two readings,
+    # a reconnected stream that repeats the last reading, and the
+    # backfill of the reading that was missed in between.
+    timeseries = tmp_sensor.timeseries()
+    with timeseries.live(resume=True, backoff=0) as live:
+        points = live.take(4)
+        assert [point.value for point in points] == [1, 2, 3, 4]
+        stats = live.stats
+        assert stats.reconnects == 1
+        assert stats.gaps == 1
+        assert stats.backfilled == 1
+        assert stats.duplicates == 1
+
+
+def test_live_batches(tmp_sensor):
+    with tmp_sensor.timeseries().live() as live:
+        batches = list(live.batches(max_size=2))
+        assert [[point.value for point in batch]
+                for batch in batches] == [[1, 2], [3, 4], [5]]
+
+    with tmp_sensor.timeseries().live() as live:
+        columns = next(live.batches(max_size=3, columnar=True))
+        assert columns['value'] == [1, 2, 3]
+        assert columns['sensor_id'] == [tmp_sensor.id] * 3
+
+
+def test_live_threaded(tmp_sensor):
+    live = tmp_sensor.timeseries().live()
+    with live.threaded(maxsize=10) as stream:
+        assert stream.poll(timeout=5).value == 1
+        assert [point.value for point in stream] == [2, 3, 4, 5]
+        assert stream.done
+        assert stream.drain() == []
+        assert stream.poll(timeout=0) is None
+        assert stream.stats.delivered == 5
+
+
+@pytest.fixture
+def silent_server():
+    """Serve a live endpoint that sends one heartbeat and goes silent."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(1)
+    done = threading.Event()
+
+    def serve():
+        connection, _ = server.accept()
+        connection.recv(4096)
+        connection.sendall(b'HTTP/1.1 200 OK\r\n'
+                           b'Content-Type: text/event-stream\r\n'
+                           b'Transfer-Encoding: chunked\r\n\r\n'
+                           b'd\r\n: heartbeat\n\n\r\n')
+        done.wait(5)
+        connection.close()
+
+    thread = threading.Thread(target=serve)
+    thread.daemon = True
+    thread.start()
+    yield 'http://127.0.0.1:{}'.format(server.getsockname()[1])
+    done.set()
+    thread.join()
+    server.close()
+
+
+def test_live_idle_timeout(silent_server):
+    client = Client(base_url=silent_server)
+    timeseries = Timeseries(client, Sensor, 'sensor-id')
+    with timeseries.live(idle_timeout=0.2) as live:
+        with pytest.raises(LiveTimeoutError) as raised:
+            live.take(1)
+        assert isinstance(raised.value, Error)
+        assert 'No data received' in str(raised.value)
+        assert live.last_event_age >= 0.2
+
+
+def test_live_record(tmp_sensor, tmpdir):
+    path = str(tmpdir.join('live.sse'))
+    with tmp_sensor.timeseries().live().record(path) as live:
+        recorded = [point.value for point in live]
+    assert recorded == [1, 2, 3, 4, 5]
+
+    client = Client(adapter=ReplayAdapter(path, speed=None))
+    timeseries = Timeseries(client, Sensor, tmp_sensor.id)
+    with timeseries.live() as live:
+        assert [point.value for point in live] == recorded
+
+
+def test_live_reorder(tmp_sensor):
+    with tmp_sensor.timeseries().live() as live:
+        values = [point.value for point in live.reorder(delay=60)]
+    assert values == [1, 2, 3, 4, 5]